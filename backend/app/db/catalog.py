@@ -0,0 +1,107 @@
+import logging
+import threading
+from typing import Dict, FrozenSet, Iterable, Optional
+
+from app.db.connection import get_conn
+from app.db.refresh import on_refresh
+
+logger = logging.getLogger(__name__)
+
+# pg_attribute rather than information_schema.columns: it is a single catalog
+# lookup and, unlike information_schema, it also lists materialized view columns.
+_COLUMNS_SQL = """
+    SELECT a.attname AS column_name
+    FROM pg_attribute a
+    WHERE a.attrelid = to_regclass(%s)
+      AND a.attnum > 0
+      AND NOT a.attisdropped
+"""
+
+
+class SchemaRegistry:
+    """Column sets of the relations handlers build SELECT lists from, introspected once.
+
+    A relation is looked up on first use (or by `warm` at startup) and then served
+    from memory until `invalidate` runs, which happens on every backing-view refresh
+    notification (migrations and view rebuilds NOTIFY too). A missing relation yields
+    an empty set and is not cached, so it is picked up as soon as it is created.
+    """
+
+    def __init__(self) -> None:
+        self._columns: Dict[str, FrozenSet[str]] = {}
+        self._lock = threading.Lock()
+        self.introspections = 0
+
+    def columns(self, conn, relation: str) -> FrozenSet[str]:
+        """Columns of `relation` ("schema.name" or "name"), introspecting over `conn` on a miss."""
+        cached = self._columns.get(relation)
+        if cached is not None:
+            return cached
+        with self._lock:
+            cached = self._columns.get(relation)
+            if cached is None:
+                cached = self._introspect(conn, relation)
+                if cached:
+                    self._columns[relation] = cached
+        return cached
+
+    async def acolumns(self, conn, relation: str) -> FrozenSet[str]:
+        """`columns` over an asyncpg connection."""
+        cached = self._columns.get(relation)
+        if cached is not None:
+            return cached
+        rows = await conn.fetch(_COLUMNS_SQL.replace("%s", "$1"), relation)
+        self.introspections += 1
+        cached = frozenset(row["column_name"] for row in rows)
+        if cached:
+            self._columns[relation] = cached
+        else:
+            logger.warning("schema registry: relation %s not found or has no columns", relation)
+        return cached
+
+    def _introspect(self, conn, relation: str) -> FrozenSet[str]:
+        with conn.cursor() as cur:
+            cur.execute(_COLUMNS_SQL, (relation,))
+            rows = cur.fetchall() or []
+        self.introspections += 1
+        columns = frozenset(row["column_name"] for row in rows)
+        if not columns:
+            logger.warning("schema registry: relation %s not found or has no columns", relation)
+        return columns
+
+    def warm(self, relations: Iterable[str]) -> None:
+        """Introspect `relations` up front on one connection; failures leave them to lazy lookup."""
+        try:
+            with get_conn() as conn:
+                for relation in relations:
+                    self.columns(conn, relation)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("schema registry warmup failed; introspecting on first use: %s", exc)
+
+    def invalidate(self, relation: Optional[str] = None) -> None:
+        with self._lock:
+            if relation is None:
+                self._columns.clear()
+            else:
+                self._columns.pop(relation, None)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "relations": {name: sorted(columns) for name, columns in self._columns.items()},
+            "introspections": self.introspections,
+        }
+
+
+SCHEMA = SchemaRegistry()
+
+# Relations whose optional columns shape SELECT lists in request handlers.
+PROPERTY_SEARCH = "public.property_search"
+
+
+@on_refresh
+def _invalidate_schema(payload: str) -> None:
+    # A rebuilt view may gain or lose columns; the next request re-introspects.
+    SCHEMA.invalidate()
+
+
+__all__ = ["PROPERTY_SEARCH", "SCHEMA", "SchemaRegistry"]
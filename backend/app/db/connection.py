@@ -1,23 +1,234 @@
+import logging
 import os
+import threading
+import time
+from collections import deque
 from contextlib import contextmanager
+from typing import Any, Deque, Dict, Optional, Tuple
+
 import psycopg2
+from psycopg2 import extensions
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import PoolError
+
+from settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SyncPool:
+    """Process-wide, thread-safe psycopg2 pool for the synchronous routes.
+
+    At most `max_size` connections exist at once; a checkout waits up to
+    `acquire_timeout` seconds for one and then raises PoolError. Connections
+    idle for longer than `health_check_after` seconds are probed with SELECT 1
+    before reuse, and connections older than `max_lifetime` are closed on return
+    so server-side state and memory never grow without bound.
+    """
+
+    def __init__(
+        self,
+        dsn: Optional[str],
+        min_size: int = 1,
+        max_size: int = 10,
+        max_lifetime: float = 1800.0,
+        health_check_after: float = 30.0,
+        acquire_timeout: float = 10.0,
+    ) -> None:
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max(1, max_size)
+        self.max_lifetime = max_lifetime
+        self.health_check_after = health_check_after
+        self.acquire_timeout = acquire_timeout
+        # (connection, created_at, returned_at); most recently returned on the right.
+        self._idle: Deque[Tuple[Any, float, float]] = deque()
+        self._created_at: Dict[int, float] = {}
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.timeouts = 0
+        self.created = 0
+        self.recycled = 0
+        self.unhealthy = 0
+
+    def _connect(self):
+        conn = psycopg2.connect(self.dsn)
+        # Set default cursor factory for all cursor() calls
+        conn.cursor_factory = RealDictCursor
+        with self._lock:
+            self.created += 1
+            self._created_at[id(conn)] = time.monotonic()
+        return conn
+
+    def _discard(self, conn) -> None:
+        with self._lock:
+            self._created_at.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:  # noqa: BLE001
+            pass
+
+    def _healthy(self, conn) -> bool:
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def getconn(self):
+        if self._closed:
+            raise PoolError("connection pool is closed")
+        started = time.monotonic()
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            with self._lock:
+                self.timeouts += 1
+            raise PoolError(f"no database connection available within {self.acquire_timeout:g}s")
+        waited = time.monotonic() - started
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        try:
+            while True:
+                with self._lock:
+                    entry = self._idle.pop() if self._idle else None
+                if entry is None:
+                    return self._connect()
+                conn, created_at, returned_at = entry
+                now = time.monotonic()
+                if conn.closed or now - created_at > self.max_lifetime:
+                    self._count("recycled")
+                    self._discard(conn)
+                    continue
+                if now - returned_at > self.health_check_after and not self._healthy(conn):
+                    self._count("unhealthy")
+                    self._discard(conn)
+                    continue
+                return conn
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn) -> None:
+        try:
+            if conn.closed:
+                self._count("unhealthy")
+                self._discard(conn)
+                return
+            try:
+                # Ends the implicit transaction; also undoes SET / SET LOCAL issued by the request.
+                if conn.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                self._count("unhealthy")
+                self._discard(conn)
+                return
+            with self._lock:
+                created_at = self._created_at.get(id(conn), 0.0)
+            if self._closed or time.monotonic() - created_at > self.max_lifetime:
+                self._count("recycled")
+                self._discard(conn)
+                return
+            with self._lock:
+                self._idle.append((conn, created_at, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def warm(self) -> None:
+        """Open min_size connections up front so the first requests skip the handshake."""
+        conns = []
+        try:
+            for _ in range(min(self.min_size, self.max_size)):
+                conns.append(self.getconn())
+        except (psycopg2.Error, PoolError) as exc:
+            logger.warning("sync pool warmup failed; connecting on first use: %s", exc)
+        for conn in conns:
+            self.putconn(conn)
+
+    def close(self) -> None:
+        self._closed = True
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for conn, _, _ in idle:
+            self._discard(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            open_connections = len(self._created_at)
+            idle = len(self._idle)
+            checkouts = self.checkouts
+            return {
+                "max_size": self.max_size,
+                "open": open_connections,
+                "idle": idle,
+                "in_use": open_connections - idle,
+                "checkouts": checkouts,
+                "wait_ms_avg": round(1000 * self.wait_seconds_total / checkouts, 3) if checkouts else 0.0,
+                "wait_ms_max": round(1000 * self.wait_seconds_max, 3),
+                "timeouts": self.timeouts,
+                "created": self.created,
+                "recycled": self.recycled,
+                "unhealthy": self.unhealthy,
+            }
+
+
+_POOL: Optional[SyncPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_pool() -> SyncPool:
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = SyncPool(
+                    os.getenv("DATABASE_URL"),
+                    min_size=settings.SYNC_DB_POOL_MIN,
+                    max_size=settings.SYNC_DB_POOL_MAX,
+                    max_lifetime=settings.SYNC_DB_POOL_MAX_LIFETIME,
+                    health_check_after=settings.SYNC_DB_POOL_HEALTH_CHECK_AFTER,
+                    acquire_timeout=settings.SYNC_DB_POOL_ACQUIRE_TIMEOUT,
+                )
+    return _POOL
+
+
+def close_pool() -> None:
+    """Close idle connections and drop the pool; the next get_pool() builds a fresh one."""
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.close()
 
 
 @contextmanager
 def get_conn():
-    """Yield a psycopg2 connection with RealDictCursor as default cursor.
+    """Yield a pooled psycopg2 connection with RealDictCursor as default cursor.
 
     Usage:
         with get_conn() as conn:
             with conn.cursor() as cur:
                 cur.execute(...)
+
+    The connection goes back to the pool on exit with any open transaction rolled
+    back; commit explicitly to keep writes.
     """
-    dsn = os.getenv("DATABASE_URL")
-    conn = psycopg2.connect(dsn)
-    # Set default cursor factory for all cursor() calls
-    conn.cursor_factory = RealDictCursor
+    pool = get_pool()
+    conn = pool.getconn()
     try:
         yield conn
     finally:
-        conn.close()
+        pool.putconn(conn)
+
+
+__all__ = ["SyncPool", "close_pool", "get_conn", "get_pool"]
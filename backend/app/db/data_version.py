@@ -0,0 +1,105 @@
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import asyncpg
+
+from app.db.pool import get_read_pool
+from app.db.refresh import on_refresh
+from app.db.replicas import run_read
+from app.utils.singleflight import SingleFlight
+from settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+# One row per source: the latest run of each ingester (and of the view refresh
+# scripts, which record themselves under "refresh:<view>").
+_VERSION_SQL = """
+    SELECT source, max(last_run) AS last_run
+    FROM ingestion_watermarks
+    GROUP BY source
+    ORDER BY source
+"""
+
+_UNAVAILABLE = (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError)
+
+
+class DataVersion:
+    """Opaque version of the served dataset, derived from ingestion_watermarks.
+
+    The version changes whenever any source records a new run. It is read at most
+    once per `ttl` seconds per process (concurrent misses share one query) and
+    dropped on every refresh notification. When the table cannot be read the
+    version is None for `ttl` seconds and callers skip validators.
+    """
+
+    def __init__(self, ttl: float = 30.0) -> None:
+        self.ttl = ttl
+        self._value: Optional[str] = None
+        self._updated: Optional[str] = None
+        self._expires_at = 0.0
+        self._flight = SingleFlight()
+        self.lookups = 0
+        self.queries = 0
+
+    async def current(self) -> Optional[str]:
+        self.lookups += 1
+        if time.monotonic() < self._expires_at:
+            return self._value
+        return await self._flight.run("data_version", self._load)
+
+    async def updated(self) -> Optional[str]:
+        """ISO timestamp of the latest run behind the current version (None when unknown).
+
+        It only changes with the version, so bodies under a strong ETag can carry it.
+        """
+        await self.current()
+        return self._updated
+
+    async def _load(self) -> Optional[str]:
+        self.queries += 1
+        try:
+            rows = await run_read(await get_read_pool(), lambda conn: conn.fetch(_VERSION_SQL))
+            value: Optional[str] = self.compute(rows)
+            runs = [row["last_run"] for row in rows if row["last_run"]]
+            updated = max(runs).isoformat() if runs else None
+        except _UNAVAILABLE as exc:
+            logger.warning("data version unavailable; serving without ETags: %s", exc)
+            value = updated = None
+        self._value = value
+        self._updated = updated
+        self._expires_at = time.monotonic() + self.ttl
+        return value
+
+    @staticmethod
+    def compute(rows) -> str:
+        digest = hashlib.sha1()
+        for row in rows:
+            last_run = row["last_run"]
+            digest.update(f"{row['source']}={last_run.isoformat() if last_run else ''};".encode())
+        return digest.hexdigest()[:16]
+
+    def invalidate(self) -> None:
+        self._expires_at = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "version": self._value,
+            "updated": self._updated,
+            "ttl_seconds": self.ttl,
+            "lookups": self.lookups,
+            "queries": self.queries,
+        }
+
+
+DATA_VERSION = DataVersion(ttl=settings.DATA_VERSION_TTL)
+
+
+@on_refresh
+def _invalidate_data_version(payload: str) -> None:
+    DATA_VERSION.invalidate()
+
+
+__all__ = ["DATA_VERSION", "DataVersion"]
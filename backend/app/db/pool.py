@@ -0,0 +1,99 @@
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+import asyncpg
+
+from app.db.refresh import start_refresh_listener
+from app.db.replicas import ReplicaSet
+from settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+_POOL: Optional[asyncpg.Pool] = None
+_READ_POOL = None
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    # jsonb comes back as Python objects, as it does from psycopg2.
+    await conn.set_type_codec("jsonb", encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+
+
+async def _create_pool(dsn: Optional[str]) -> asyncpg.Pool:
+    return await asyncpg.create_pool(
+        dsn=dsn,
+        min_size=2,
+        max_size=int(os.getenv("DB_POOL_MAX", "12")),
+        # Hard ceiling; endpoints set tighter budgets via app.db.timeouts.
+        command_timeout=float(os.getenv("DB_COMMAND_TIMEOUT", "30")),
+        # Prepared statements asyncpg keeps per connection, keyed by SQL text;
+        # run_search shapes are the largest user.
+        statement_cache_size=settings.SEARCH_STATEMENT_CACHE_SIZE,
+        init=_init_connection,
+    )
+
+
+async def get_pool() -> asyncpg.Pool:
+    """The process-wide asyncpg pool on the primary (DATABASE_URL); use it for anything that writes."""
+    global _POOL
+    if _POOL is None:
+        _POOL = await _create_pool(os.getenv("DATABASE_URL"))
+        await start_refresh_listener()
+    return _POOL
+
+
+async def create_read_pool(replica_dsns: List[str], primary: asyncpg.Pool) -> ReplicaSet:
+    """A ReplicaSet over `replica_dsns` that falls back to `primary`.
+
+    Replica pools connect lazily (min_size=0), so an unreachable replica costs its
+    first reads a fallback to the primary instead of failing startup.
+    """
+    pools = [
+        await asyncpg.create_pool(
+            dsn=dsn,
+            min_size=0,
+            max_size=int(os.getenv("DB_POOL_MAX", "12")),
+            command_timeout=float(os.getenv("DB_COMMAND_TIMEOUT", "30")),
+            statement_cache_size=settings.SEARCH_STATEMENT_CACHE_SIZE,
+            init=_init_connection,
+        )
+        for dsn in replica_dsns
+    ]
+    return ReplicaSet(
+        pools,
+        primary,
+        names=[_redact(dsn) for dsn in replica_dsns],
+        hedge=settings.READ_HEDGE_ENABLED,
+        hedge_after_ms=settings.READ_HEDGE_AFTER_MS,
+        hedge_min_ms=settings.READ_HEDGE_MIN_MS,
+        retry_after=settings.READ_REPLICA_RETRY_AFTER,
+    )
+
+
+async def get_read_pool():
+    """Pool for read-only endpoints: a ReplicaSet over DATABASE_REPLICA_URLS, else the primary pool.
+
+    Replicas lag the primary slightly; anything that must read its own writes uses get_pool.
+    """
+    global _READ_POOL
+    if _READ_POOL is None:
+        primary = await get_pool()
+        if not settings.DATABASE_REPLICA_URLS:
+            return primary
+        _READ_POOL = await create_read_pool(list(settings.DATABASE_REPLICA_URLS), primary)
+    return _READ_POOL
+
+
+def read_pool_stats() -> Dict[str, Any]:
+    if isinstance(_READ_POOL, ReplicaSet):
+        return _READ_POOL.stats()
+    return {"replicas": [], "primary_only": True}
+
+
+def _redact(dsn: str) -> str:
+    # Host/port/db only; never log credentials.
+    return dsn.rsplit("@", 1)[-1]
+
+
+__all__ = ["create_read_pool", "get_pool", "get_read_pool", "read_pool_stats"]
@@ -0,0 +1,125 @@
+import asyncio
+import inspect
+import logging
+import os
+from typing import Any, Callable, List, Optional, Set
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+# Channel that MV refresh jobs NOTIFY on (scripts/refresh_mv.py, refresh_mv.sh,
+# app.ingestion.framework). The payload is the name of the refreshed relation.
+REFRESH_CHANNEL = "property_search_refresh"
+
+_CALLBACKS: List[Callable[[str], Any]] = []
+_LISTENER: Optional[asyncpg.Connection] = None
+_SUPERVISOR: Optional["asyncio.Task[None]"] = None
+# Coroutine callbacks in flight; referenced here so they are not garbage-collected mid-run.
+_PENDING: Set["asyncio.Future[Any]"] = set()
+
+# Seconds between listener health checks, and the reconnect backoff ceiling.
+LISTENER_CHECK_INTERVAL = 5.0
+LISTENER_MAX_BACKOFF = 60.0
+
+
+def on_refresh(callback: Callable[[str], Any]) -> Callable[[str], Any]:
+    """Register `callback(payload)` to run whenever a backing view is refreshed.
+
+    Coroutine callbacks are scheduled on the running loop. Usable as a decorator.
+    """
+    if callback not in _CALLBACKS:
+        _CALLBACKS.append(callback)
+    return callback
+
+
+def dispatch_refresh(payload: str = "") -> None:
+    """Run every registered refresh callback; one failing callback does not stop the rest."""
+    for callback in list(_CALLBACKS):
+        try:
+            result = callback(payload)
+            if inspect.isawaitable(result):
+                task = asyncio.ensure_future(result)
+                _PENDING.add(task)
+                task.add_done_callback(_callback_done)
+        except Exception:  # noqa: BLE001
+            logger.exception("refresh callback %r failed", callback)
+
+
+def _callback_done(task: "asyncio.Future[Any]") -> None:
+    _PENDING.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("async refresh callback failed", exc_info=task.exception())
+
+
+def _on_notify(connection, pid, channel, payload) -> None:
+    logger.info("received %s notification (payload=%s)", channel, payload or "-")
+    dispatch_refresh(payload or "")
+
+
+async def _connect_listener(dsn: Optional[str]) -> Optional[asyncpg.Connection]:
+    global _LISTENER
+    try:
+        conn = await asyncpg.connect(dsn=dsn or os.getenv("DATABASE_URL"))
+        await conn.add_listener(REFRESH_CHANNEL, _on_notify)
+    except (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError) as exc:
+        logger.warning("refresh listener unavailable; relying on TTLs: %s", exc)
+        return None
+    _LISTENER = conn
+    return conn
+
+
+async def _listener_alive(conn: asyncpg.Connection) -> bool:
+    if conn.is_closed():
+        return False
+    try:
+        # Catches half-open TCP connections that is_closed() cannot see.
+        await asyncio.wait_for(conn.fetchval("SELECT 1"), timeout=LISTENER_CHECK_INTERVAL)
+        return True
+    except (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError):
+        return False
+
+
+async def _supervise_listener(dsn: Optional[str]) -> None:
+    """Keep the LISTEN connection up; reconnect with backoff when it drops."""
+    backoff = LISTENER_CHECK_INTERVAL
+    while True:
+        await asyncio.sleep(backoff)
+        conn = _LISTENER
+        if conn is not None and await _listener_alive(conn):
+            backoff = LISTENER_CHECK_INTERVAL
+            continue
+        if conn is not None:
+            logger.warning("refresh listener connection lost; reconnecting")
+            conn.terminate()
+        if await _connect_listener(dsn) is None:
+            backoff = min(backoff * 2, LISTENER_MAX_BACKOFF)
+            continue
+        backoff = LISTENER_CHECK_INTERVAL
+        # Notifications sent while disconnected are lost; treat the reconnect as a refresh.
+        dispatch_refresh("")
+
+
+async def start_refresh_listener(dsn: Optional[str] = None) -> Optional[asyncpg.Connection]:
+    """LISTEN on REFRESH_CHANNEL over a dedicated connection (idempotent).
+
+    A background task health-checks the connection and re-establishes it when it
+    drops. Returns None when the listener cannot be started right now; callers
+    keep working, rely on cache TTLs, and the task keeps retrying.
+    """
+    global _SUPERVISOR
+    if _SUPERVISOR is None or _SUPERVISOR.done():
+        _SUPERVISOR = asyncio.ensure_future(_supervise_listener(dsn))
+    if _LISTENER is not None and not _LISTENER.is_closed():
+        return _LISTENER
+    return await _connect_listener(dsn)
+
+
+async def stop_refresh_listener() -> None:
+    global _LISTENER, _SUPERVISOR
+    if _SUPERVISOR is not None:
+        _SUPERVISOR.cancel()
+        _SUPERVISOR = None
+    if _LISTENER is not None:
+        await _LISTENER.close()
+        _LISTENER = None
@@ -0,0 +1,205 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Sequence
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean "this server is unreachable", not "this query is wrong".
+_UNAVAILABLE = (OSError, asyncio.TimeoutError, asyncpg.exceptions.CannotConnectNowError, asyncpg.InterfaceError)
+
+
+class _Replica:
+    __slots__ = ("name", "pool", "in_flight", "latency_ms", "failures", "down_until", "queries")
+
+    def __init__(self, name: str, pool) -> None:
+        self.name = name
+        self.pool = pool
+        self.in_flight = 0
+        self.latency_ms: Optional[float] = None  # EWMA
+        self.failures = 0
+        self.down_until = 0.0
+        self.queries = 0
+
+
+class ReplicaSet:
+    """Routes read-only work across replica pools.
+
+    Each call goes to the healthy replica with the fewest in-flight calls (ties by
+    latency EWMA). A replica that fails to connect is skipped for `retry_after`
+    seconds; with every replica down, reads fall back to `fallback` (the primary).
+    With `hedge` on, `run` sends the same work to a second replica when the first
+    has not answered after the hedge delay and keeps whichever finishes first. The
+    delay is `hedge_after_ms`, or the p95 of recent latencies when that is 0.
+    """
+
+    def __init__(
+        self,
+        pools: Sequence[Any],
+        fallback,
+        names: Optional[Sequence[str]] = None,
+        hedge: bool = False,
+        hedge_after_ms: float = 0.0,
+        hedge_min_ms: float = 20.0,
+        retry_after: float = 5.0,
+        window: int = 512,
+    ) -> None:
+        names = list(names or [f"replica-{i}" for i in range(len(pools))])
+        self.replicas: List[_Replica] = [_Replica(name, pool) for name, pool in zip(names, pools)]
+        self.fallback = fallback
+        self.hedge = hedge
+        self.hedge_after_ms = hedge_after_ms
+        self.hedge_min_ms = hedge_min_ms
+        self.retry_after = retry_after
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.fallbacks = 0
+
+    def _pick(self, exclude: Sequence[_Replica] = ()) -> Optional[_Replica]:
+        now = time.monotonic()
+        candidates = [r for r in self.replicas if r not in exclude and r.down_until <= now]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda r: (r.in_flight, r.latency_ms or 0.0))
+
+    def _record(self, replica: _Replica, elapsed_ms: float) -> None:
+        replica.queries += 1
+        replica.failures = 0
+        replica.latency_ms = elapsed_ms if replica.latency_ms is None else 0.8 * replica.latency_ms + 0.2 * elapsed_ms
+        self._latencies.append(elapsed_ms)
+
+    def _mark_down(self, replica: _Replica, exc: BaseException) -> None:
+        replica.failures += 1
+        replica.down_until = time.monotonic() + self.retry_after
+        logger.warning("read replica %s unavailable for %.0fs: %s", replica.name, self.retry_after, exc)
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait before hedging."""
+        if self.hedge_after_ms:
+            return self.hedge_after_ms / 1000.0
+        if len(self._latencies) < 20:
+            # Not enough samples for a meaningful p95; be conservative.
+            return max(self.hedge_min_ms, 100.0) / 1000.0
+        ordered = sorted(self._latencies)
+        p95 = ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+        return max(self.hedge_min_ms, p95) / 1000.0
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[asyncpg.Connection]:
+        """A connection from the least busy healthy replica (or the fallback); no hedging."""
+        replica = self._pick()
+        conn = None
+        if replica is not None:
+            try:
+                conn = await replica.pool.acquire()
+            except _UNAVAILABLE as exc:
+                self._mark_down(replica, exc)
+        if conn is None:
+            self.fallbacks += 1
+            async with self.fallback.acquire() as fallback_conn:
+                yield fallback_conn
+            return
+        replica.in_flight += 1
+        started = time.perf_counter()
+        try:
+            yield conn
+            self._record(replica, (time.perf_counter() - started) * 1000)
+        finally:
+            replica.in_flight -= 1
+            await replica.pool.release(conn)
+
+    def _start(self, replica: _Replica, fn: Callable[[asyncpg.Connection], Awaitable[Any]]) -> "asyncio.Future[Any]":
+        # Counted as in flight right away so concurrent picks see it.
+        replica.in_flight += 1
+        task = asyncio.ensure_future(self._attempt(replica, fn))
+        task.add_done_callback(lambda _: setattr(replica, "in_flight", replica.in_flight - 1))
+        return task
+
+    async def _attempt(self, replica: _Replica, fn: Callable[[asyncpg.Connection], Awaitable[Any]]) -> Any:
+        started = time.perf_counter()
+        try:
+            async with replica.pool.acquire() as conn:
+                result = await fn(conn)
+        except _UNAVAILABLE as exc:
+            if not isinstance(exc, asyncio.TimeoutError):
+                self._mark_down(replica, exc)
+            raise
+        self._record(replica, (time.perf_counter() - started) * 1000)
+        return result
+
+    async def _on_fallback(self, fn):
+        self.fallbacks += 1
+        async with self.fallback.acquire() as conn:
+            return await fn(conn)
+
+    async def run(self, fn: Callable[[asyncpg.Connection], Awaitable[Any]]) -> Any:
+        """`await fn(conn)` on a replica, hedged onto a second one if the first is slow."""
+        first = self._pick()
+        if first is None:
+            return await self._on_fallback(fn)
+        primary_task = self._start(first, fn)
+        tasks = [primary_task]
+        try:
+            second = self._pick(exclude=[first]) if self.hedge else None
+            if second is not None:
+                done, _ = await asyncio.wait({primary_task}, timeout=self.hedge_delay())
+                if not done:
+                    self.hedged += 1
+                    tasks.append(self._start(second, fn))
+            error: Optional[BaseException] = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary_task:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            assert error is not None
+            if isinstance(error, _UNAVAILABLE) and not isinstance(error, asyncio.TimeoutError):
+                return await self._on_fallback(fn)
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    # The loser's query is cancelled server-side and its connection released.
+                    task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "replicas": [
+                {
+                    "name": r.name,
+                    "healthy": r.down_until <= now,
+                    "in_flight": r.in_flight,
+                    "latency_ms": round(r.latency_ms, 3) if r.latency_ms is not None else None,
+                    "queries": r.queries,
+                    "failures": r.failures,
+                }
+                for r in self.replicas
+            ],
+            "hedge": self.hedge,
+            "hedge_delay_ms": round(self.hedge_delay() * 1000, 3),
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "fallbacks": self.fallbacks,
+        }
+
+
+async def run_read(pool, fn: Callable[[asyncpg.Connection], Awaitable[Any]]) -> Any:
+    """`await fn(conn)` on `pool`; replica sets get load balancing and hedging."""
+    if isinstance(pool, ReplicaSet):
+        return await pool.run(fn)
+    async with pool.acquire() as conn:
+        return await fn(conn)
+
+
+__all__ = ["ReplicaSet", "run_read"]
@@ -136,6 +136,7 @@ CREATE INDEX IF NOT EXISTS idx_stg_pluto_hash ON staging_pluto(row_hash);
 CREATE TABLE IF NOT EXISTS dob_permits (
   job_number TEXT PRIMARY KEY,
   bbl TEXT,
+  bbl_norm BIGINT,
   house_no TEXT,
   street_name TEXT,
   borough TEXT,
@@ -143,14 +144,21 @@ CREATE TABLE IF NOT EXISTS dob_permits (
   work_type TEXT,
   status TEXT,
   filing_date DATE,
+  filed_date DATE,
   issuance_date DATE,
+  status_date DATE,
   latest_status_date DATE,
   estimated_cost NUMERIC,
   raw JSONB,
   updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );
 CREATE INDEX IF NOT EXISTS idx_dob_permits_bbl ON dob_permits(bbl);
+CREATE INDEX IF NOT EXISTS idx_dob_permits_bbl_norm_recent ON dob_permits(
+  bbl_norm,
+  (COALESCE(issuance_date, filing_date, filed_date, status_date, latest_status_date)) DESC NULLS LAST
+);
 CREATE INDEX IF NOT EXISTS idx_dob_permits_filing ON dob_permits(filing_date);
+CREATE INDEX IF NOT EXISTS idx_dob_permits_updated_at ON dob_permits(updated_at);
 
 CREATE TABLE IF NOT EXISTS dob_violations (
   violation_number TEXT PRIMARY KEY,
@@ -255,3 +263,11 @@ CREATE TABLE IF NOT EXISTS pluto (
 );
 CREATE INDEX IF NOT EXISTS idx_pluto_bbl ON pluto (bbl);
 CREATE INDEX IF NOT EXISTS idx_pluto_address ON pluto (street, houseno);
+CREATE INDEX IF NOT EXISTS idx_pluto_updated_at ON pluto (updated_at);
+
+-- Ready-to-serve /property/{bbl} responses (app.ingestion.property_documents)
+CREATE TABLE IF NOT EXISTS property_documents (
+  bbl BIGINT PRIMARY KEY,
+  doc JSONB NOT NULL,
+  built_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
@@ -0,0 +1,91 @@
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional
+
+from app.db.timeouts import timeout_kwargs
+
+
+class ShapeStats:
+    __slots__ = ("calls", "rows", "total_ms", "max_ms", "errors")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.rows = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.errors = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "rows": self.rows,
+            "errors": self.errors,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.calls, 3) if self.calls else None,
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class StatementRegistry:
+    """Per-shape execution statistics for parameterised queries.
+
+    Callers identify a query by a hashable shape key (e.g. active filters + sort) and
+    its SQL text. Statement reuse is left to asyncpg: each connection keeps an LRU of
+    prepared statements keyed by SQL text (sized by the pool's `statement_cache_size`)
+    and re-prepares on its own when a backing relation changes, so a shape that keeps
+    its SQL text stable skips parse/plan after its first run on a connection.
+    """
+
+    def __init__(self) -> None:
+        self._stats: Dict[Hashable, ShapeStats] = {}
+        self._lock = threading.Lock()
+
+    def _stat(self, shape: Hashable) -> ShapeStats:
+        with self._lock:
+            stat = self._stats.get(shape)
+            if stat is None:
+                stat = self._stats[shape] = ShapeStats()
+            return stat
+
+    async def _run(self, method: str, conn, shape: Hashable, sql: str, args) -> Any:
+        stat = self._stat(shape)
+        # Endpoint latency budget (app.db.timeouts), if one is active.
+        options = timeout_kwargs()
+        started = time.perf_counter()
+        try:
+            result = await getattr(conn, method)(sql, *args, **options)
+        except Exception:
+            stat.errors += 1
+            raise
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        stat.calls += 1
+        stat.total_ms += elapsed_ms
+        stat.max_ms = max(stat.max_ms, elapsed_ms)
+        if isinstance(result, list):
+            stat.rows += len(result)
+        return result
+
+    async def fetch(self, conn, shape: Hashable, sql: str, *args) -> list:
+        return await self._run("fetch", conn, shape, sql, args)
+
+    async def fetchval(self, conn, shape: Hashable, sql: str, *args) -> Any:
+        return await self._run("fetchval", conn, shape, sql, args)
+
+    def stats(self, limit: Optional[int] = None) -> list[Dict[str, Any]]:
+        with self._lock:
+            items = list(self._stats.items())
+        items.sort(key=lambda item: item[1].total_ms, reverse=True)
+        if limit is not None:
+            items = items[:limit]
+        return [{"shape": _shape_label(shape), **stat.as_dict()} for shape, stat in items]
+
+
+def _shape_label(shape: Hashable) -> str:
+    if isinstance(shape, tuple):
+        return " | ".join(_shape_label(part) for part in shape)
+    if isinstance(shape, (frozenset, set)):
+        return ",".join(sorted(str(part) for part in shape)) or "none"
+    return str(shape)
+
+
+__all__ = ["ShapeStats", "StatementRegistry"]
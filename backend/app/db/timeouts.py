@@ -0,0 +1,33 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# Seconds; None falls back to the pool's command_timeout.
+_STATEMENT_TIMEOUT: ContextVar[Optional[float]] = ContextVar("statement_timeout", default=None)
+
+
+@contextmanager
+def statement_timeout(milliseconds: Optional[int]) -> Iterator[None]:
+    """Give every statement run inside the block (and tasks spawned from it) a latency budget.
+
+    asyncpg enforces it per statement: when it expires the server-side query is cancelled and
+    the caller gets asyncio.TimeoutError. A value of 0 or None means no per-endpoint budget.
+    """
+    token = _STATEMENT_TIMEOUT.set(milliseconds / 1000.0 if milliseconds else None)
+    try:
+        yield
+    finally:
+        _STATEMENT_TIMEOUT.reset(token)
+
+
+def current_statement_timeout() -> Optional[float]:
+    return _STATEMENT_TIMEOUT.get()
+
+
+def timeout_kwargs() -> dict:
+    """`timeout=` for asyncpg calls when a budget is active, else nothing."""
+    timeout = _STATEMENT_TIMEOUT.get()
+    return {"timeout": timeout} if timeout is not None else {}
+
+
+__all__ = ["current_statement_timeout", "statement_timeout", "timeout_kwargs"]
@@ -14,6 +14,7 @@ except ImportError as exc:
     ) from exc
 from sqlalchemy import text
 
+from app.db.refresh import REFRESH_CHANNEL
 from app.ingestion.common import insert_staging, row_hash, socrata_fetch
 from app.ingestion.normalizers import (
     normalize_acris_legal,
@@ -24,6 +25,7 @@ from app.ingestion.normalizers import (
     normalize_hpd_violation,
     normalize_pluto,
 )
+from app.ingestion.property_documents import rebuild as rebuild_property_documents
 
 CATALOG_PATH = Path(__file__).resolve().parent / "catalog.yml"
 DATE_FIELD_CANDIDATES = [
@@ -83,6 +85,8 @@ def run_job(conn, name: str, days_back: int = 3, page_size: int = 50000) -> None
     _ensure_watermarks(conn)
     _ensure_staging_table(conn, staging_table)
     _ensure_final_table(conn, final_table, pk_field)
+    # Transaction start; every row this run upserts carries updated_at >= it.
+    run_started = conn.execute(text("SELECT now()")).scalar()
 
     start_date = date.today() - timedelta(days=days_back)
     offset = 0
@@ -130,6 +134,15 @@ def run_job(conn, name: str, days_back: int = 3, page_size: int = 50000) -> None
 
     if entry.get("refresh_mv"):
         conn.execute(text("REFRESH MATERIALIZED VIEW mv_property_activity"))
+        # Delivered on commit; API workers drop search caches built on the old contents.
+        conn.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": REFRESH_CHANNEL, "payload": "mv_property_activity"},
+        )
+
+    if entry.get("refresh_documents"):
+        # Same transaction as the upserts, so /property/{bbl} never sees new rows with an old document.
+        rebuild_property_documents(conn.connection, since=run_started)
 
 
 def _resolve_resource(entry: Dict[str, Any]) -> str:
@@ -188,6 +201,8 @@ def _upsert_final(conn, table: str, pk_field: str, record: Dict[str, Any]) -> No
         for col in insert_columns
         if col != pk_field
     ]
+    # Only rows whose payload changed get a new updated_at (see the WHERE below);
+    # incremental rebuilds key off it.
     update_assignments.append("updated_at = now()")
     update_sql = ", ".join(update_assignments)
 
@@ -198,6 +213,7 @@ def _upsert_final(conn, table: str, pk_field: str, record: Dict[str, Any]) -> No
             VALUES ({values_sql})
             ON CONFLICT ({pk_column}) DO UPDATE SET
             {update_sql}
+            WHERE {table_name}.raw IS DISTINCT FROM EXCLUDED.raw
             """
         ),
         params,
@@ -5,6 +5,7 @@ from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from app.utils.normalize import (
     BOROUGH_CODE_TO_NAME,
+    bbl_key,
     normalize_address,
     normalize_bbl,
     normalize_borough,
@@ -174,6 +175,7 @@ def normalize_dob_permit(row: Dict[str, Any]) -> Dict[str, Any]:
     normalized = {
         "job_number": job_number,
         "bbl": bbl,
+        "bbl_norm": bbl_key(bbl),
         "house_no": addr.house_number,
         "street_name": addr.street,
         "borough": borough_name or _clean_string(row.get("borough")),
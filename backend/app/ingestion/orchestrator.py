@@ -1,11 +1,13 @@
 import os
 import sys
+from datetime import datetime, timedelta, timezone
 
 from sqlalchemy import create_engine
 
 from app.ingestion.dob_permits import run as legacy_dob_permits_run
 from app.ingestion.framework import get_catalog, run_job
 from app.ingestion.pluto import run as run_pluto
+from app.ingestion.property_documents import rebuild as rebuild_property_documents
 
 
 def main(argv: list[str] | None = None) -> None:
@@ -35,6 +37,20 @@ def main(argv: list[str] | None = None) -> None:
             raw_conn.close()
         return
 
+    if job_name == "property_documents":
+        # No argument rebuilds every lot (e.g. after mv_permit_agg is refreshed);
+        # `property_documents N` only lots whose rows changed in the last N days.
+        since = None
+        if extras:
+            since = datetime.now(timezone.utc) - timedelta(days=_resolve_days_back(job_name, extras))
+        raw_conn = engine.raw_connection()
+        try:
+            rebuild_property_documents(raw_conn, since=since)
+            raw_conn.commit()
+        finally:
+            raw_conn.close()
+        return
+
     days_back = _resolve_days_back(job_name, extras)
 
     catalog = get_catalog()
@@ -21,6 +21,7 @@ from app.ingestion.normalizers import (
     to_borough,
     to_float,
 )
+from app.ingestion.property_documents import rebuild as rebuild_property_documents
 from app.utils.activity_log import log_activity
 
 logger = logging.getLogger(__name__)
@@ -117,7 +118,13 @@ def run(raw_conn, dry_run: bool = False) -> int:
             raw_conn.rollback()
         else:
             upserted = _promote_staging(raw_conn)
+            documents = _refresh_documents(raw_conn)
             raw_conn.commit()
+            log_activity(
+                FILES_FOR_LOG,
+                "PLUTO ingest",
+                {"event": "property_documents_rebuilt", "rows": documents},
+            )
             log_activity(
                 FILES_FOR_LOG,
                 "PLUTO ingest",
@@ -302,8 +309,21 @@ def _promote_staging(conn) -> int:
           longitude = EXCLUDED.longitude,
           raw = EXCLUDED.raw,
           updated_at = now()
+      -- Unchanged lots keep their updated_at, so property_documents only rebuilds what moved.
+      WHERE (t.bbl, t.address, t.zipcode, t.borough, t.houseno, t.street, t.latitude, t.longitude, t.raw)
+        IS DISTINCT FROM
+        (EXCLUDED.bbl, EXCLUDED.address, EXCLUDED.zipcode, EXCLUDED.borough, EXCLUDED.houseno,
+         EXCLUDED.street, EXCLUDED.latitude, EXCLUDED.longitude, EXCLUDED.raw)
     """
     with conn.cursor() as cur:
         cur.execute(sql)
         affected = cur.rowcount
     return affected
+
+
+def _refresh_documents(conn) -> int:
+    # now() is the transaction start, so this picks up exactly the rows promoted above.
+    with conn.cursor() as cur:
+        cur.execute("SELECT now()")
+        run_started = cur.fetchone()[0]
+    return rebuild_property_documents(conn, since=run_started)
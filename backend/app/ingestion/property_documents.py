@@ -0,0 +1,116 @@
+import json
+import logging
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Iterable, List, Optional
+
+from psycopg2.extras import RealDictCursor, execute_values
+
+from app.services.property_documents import (
+    DOCUMENT_PERMITS,
+    PROPERTY_BATCH_AGG_SQL,
+    PROPERTY_BATCH_BASE_SQL,
+    PROPERTY_BATCH_RECENT_SQL,
+    payloads_by_bbl,
+)
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+# Lots whose inputs were written at or after %(since)s (ingestion sets updated_at on upsert).
+_TOUCHED_SQL = """
+    SELECT NULLIF(bbl, '')::bigint AS bbl
+    FROM public.pluto
+    WHERE updated_at >= %(since)s AND NULLIF(bbl, '') IS NOT NULL
+    UNION
+    SELECT bbl_norm
+    FROM public.dob_permits
+    WHERE updated_at >= %(since)s AND bbl_norm IS NOT NULL
+"""
+
+_ALL_SQL = """
+    SELECT DISTINCT NULLIF(bbl, '')::bigint AS bbl
+    FROM public.pluto
+    WHERE NULLIF(bbl, '') IS NOT NULL
+"""
+
+_UPSERT_SQL = """
+    INSERT INTO public.property_documents (bbl, doc, built_at)
+    VALUES %s
+    ON CONFLICT (bbl) DO UPDATE SET doc = EXCLUDED.doc, built_at = EXCLUDED.built_at
+"""
+
+_DELETE_SQL = "DELETE FROM public.property_documents WHERE bbl = ANY(%(bbls)s::bigint[])"
+
+
+def _dbapi(sql: str) -> str:
+    # The batch reads are written for asyncpg; same statements, psycopg2 placeholders.
+    return sql.replace("$1", "%(bbls)s").replace("$2", "%(limit)s")
+
+
+def _json_default(value: Any):
+    # Match FastAPI's encoding of the live response.
+    if isinstance(value, Decimal):
+        return float(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def touched_bbls(conn, since: Optional[datetime] = None) -> List[int]:
+    """BBLs with pluto or dob_permits rows written at or after `since`; every pluto lot when None."""
+    with conn.cursor() as cur:
+        if since is None:
+            cur.execute(_ALL_SQL)
+        else:
+            cur.execute(_TOUCHED_SQL, {"since": since})
+        return [row[0] for row in cur.fetchall() if row[0] is not None]
+
+
+def rebuild(
+    conn,
+    since: Optional[datetime] = None,
+    bbls: Optional[Iterable[int]] = None,
+    batch_size: int = BATCH_SIZE,
+) -> int:
+    """Rebuild property_documents for `bbls`, or for the lots touched since `since`.
+
+    Runs on the caller's psycopg2 connection and transaction; nothing is committed
+    here, so documents become visible together with the ingested rows. Lots that no
+    longer have a pluto row lose their document. Returns the number written.
+    """
+    targets = list(dict.fromkeys(bbls if bbls is not None else touched_bbls(conn, since)))
+    written = 0
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        for start in range(0, len(targets), batch_size):
+            chunk = targets[start:start + batch_size]
+            params = {"bbls": chunk, "limit": DOCUMENT_PERMITS}
+            cur.execute(_dbapi(PROPERTY_BATCH_BASE_SQL), params)
+            base_rows = cur.fetchall()
+            found = [row["bbl_key"] for row in base_rows]
+            agg_rows: List[Any] = []
+            recent_rows: List[Any] = []
+            if found:
+                cur.execute(_dbapi(PROPERTY_BATCH_AGG_SQL), {"bbls": found})
+                agg_rows = cur.fetchall()
+                cur.execute(_dbapi(PROPERTY_BATCH_RECENT_SQL), {"bbls": found, "limit": DOCUMENT_PERMITS})
+                recent_rows = cur.fetchall()
+
+            docs = payloads_by_bbl(base_rows, agg_rows, recent_rows)
+            missing = [bbl for bbl in chunk if bbl not in docs]
+            if missing:
+                cur.execute(_DELETE_SQL, {"bbls": missing})
+            if docs:
+                execute_values(
+                    cur,
+                    _UPSERT_SQL,
+                    [(bbl, json.dumps(doc, default=_json_default)) for bbl, doc in docs.items()],
+                    template="(%s, %s::jsonb, now())",
+                )
+                written += len(docs)
+    logger.info("property_documents: rebuilt %s of %s touched lots", written, len(targets))
+    return written
+
+
+__all__ = ["rebuild", "touched_bbls"]
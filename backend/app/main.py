@@ -1,5 +1,7 @@
+import asyncio
 import logging
 import os
+from contextlib import asynccontextmanager
 from decimal import Decimal, InvalidOperation
 from typing import Any, Dict, Generator, List, Optional
 
@@ -8,12 +10,45 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
 from app import routes as api_routes
-from app.db.connection import get_conn as get_conn_cm
-from app.ingestion.normalizers import normalize_pluto as normalize_pluto_row
-from app.routers import chat, property as property_router, resolve, search as search_router
+from app.db.catalog import PROPERTY_SEARCH, SCHEMA
+from app.db.connection import close_pool as close_sync_pool, get_conn as get_conn_cm, get_pool as get_sync_pool
+from app.db.data_version import DATA_VERSION
+from app.db.pool import get_read_pool, read_pool_stats
+from app.routers import chat, property as property_router, resolve, search as search_router, tiles
+from app.services.property_documents import (
+    BOROUGH_CODE_TO_ABBR,
+    PROPERTY_BASE_COLUMNS,
+    PROPERTY_BATCH_AGG_SQL,
+    PROPERTY_BATCH_BASE_SQL,
+    PROPERTY_BATCH_RECENT_SQL,
+    PROPERTY_RECENT_COLUMNS,
+    aget_document,
+    payloads_by_bbl,
+    property_payload,
+    to_iso,
+)
+from app.utils.conditional import conditional_get
 from app.utils.normalize import normalize_borough
+from settings.config import settings
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # In-memory indexes load in the background so the API accepts traffic right away.
+    warmups = [
+        asyncio.create_task(search_router.load_suggest_index()),
+        asyncio.create_task(search_router.load_property_snapshot()),
+        asyncio.create_task(search_router.load_cluster_index()),
+        asyncio.create_task(asyncio.to_thread(get_sync_pool().warm)),
+        asyncio.create_task(asyncio.to_thread(SCHEMA.warm, [PROPERTY_SEARCH])),
+    ]
+    yield
+    for task in warmups:
+        task.cancel()
+    close_sync_pool()
+
 
-app = FastAPI(title="PropertyFish API", version="0.1.0")
+app = FastAPI(title="PropertyFish API", version="0.1.0", lifespan=lifespan)
 
 _cors_origins = {
     "http://localhost:3000",
@@ -44,14 +79,7 @@ app.include_router(property_router.legacy_router)
 app.include_router(chat.router, prefix="/api", tags=["chat"])
 app.include_router(api_routes.router, prefix="/api", tags=["chat-query"])
 app.include_router(search_router.router)
-
-BOROUGH_CODE_TO_ABBR = {
-    "1": ("MN", "Manhattan"),
-    "2": ("BX", "Bronx"),
-    "3": ("BK", "Brooklyn"),
-    "4": ("QN", "Queens"),
-    "5": ("SI", "Staten Island"),
-}
+app.include_router(tiles.router)
 
 BOROUGH_ABBRS = {abbr for abbr, _ in BOROUGH_CODE_TO_ABBR.values()}
 
@@ -65,57 +93,12 @@ def normalize_bbl(value: str | int) -> int:
     return int(Decimal(str(value)))
 
 
-def _borough_labels_from_bbl(bbl_int: int) -> tuple[Optional[str], Optional[str]]:
-    digits = str(bbl_int)
-    if digits:
-        entry = BOROUGH_CODE_TO_ABBR.get(digits[0])
-        if entry:
-            return entry
-    return None, None
-
-
-def _borough_labels_from_code(code: Optional[str]) -> tuple[Optional[str], Optional[str]]:
-    if not code:
-        return None, None
-    entry = BOROUGH_CODE_TO_ABBR.get(str(code)[0])
-    if entry:
-        return entry
-    return None, None
-
-
-def _maybe_decimal_to_float(value: Any):
-    if isinstance(value, Decimal):
-        return float(value)
-    return value
-
-
-def _safe_float(value: Any) -> Optional[float]:
-    if value in (None, "", "N/A"):
-        return None
-    try:
-        return float(value)
-    except (TypeError, ValueError):
-        return None
-
-
-def _to_lower_dict(data: Dict[str, Any]) -> Dict[str, Any]:
-    return {str(key).lower(): value for key, value in data.items()}
-
-
-def _to_iso(value: Any) -> Optional[str]:
-    if value is None:
-        return None
-    if hasattr(value, "isoformat"):
-        return value.isoformat()
-    return str(value)
-
-
 def get_conn() -> Generator:
     with get_conn_cm() as conn:
         yield conn
 
 
-@app.get("/property/{bbl}")
+@app.get("/property/{bbl}", dependencies=[Depends(conditional_get)])
 async def get_property(bbl: str, limit: int = 5):
     try:
         bbl_int = normalize_bbl(bbl)
@@ -124,9 +107,8 @@ async def get_property(bbl: str, limit: int = 5):
 
     limit = max(1, min(limit, 50))
 
-    base_sql = """
-      SELECT p.bbl, p.address, p.zipcode, p.borough, p.houseno, p.street,
-             p.latitude, p.longitude, p.raw
+    base_sql = f"""
+      SELECT {PROPERTY_BASE_COLUMNS}
       FROM public.pluto p
       WHERE NULLIF(p.bbl,'')::bigint = $1::bigint
       LIMIT 1
@@ -138,16 +120,21 @@ async def get_property(bbl: str, limit: int = 5):
       WHERE bbl_norm = $1::bigint
     """
 
-    recent_sql = """
-      SELECT job_number, status, issuance_date_norm, filing_date, filed_date
-      FROM public.permits_norm
-      WHERE bbl_text ~ '^[0-9]+$'
-        AND bbl_text::bigint = $1::bigint
+    recent_sql = f"""
+      SELECT {PROPERTY_RECENT_COLUMNS}
+      FROM public.dob_permits
+      WHERE bbl_norm = $1::bigint
       ORDER BY issuance_date_norm DESC NULLS LAST
       LIMIT $2
     """
 
-    async with (await search_router.get_pool()).acquire() as conn:
+    async with (await get_read_pool()).acquire() as conn:
+        # Prebuilt by ingestion (app.ingestion.property_documents); lots without one are built live.
+        if settings.PROPERTY_DOCUMENTS_ENABLED:
+            doc = await aget_document(conn, bbl_int, limit)
+            if doc is not None:
+                return doc
+
         base_row = await conn.fetchrow(base_sql, bbl_int)
         if base_row is None:
             raise HTTPException(status_code=404, detail="Not found")
@@ -155,87 +142,50 @@ async def get_property(bbl: str, limit: int = 5):
         agg_row = await conn.fetchrow(agg_sql, bbl_int)
         recent_rows = await conn.fetch(recent_sql, bbl_int, limit)
 
-    raw_pluto = base_row["raw"] or {}
-    raw_lower = _to_lower_dict(raw_pluto) if isinstance(raw_pluto, dict) else {}
-    normalized_pluto = normalize_pluto_row(raw_pluto) if isinstance(raw_pluto, dict) else {}
-
-    centroid = None
-    if base_row["latitude"] is not None and base_row["longitude"] is not None:
-        centroid = {
-            "latitude": float(base_row["latitude"]),
-            "longitude": float(base_row["longitude"]),
-        }
-
-    bbox = None
-    xmin = raw_lower.get("xmin")
-    ymin = raw_lower.get("ymin")
-    xmax = raw_lower.get("xmax")
-    ymax = raw_lower.get("ymax")
-    if all(value not in (None, "", "N/A") for value in (xmin, ymin, xmax, ymax)):
-        try:
-            bbox = [float(xmin), float(ymin), float(xmax), float(ymax)]
-        except (TypeError, ValueError):
-            bbox = None
-
-    pluto_data = {
-        "bbl": base_row["bbl"],
-        "address": base_row["address"],
-        "zipcode": base_row["zipcode"],
-        "borough": base_row["borough"],
-        "house_number": base_row["houseno"],
-        "street": base_row["street"],
-        "block": normalized_pluto.get("block"),
-        "lot": normalized_pluto.get("lot"),
-        "land_use": normalized_pluto.get("landuse"),
-        "lot_area": _maybe_decimal_to_float(normalized_pluto.get("lot_area")),
-        "building_area": _maybe_decimal_to_float(normalized_pluto.get("bldg_area")),
-        "units_residential": normalized_pluto.get("units_res"),
-        "units_rental": normalized_pluto.get("units_rent"),
-        "year_built": normalized_pluto.get("year_built"),
-        "num_floors": _safe_float(raw_lower.get("numfloors")),
-        "latitude": float(base_row["latitude"]) if base_row["latitude"] is not None else None,
-        "longitude": float(base_row["longitude"]) if base_row["longitude"] is not None else None,
-        "geometry": {
-            "centroid": centroid,
-            "bbox": bbox,
-        },
-    }
+    return property_payload(bbl_int, base_row, agg_row, recent_rows)
 
-    agg_data = {
-        "permit_count_12m": agg_row["permit_count_12m"] if agg_row else 0,
-        "last_permit_date": _to_iso(agg_row["last_permit_date"]) if agg_row else None,
-    }
 
-    recent_permits = [
-        {
-            "job_number": row["job_number"],
-            "status": row["status"],
-            "issuance_date_norm": _to_iso(row["issuance_date_norm"]),
-            "filing_date": _to_iso(row["filing_date"]),
-            "filed_date": _to_iso(row["filed_date"]),
-        }
-        for row in recent_rows
-    ]
+class PropertyBatchRequest(BaseModel):
+    bbls: List[str]
+    limit: int = 5
 
-    borough_abbr, borough_full = _borough_labels_from_bbl(bbl_int)
-    if not borough_abbr:
-        borough_abbr, borough_full = _borough_labels_from_code(normalized_pluto.get("borough"))
-    if not borough_abbr and base_row["borough"]:
-        borough_code, borough_name = normalize_borough(base_row["borough"])
-        if borough_code:
-            borough_abbr, borough_full = _borough_labels_from_code(borough_code)
-        elif borough_name:
-            borough_full = borough_name.title()
-            borough_abbr = (borough_name[:2] or "").upper()
 
+@app.post("/api/property/batch")
+async def get_properties(body: PropertyBatchRequest):
+    """`/property/{bbl}` for many lots at once: three set-based queries whatever the lot count.
+
+    Returns `results` keyed by normalized BBL, plus the requested BBLs that were
+    `invalid` or `not_found`.
+    """
+    if len(body.bbls) > settings.PROPERTY_BATCH_MAX_ITEMS:
+        raise HTTPException(413, f"Batch too large; at most {settings.PROPERTY_BATCH_MAX_ITEMS} BBLs")
+    limit = max(1, min(body.limit, 50))
+
+    bbl_ints: List[int] = []
+    invalid: List[str] = []
+    for value in body.bbls:
+        try:
+            bbl_ints.append(normalize_bbl(value))
+        except (InvalidOperation, ValueError):
+            invalid.append(value)
+    bbl_ints = list(dict.fromkeys(bbl_ints))
+
+    base_rows: List[Any] = []
+    agg_rows: List[Any] = []
+    recent_rows: List[Any] = []
+    if bbl_ints:
+        async with (await get_read_pool()).acquire() as conn:
+            base_rows = await conn.fetch(PROPERTY_BATCH_BASE_SQL, bbl_ints)
+            found = [row["bbl_key"] for row in base_rows]
+            if found:
+                agg_rows = await conn.fetch(PROPERTY_BATCH_AGG_SQL, found)
+                recent_rows = await conn.fetch(PROPERTY_BATCH_RECENT_SQL, found, limit)
+
+    results = {str(bbl_key): payload for bbl_key, payload in payloads_by_bbl(base_rows, agg_rows, recent_rows).items()}
     return {
-        "bbl": bbl_int,
-        "address": base_row["address"],
-        "borough": borough_abbr,
-        "borough_full": borough_full,
-        "pluto": pluto_data,
-        "agg": agg_data,
-        "recent_permits": recent_permits,
+        "results": results,
+        "not_found": [str(b) for b in bbl_ints if str(b) not in results],
+        "invalid": invalid,
     }
 
 
@@ -261,16 +211,7 @@ def search(
         offset,
     )
 
-    with conn.cursor() as cur_meta:
-        cur_meta.execute(
-            """
-            SELECT column_name
-            FROM information_schema.columns
-            WHERE table_schema = 'public'
-              AND table_name = 'property_search'
-            """,
-        )
-        available_columns = {row["column_name"] for row in cur_meta.fetchall()}
+    available_columns = SCHEMA.columns(conn, PROPERTY_SEARCH)
 
     optional_columns = {
         column for column in {"year_built", "units_total"} if column in available_columns
@@ -399,7 +340,7 @@ def search(
                 "borough": row.get("borough"),
                 "borough_full": row.get("borough_full"),
                 "permit_count_12m": permit_count_value if permit_count_value is not None else None,
-                "last_permit_date": _to_iso(row.get("last_permit_date")),
+                "last_permit_date": to_iso(row.get("last_permit_date")),
                 "year_built": row.get("year_built"),
                 "units_total": row.get("units_total"),
             },
@@ -453,6 +394,24 @@ def health():
     return {"ok": True}
 
 
+@app.get("/health/db-pool")
+def db_pool_stats():
+    """Checkout, wait-time and recycling counters for the synchronous psycopg2 pool."""
+    return get_sync_pool().stats()
+
+
+@app.get("/health/read-pool")
+def read_pool_health():
+    """Per-replica health, in-flight calls and latency, plus hedging counters."""
+    return read_pool_stats()
+
+
+@app.get("/health/data-version")
+def data_version_health():
+    """The dataset version behind ETags and how often it was read from ingestion_watermarks."""
+    return DATA_VERSION.stats()
+
+
 @app.get("/version")
 def version():
     return {"service": "propertyfish-chat", "env": os.getenv("ENV", "dev")}
@@ -7,7 +7,9 @@ import google.generativeai as genai
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 
-from app.routers.search import SearchRow, get_pool, run_search
+from app.db.pool import get_read_pool
+from app.routers.search import SearchRow, run_search
+from settings.config import settings
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -189,8 +191,16 @@ def resolve_sort_fields(sort: str | None) -> tuple[str | None, str | None]:
     return None, None
 
 
+def _chat_total(result) -> int:
+    # count=none/estimate can leave the total unknown or fuzzy; never report
+    # fewer properties than rows we are actually returning.
+    if result.total is None:
+        return len(result.rows)
+    return max(result.total, len(result.rows))
+
+
 @router.post("/chat", response_model=ChatResponse)
-async def chat_search(payload: ChatRequest, pool=Depends(get_pool)) -> ChatResponse:
+async def chat_search(payload: ChatRequest, pool=Depends(get_read_pool)) -> ChatResponse:
     previous_filters = payload.previous_filters
     q = payload.message
     borough = payload.borough
@@ -232,7 +242,7 @@ async def chat_search(payload: ChatRequest, pool=Depends(get_pool)) -> ChatRespo
 
     sort_field, sort_order = resolve_sort_fields(sort)
 
-    total, rows = await run_search(
+    result = await run_search(
         q=q,
         borough=borough,
         floors_min=None,
@@ -244,8 +254,12 @@ async def chat_search(payload: ChatRequest, pool=Depends(get_pool)) -> ChatRespo
         limit=24,
         offset=0,
         pool=pool,
+        count_mode=settings.CHAT_COUNT_MODE,
+        count_cap=settings.CHAT_COUNT_CAP,
         allow_yearbuilt_sort=True,
     )
+    total, rows = _chat_total(result), result.rows
+    total_label = result.total_label or str(total)
 
     applied_filters = ChatFilters(
         q=q,
@@ -254,7 +268,7 @@ async def chat_search(payload: ChatRequest, pool=Depends(get_pool)) -> ChatRespo
         sort=sort,
     )
 
-    msg = f"Found {total} properties for: {payload.message}"
+    msg = f"Found {total_label} properties for: {payload.message}"
 
     if total == 0:
         relaxed_filters, relaxation_desc = relax_filters(applied_filters)
@@ -264,7 +278,7 @@ async def chat_search(payload: ChatRequest, pool=Depends(get_pool)) -> ChatRespo
                 relaxation_desc,
             )
             relaxed_sort_field, relaxed_sort_order = resolve_sort_fields(relaxed_filters.sort)
-            total_relaxed, rows_relaxed = await run_search(
+            relaxed_result = await run_search(
                 q=relaxed_filters.q,
                 borough=relaxed_filters.borough,
                 floors_min=None,
@@ -276,15 +290,19 @@ async def chat_search(payload: ChatRequest, pool=Depends(get_pool)) -> ChatRespo
                 limit=24,
                 offset=0,
                 pool=pool,
+                count_mode=settings.CHAT_COUNT_MODE,
+                count_cap=settings.CHAT_COUNT_CAP,
                 allow_yearbuilt_sort=True,
             )
+            total_relaxed, rows_relaxed = _chat_total(relaxed_result), relaxed_result.rows
             if total_relaxed > 0:
                 total = total_relaxed
                 rows = rows_relaxed
                 applied_filters = relaxed_filters
+                total_label = relaxed_result.total_label or str(total)
                 msg = (
                     f"Nothing matched the stricter filters, so I broadened the search ({relaxation_desc}) "
-                    f"and found {total} properties for: {payload.message}"
+                    f"and found {total_label} properties for: {payload.message}"
                 )
             else:
                 total = total_relaxed
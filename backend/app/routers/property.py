@@ -1,29 +1,44 @@
-from datetime import date, datetime, timezone
-from typing import Any, Dict, Generator, List, Optional
+import asyncio
+import logging
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+import asyncpg
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 
-from app.db.connection import get_conn as get_conn_cm
+from app.db.catalog import PROPERTY_SEARCH, SCHEMA
+from app.db.data_version import DATA_VERSION
+from app.db.pool import get_read_pool
+from app.db.timeouts import statement_timeout, timeout_kwargs
+from app.services.property_documents import RECENT_PERMIT_DATE_SQL
 from app.services.property_service import (
-    get_deeds_by_bbl,
-    get_mortgages_by_bbl,
-    get_permits,
-    get_permits_by_bbl,
-    get_summary_by_bbl,
-    get_violations_by_bbl,
-    get_zoning_by_bbl,
-    resolve_to_bbl,
+    aget_deeds_by_bbl,
+    aget_mortgages_by_bbl,
+    aget_permits,
+    aget_permits_by_bbl,
+    aget_summary_by_bbl,
+    aget_violations_by_bbl,
+    aget_zoning_by_bbl,
+    aresolve_to_bbl,
 )
+from settings.config import settings
+from app.utils.conditional import conditional_get, if_none_match, validators
+from app.utils.singleflight import SingleFlight
 
 
-def get_conn() -> Generator:
-    with get_conn_cm() as conn:
-        yield conn
-
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/property", tags=["property"])
-legacy_router = APIRouter(prefix="/property", tags=["property"])
+legacy_router = APIRouter(prefix="/property", tags=["property"], dependencies=[Depends(conditional_get)])
+
+# ETag / 304 for data routes; the stats route changes without the data version.
+# The tags are strong, so these bodies carry no wall-clock values: sources[].updated
+# is the row's own last_updated or the data version's latest ingestion run.
+_CONDITIONAL = [Depends(conditional_get)]
+
+# Concurrent requests for the same lot share one connection and one set of queries.
+PROPERTY_FLIGHTS = SingleFlight()
 
 
 class PropertySummary(BaseModel):
@@ -54,59 +69,63 @@ class PropertyDetailResponse(BaseModel):
     recent_permits: List[PropertyPermit]
 
 
-def _resolve(
-    conn,
+async def _resolve(
+    pool,
     address: str | None = None,
     houseno: str | None = None,
     street: str | None = None,
     borough: str | None = None,
 ):
-    results = resolve_to_bbl(
-        conn,
-        {
-            "address": address,
-            "houseno": houseno,
-            "street": street,
-            "borough": borough,
-        },
-    )
+    async with pool.acquire() as conn:
+        results = await aresolve_to_bbl(
+            conn,
+            {
+                "address": address,
+                "houseno": houseno,
+                "street": street,
+                "borough": borough,
+            },
+        )
     if not results:
         raise HTTPException(status_code=404, detail="No match")
     return results
 
 
-@router.get("/resolve")
-def resolve(
+@router.get("/resolve", dependencies=_CONDITIONAL)
+async def resolve(
     address: str | None = None,
     houseno: str | None = None,
     street: str | None = None,
     borough: str | None = None,
-    conn=Depends(get_conn),
+    pool=Depends(get_read_pool),
 ):
-    return _resolve(conn, address, houseno, street, borough)
+    return await _resolve(pool, address, houseno, street, borough)
 
 
-def _property_search_columns(conn) -> set[str]:
-    with conn.cursor() as cur:
-        cur.execute(
-            """
-            SELECT column_name
-            FROM information_schema.columns
-            WHERE table_schema = 'public' AND table_name = 'property_search'
-            """,
-        )
-        rows = cur.fetchall() or []
-    return {row["column_name"] for row in rows}
+@router.get("/stats/single-flight")
+def property_single_flight_stats() -> Dict[str, Any]:
+    """How many /api/property/{bbl} requests were served by another in-flight request."""
+    return PROPERTY_FLIGHTS.stats()
 
 
-@router.get("/{bbl}", response_model=PropertyDetailResponse)
-def property_detail(bbl: str, conn=Depends(get_conn)) -> PropertyDetailResponse:
+@router.get("/{bbl}", response_model=PropertyDetailResponse, dependencies=_CONDITIONAL)
+async def property_detail(bbl: str, pool=Depends(get_read_pool)) -> PropertyDetailResponse:
     try:
         bbl_int = int(str(bbl))
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid BBL")
+    # The connection is acquired inside the flight, so followers never take one.
+    with statement_timeout(settings.PROPERTY_TIMEOUT_MS):
+        return await PROPERTY_FLIGHTS.run(("detail", bbl_int), lambda: _load_property_detail(pool, bbl_int))
+
+
+async def _load_property_detail(pool, bbl_int: int) -> PropertyDetailResponse:
+    async with pool.acquire() as conn:
+        return await _property_detail(conn, bbl_int)
 
-    available_columns = _property_search_columns(conn)
+
+async def _property_detail(conn, bbl_int: int) -> PropertyDetailResponse:
+    available_columns = await SCHEMA.acolumns(conn, PROPERTY_SEARCH)
     column_map = {
         "bbl": "bbl",
         "address": "address",
@@ -134,11 +153,11 @@ def property_detail(bbl: str, conn=Depends(get_conn)) -> PropertyDetailResponse:
     summary_sql = f"""
       SELECT {', '.join(select_parts)}
       FROM property_search ps
-      WHERE ps.bbl = %s::bigint
+      WHERE ps.bbl = $1::bigint
       LIMIT 1
     """
 
-    permits_sql = """
+    permits_sql = f"""
       SELECT
         job_number,
         status,
@@ -147,21 +166,17 @@ def property_detail(bbl: str, conn=Depends(get_conn)) -> PropertyDetailResponse:
         description,
         source_url
       FROM dob_permits
-      WHERE bbl ~ '^[0-9]'
-        AND NULLIF(regexp_replace(bbl, '\..*', ''), '')::bigint = %s::bigint
-      ORDER BY COALESCE(issuance_date, filing_date, filed_date, status_date, latest_status_date) DESC NULLS LAST
+      WHERE bbl_norm = $1::bigint
+      ORDER BY {RECENT_PERMIT_DATE_SQL} DESC NULLS LAST
       LIMIT 5
     """
 
-    with conn.cursor() as cur:
-        cur.execute(summary_sql, (bbl_int,))
-        summary_row = cur.fetchone()
-        if not summary_row:
-            raise HTTPException(status_code=404, detail="Not found")
-        summary = PropertySummary(**dict(summary_row))
+    summary_row = await conn.fetchrow(summary_sql, bbl_int, **timeout_kwargs())
+    if not summary_row:
+        raise HTTPException(status_code=404, detail="Not found")
+    summary = PropertySummary(**dict(summary_row))
 
-        cur.execute(permits_sql, (bbl_int,))
-        permits_rows = cur.fetchall() or []
+    permits_rows = await conn.fetch(permits_sql, bbl_int, **timeout_kwargs())
 
     return PropertyDetailResponse(
         summary=summary,
@@ -169,14 +184,85 @@ def property_detail(bbl: str, conn=Depends(get_conn)) -> PropertyDetailResponse:
     )
 
 
-@router.get("/{bbl}/permits")
-def permits(bbl: str, conn=Depends(get_conn)) -> List[Dict[str, Any]]:
-    return get_permits(conn, bbl)
+# Sections of /api/property/{bbl}/bundle, each equal to the response of the endpoint it names.
+BUNDLE_SECTIONS: Dict[str, Callable[[str, Any], Awaitable[Any]]] = {
+    "detail": lambda bbl, pool: property_detail(bbl, pool=pool),
+    "summary": lambda bbl, pool: summary(bbl),
+    "zoning": lambda bbl, pool: zoning(bbl),
+    "deeds": lambda bbl, pool: deeds(bbl),
+    "mortgages": lambda bbl, pool: mortgages(bbl),
+    "violations": lambda bbl, pool: violations(bbl),
+    "permits": lambda bbl, pool: permits(bbl, pool=pool),
+}
+
+
+def _parse_include(include: Optional[str]) -> List[str]:
+    if not include:
+        return list(BUNDLE_SECTIONS)
+    sections = list(dict.fromkeys(part.strip() for part in include.split(",") if part.strip()))
+    unknown = [name for name in sections if name not in BUNDLE_SECTIONS]
+    if unknown:
+        raise HTTPException(400, f"Unknown section(s) {', '.join(unknown)}; choose from {', '.join(BUNDLE_SECTIONS)}")
+    return sections
+
+
+# Database and connection failures; checked after asyncio.TimeoutError, an OSError subclass.
+_SECTION_UNAVAILABLE = (asyncpg.PostgresError, asyncpg.InterfaceError, OSError)
+
+
+async def _bundle_section(name: str, bbl: str, pool, timeout_ms: int) -> Dict[str, Any]:
+    try:
+        # The statement budget cancels the query server-side; wait_for also bounds pool waits.
+        with statement_timeout(timeout_ms):
+            data = await asyncio.wait_for(BUNDLE_SECTIONS[name](bbl, pool), timeout_ms / 1000.0 if timeout_ms else None)
+    except HTTPException as exc:
+        return {"ok": False, "error": {"status": exc.status_code, "detail": exc.detail}}
+    except asyncio.TimeoutError:
+        return {"ok": False, "error": {"status": 504, "detail": f"{name} timed out"}}
+    except _SECTION_UNAVAILABLE as exc:
+        # A missing table or a dropped connection costs this section only.
+        logger.warning("property bundle section %s failed for %s: %r", name, bbl, exc)
+        return {"ok": False, "error": {"status": 503, "detail": f"{name} unavailable"}}
+    return {"ok": True, "data": data}
+
+
+@router.get("/{bbl}/bundle")
+async def property_bundle(
+    request: Request,
+    response: Response,
+    bbl: str,
+    include: Optional[str] = Query(None, description="Comma-separated sections; default all"),
+    pool=Depends(get_read_pool),
+) -> Any:
+    """Every property-page section in one response, fetched concurrently on the async pool.
+
+    Each section is `{"ok": true, "data": ...}` or `{"ok": false, "error": {"status", "detail"}}`;
+    a section that fails or exceeds PROPERTY_BUNDLE_SECTION_TIMEOUT_MS does not hold up the rest.
+    Validators are only sent (and If-None-Match only honoured) when every section succeeded:
+    a timed-out section would otherwise be cached under the data version's tag.
+    """
+    sections = _parse_include(include)
+    results = await asyncio.gather(
+        *(_bundle_section(name, bbl, pool, settings.PROPERTY_BUNDLE_SECTION_TIMEOUT_MS) for name in sections)
+    )
+    if all(result["ok"] for result in results):
+        headers = await validators(request)
+        if headers is not None:
+            if if_none_match(request.headers.get("if-none-match"), headers["ETag"]):
+                return Response(status_code=304, headers=headers)
+            response.headers.update(headers)
+    return {"bbl": bbl, "sections": dict(zip(sections, results))}
+
+
+@router.get("/{bbl}/permits", dependencies=_CONDITIONAL)
+async def permits(bbl: str, pool=Depends(get_read_pool)) -> List[Dict[str, Any]]:
+    async with pool.acquire() as conn:
+        return await aget_permits(conn, bbl)
 
 
-@router.get("/{bbl}/summary")
-def summary(bbl: str):
-    row = get_summary_by_bbl(bbl)
+@router.get("/{bbl}/summary", dependencies=_CONDITIONAL)
+async def summary(bbl: str):
+    row = await aget_summary_by_bbl(bbl)
     if not row:
         raise HTTPException(status_code=404, detail="Not found")
     sources = [
@@ -191,12 +277,12 @@ def summary(bbl: str):
     return out
 
 
-@router.get("/{bbl}/zoning")
-def zoning(bbl: str):
-    row = get_zoning_by_bbl(bbl)
+@router.get("/{bbl}/zoning", dependencies=_CONDITIONAL)
+async def zoning(bbl: str):
+    row = await aget_zoning_by_bbl(bbl)
     source = {
         "name": "ZoLa/DCP",
-        "updated": datetime.now(timezone.utc).isoformat(),
+        "updated": row.get("last_updated") if row else None,
         "url": "https://zola.planning.nyc.gov",
     }
     if not row:
@@ -210,91 +296,91 @@ def zoning(bbl: str):
     }
 
 
-@router.get("/{bbl}/deeds")
-def deeds(bbl: str, limit: int = 5):
-    rows = get_deeds_by_bbl(bbl, limit)
+@router.get("/{bbl}/deeds", dependencies=_CONDITIONAL)
+async def deeds(bbl: str, limit: int = 5):
+    rows = await aget_deeds_by_bbl(bbl, limit)
     source = {
         "name": "ACRIS – Real Property Legals/Master",
-        "updated": datetime.now(timezone.utc).isoformat(),
+        "updated": await DATA_VERSION.updated(),
         "url": "https://www.nyc.gov/site/finance/property/acris.page",
     }
     return {"rows": rows, "sources": [source]}
 
 
-@router.get("/{bbl}/mortgages")
-def mortgages(bbl: str, limit: int = 5):
-    rows = get_mortgages_by_bbl(bbl, limit)
+@router.get("/{bbl}/mortgages", dependencies=_CONDITIONAL)
+async def mortgages(bbl: str, limit: int = 5):
+    rows = await aget_mortgages_by_bbl(bbl, limit)
     source = {
         "name": "ACRIS – Real Property Legals/Master",
-        "updated": datetime.now(timezone.utc).isoformat(),
+        "updated": await DATA_VERSION.updated(),
         "url": "https://www.nyc.gov/site/finance/property/acris.page",
     }
     return {"rows": rows, "sources": [source]}
 
 
-@router.get("/{bbl}/violations")
-def violations(bbl: str, since: str | None = None):
-    rows = get_violations_by_bbl(bbl, since)
+@router.get("/{bbl}/violations", dependencies=_CONDITIONAL)
+async def violations(bbl: str, since: str | None = None):
+    rows = await aget_violations_by_bbl(bbl, since)
     source = {
         "name": "NYC DOB",
-        "updated": datetime.now(timezone.utc).isoformat(),
+        "updated": await DATA_VERSION.updated(),
         "url": "https://data.cityofnewyork.us",
     }
     return {"rows": rows, "sources": [source]}
 
 
-@router.get("/{bbl}/geo")
-def geo(bbl: str):
+@router.get("/{bbl}/geo", dependencies=_CONDITIONAL)
+async def geo(bbl: str):
     return {"parcel": None}
 
 
 @legacy_router.get("/resolve")
-def resolve_legacy(
+async def resolve_legacy(
     address: str | None = None,
     houseno: str | None = None,
     street: str | None = None,
     borough: str | None = None,
-    conn=Depends(get_conn),
+    pool=Depends(get_read_pool),
 ):
-    return _resolve(conn, address, houseno, street, borough)
+    return await _resolve(pool, address, houseno, street, borough)
 
 
 @legacy_router.get("/{bbl}/summary")
-def summary_legacy(bbl: str):
-    return summary(bbl)
+async def summary_legacy(bbl: str):
+    return await summary(bbl)
 
 
 @legacy_router.get("/{bbl}/zoning")
-def zoning_legacy(bbl: str):
-    return zoning(bbl)
+async def zoning_legacy(bbl: str):
+    return await zoning(bbl)
 
 
 @legacy_router.get("/{bbl}/deeds")
-def deeds_legacy(bbl: str, limit: int = 5):
-    return deeds(bbl, limit)
+async def deeds_legacy(bbl: str, limit: int = 5):
+    return await deeds(bbl, limit)
 
 
 @legacy_router.get("/{bbl}/mortgages")
-def mortgages_legacy(bbl: str, limit: int = 5):
-    return mortgages(bbl, limit)
+async def mortgages_legacy(bbl: str, limit: int = 5):
+    return await mortgages(bbl, limit)
 
 
 @legacy_router.get("/{bbl}/permits")
-def permits_legacy(bbl: str, limit: int = 20):
-    rows = get_permits_by_bbl(bbl, limit)
+async def permits_legacy(bbl: str, limit: int = 20):
+    rows = await aget_permits_by_bbl(bbl, limit)
     source = {
         "name": "NYC DOB",
-        "updated": datetime.now(timezone.utc).isoformat(),
+        "updated": await DATA_VERSION.updated(),
         "url": "https://data.cityofnewyork.us",
     }
     return {"rows": rows, "sources": [source]}
 
 
 @legacy_router.get("/{bbl}/violations")
-def violations_legacy(bbl: str, since: str | None = None):
-    return violations(bbl, since)
+async def violations_legacy(bbl: str, since: str | None = None):
+    return await violations(bbl, since)
 
 
 @legacy_router.get("/{bbl}/geo")
-def geo_legacy(bbl: str):
-    return geo(bbl)
+async def geo_legacy(bbl: str):
+    return await geo(bbl)
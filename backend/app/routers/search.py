@@ -1,17 +1,40 @@
-from datetime import date
-from typing import Optional, Mapping, Any
+from datetime import date, datetime
+from typing import Optional, Mapping, Any, AsyncIterator, Awaitable, Callable, NamedTuple
+import base64
+import binascii
+import csv
+import io
+import hashlib
+import json
 import logging
-import os
+import math
 import re
 
+import asyncio
+
 import asyncpg
-from fastapi import APIRouter, Query, HTTPException, Depends
-from pydantic import BaseModel
+from fastapi import APIRouter, Query, HTTPException, Depends, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 
+from app.db.catalog import SCHEMA
+from app.db.pool import get_pool, get_read_pool
+from app.db.replicas import run_read
+from app.db.refresh import on_refresh
+from app.db.statements import StatementRegistry
+from app.db.timeouts import statement_timeout, timeout_kwargs
+from app.utils.cache import TTLCache
+from app.utils.cancellation import cancel_on_disconnect
+from app.utils.conditional import conditional_get
+from app.utils.singleflight import SingleFlight
+from app.ingestion.normalizers import derive_houseno_street
+from app.services.clusters import get_cluster_index, rebuild_cluster_index
+from app.services.snapshot import get_property_snapshot, numpy_available, reload_property_snapshot
+from app.services.suggest import get_suggest_index, rebuild_suggest_index
+from app.utils.normalize import NormalizedAddress, address_search_key, normalize_address
 from settings.config import settings
 
 router = APIRouter()
-_POOL: Optional[asyncpg.Pool] = None
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +51,28 @@ BOROUGH_NAME_MAP = {
 }
 
 _TABLE_NAME_PATTERN = re.compile(r"^[a-zA-Z0-9_\.]+$")
+_PLACEHOLDER_PATTERN = re.compile(r"\$[0-9]+")
+_BBL_PATTERN = re.compile(r"^[1-5][0-9]{9}$")
+_BBL_PREFIX_PATTERN = re.compile(r"^[1-5][0-9]{5,8}$")
+# "120 Broadway", "41-02 Main St", "12A Bay Ridge Pkwy": house number then a street name.
+_STRUCTURED_ADDRESS_PATTERN = re.compile(r"^\d+[A-Za-z]?(?:-\d+)?\s+[A-Za-z0-9]")
+
+# contains: ILIKE '%q%' over address/bbl/borough (legacy behaviour).
+# trigram: route q to bbl/borough equality or a trigram match on the address key.
+MATCH_MODES = {"contains", "trigram"}
+
+# sql: every query goes to Postgres.
+# memory: queries without q or cursor are answered from the in-process snapshot
+# once it has loaded; everything else still goes to Postgres.
+SEARCH_ENGINES = {"sql", "memory"}
+
+# Upper bound for radius=lat,lon,meters; wider areas should use bbox.
+MAX_RADIUS_METERS = 25000.0
+_METERS_PER_DEGREE = 111320.0
+
+BOROUGH_FACET_ORDER = ("MN", "BX", "BK", "QN", "SI")
+# (label, lowest permit_count_12m in the band); NULL counts fall in the first band.
+PERMIT_BANDS = [("0", 0), ("1-2", 1), ("3-5", 3), ("6-10", 6), ("11+", 11)]
 
 
 def _coerce_table_name(value: Optional[str]) -> str:
@@ -40,18 +85,99 @@ def _coerce_table_name(value: Optional[str]) -> str:
 
 
 TABLE_SEARCH = _coerce_table_name(settings.TABLE_SEARCH)
+ADDRESS_KEY_COLUMN = _coerce_table_name(settings.SEARCH_ADDRESS_KEY_COLUMN)
+GEOM_COLUMN = _coerce_table_name(settings.SEARCH_GEOM_COLUMN)
+
+# SearchRow columns, in order; also the /api/search/export field list.
+SEARCH_COLUMNS = [
+    "(ps.bbl)::text AS bbl",
+    "ps.address AS address",
+    "ps.borough_full AS borough_full",
+    "ps.zonedist1 AS zonedist1",
+    "ps.yearbuilt AS yearbuilt",
+    "ps.unitsres AS unitsres",
+    "ps.unitstotal AS unitstotal",
+    "ps.permit_count_12m AS permit_count_12m",
+    "ps.last_permit_date AS last_permit_date",
+]
+EXPORT_FIELDS = [column.rsplit(" AS ", 1)[1] for column in SEARCH_COLUMNS]
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
 
+# Keyed on run_search's validated_params; cleared whenever the backing MV refreshes.
+SEARCH_CACHE = TTLCache(maxsize=settings.SEARCH_CACHE_SIZE, ttl=settings.SEARCH_CACHE_TTL)
+# Facet counts keyed on the filter signature; cleared together with SEARCH_CACHE.
+FACETS_CACHE = TTLCache(maxsize=settings.SEARCH_CACHE_SIZE, ttl=settings.SEARCH_CACHE_TTL)
+# Coalesces identical in-flight run_search database calls (same key as SEARCH_CACHE).
+SEARCH_FLIGHTS = SingleFlight()
+# Per-shape timings for run_search statements (filter/sort shape); asyncpg caches the
+# prepared statements themselves per connection (statement_cache_size).
+SEARCH_STATEMENTS = StatementRegistry()
+
+
+@on_refresh
+def _invalidate_search_cache(payload: str) -> None:
+    logger.info("PF-BE-SEARCH clearing result cache after refresh of %s", payload or "backing view")
+    SEARCH_CACHE.clear()
+    FACETS_CACHE.clear()
+
+
+async def load_suggest_index() -> None:
+    """Build the autocomplete index from TABLE_SEARCH; failures leave the previous index in place."""
+    if not settings.SUGGEST_ENABLED:
+        return
+    try:
+        await rebuild_suggest_index(await get_pool(), TABLE_SEARCH)
+    except (OSError, asyncpg.PostgresError) as exc:
+        logger.warning("PF-BE-SEARCH suggest index not built: %s", exc)
 
-async def get_pool():
-    global _POOL
-    if _POOL is None:
-        _POOL = await asyncpg.create_pool(
-            dsn=os.getenv("DATABASE_URL"),
-            min_size=2,
-            max_size=int(os.getenv("DB_POOL_MAX", "12")),
-            command_timeout=30,
+
+@on_refresh
+def _rebuild_suggest_index(payload: str):
+    return load_suggest_index()
+
+
+async def load_cluster_index() -> None:
+    """Precompute map clusters for every zoom from TABLE_SEARCH; failures keep the previous index."""
+    if not settings.CLUSTERS_ENABLED:
+        return
+    try:
+        await rebuild_cluster_index(
+            await get_pool(),
+            TABLE_SEARCH,
+            GEOM_COLUMN,
+            min_zoom=settings.CLUSTER_MIN_ZOOM,
+            max_zoom=settings.CLUSTER_MAX_ZOOM,
+            cell_px=settings.CLUSTER_CELL_PX,
         )
-    return _POOL
+    except (OSError, asyncpg.PostgresError) as exc:
+        logger.warning("PF-BE-SEARCH cluster index not built: %s", exc)
+
+
+@on_refresh
+def _rebuild_cluster_index(payload: str):
+    return load_cluster_index()
+
+
+def _memory_engine_enabled() -> bool:
+    return settings.SEARCH_ENGINE == "memory"
+
+
+async def load_property_snapshot() -> None:
+    """Load the filter/sort snapshot when SEARCH_ENGINE=memory; failures keep serving from SQL."""
+    if not _memory_engine_enabled():
+        return
+    if not numpy_available():
+        logger.warning("PF-BE-SEARCH SEARCH_ENGINE=memory needs numpy; serving from SQL")
+        return
+    try:
+        await reload_property_snapshot(await get_pool(), TABLE_SEARCH)
+    except (OSError, asyncpg.PostgresError) as exc:
+        logger.warning("PF-BE-SEARCH property snapshot not loaded: %s", exc)
+
+
+@on_refresh
+def _reload_property_snapshot(payload: str):
+    return load_property_snapshot()
 
 
 class SearchRow(BaseModel):
@@ -67,8 +193,319 @@ class SearchRow(BaseModel):
 
 
 class SearchResponse(BaseModel):
+    total: Optional[int] = None
+    total_label: Optional[str] = None
+    count_mode: str = "exact"
+    rows: list[SearchRow]
+    next_cursor: Optional[str] = None
+
+
+class Suggestion(BaseModel):
+    bbl: str
+    address: str
+    permit_count_12m: int = 0
+
+
+class SuggestResponse(BaseModel):
+    ready: bool
+    suggestions: list[Suggestion]
+
+
+class FacetBucket(BaseModel):
+    value: str
+    count: int
+
+
+class FacetsResponse(BaseModel):
     total: int
+    borough: list[FacetBucket]
+    decade_built: list[FacetBucket]
+    permit_activity: list[FacetBucket]
+
+
+class Cluster(BaseModel):
+    count: int
+    lon: float
+    lat: float
+    max_permit_count_12m: int
+
+
+class ClustersResponse(BaseModel):
+    ready: bool
+    zoom: Optional[int] = None
+    clusters: list[Cluster]
+
+
+class BatchSearchQuery(BaseModel):
+    q: Optional[str] = None
+    borough: Optional[str] = None
+    floors_min: Optional[int] = Field(None, ge=0)
+    units_min: Optional[int] = Field(None, ge=0)
+    year_min: Optional[int] = Field(None, ge=0)
+    permits_min_12m: Optional[int] = Field(None, ge=0)
+    sort: Optional[str] = None
+    order: Optional[str] = None
+    limit: int = Field(20, ge=1, le=200)
+    offset: int = Field(0, ge=0)
+    cursor: Optional[str] = None
+    count: str = "exact"
+    mode: str = "contains"
+    bbox: Optional[str] = None
+    radius: Optional[str] = None
+
+
+class BatchSearchRequest(BaseModel):
+    queries: list[BatchSearchQuery]
+
+
+class BatchError(BaseModel):
+    status: int
+    detail: str
+
+
+class BatchSearchItem(BaseModel):
+    ok: bool
+    result: Optional[SearchResponse] = None
+    error: Optional[BatchError] = None
+
+
+class BatchSearchResponse(BaseModel):
+    results: list[BatchSearchItem]
+
+
+class SearchResult(NamedTuple):
+    total: Optional[int]
     rows: list[SearchRow]
+    next_cursor: Optional[str] = None
+    total_label: Optional[str] = None
+    count_mode: str = "exact"
+
+
+# exact: COUNT(*); capped: COUNT(*) over at most cap+1 rows; estimate: planner row
+# estimate; none: skip counting entirely.
+COUNT_MODES = {"exact", "capped", "estimate", "none"}
+
+
+# (expression, direction, nulls_first) triples describing the ORDER BY of a search page.
+SortKey = tuple[str, str, bool]
+
+
+def _sort_fingerprint(sort_keys: list[SortKey]) -> str:
+    # Placeholders inside expressions shift with the active filters, so only the
+    # column/direction shape is fingerprinted.
+    shape = "|".join(
+        f"{_PLACEHOLDER_PATTERN.sub('?', expr)}:{direction}:{int(nulls_first)}"
+        for expr, direction, nulls_first in sort_keys
+    )
+    return hashlib.sha1(shape.encode("utf-8")).hexdigest()[:12]
+
+
+def _cursor_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"$d": value.isoformat()}
+    raise TypeError(f"Unsupported cursor value {type(value).__name__}")
+
+
+def _cursor_object_hook(obj: dict) -> Any:
+    if "$dt" in obj:
+        return datetime.fromisoformat(obj["$dt"])
+    if "$d" in obj:
+        return date.fromisoformat(obj["$d"])
+    return obj
+
+
+def encode_cursor(sort_keys: list[SortKey], values: list[Any]) -> str:
+    """Pack the last row's sort tuple into an opaque, URL-safe token."""
+    payload = json.dumps(
+        {"s": _sort_fingerprint(sort_keys), "v": list(values)},
+        default=_cursor_default,
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, sort_keys: list[SortKey]) -> list[Any]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii"))
+        payload = json.loads(raw, object_hook=_cursor_object_hook)
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise HTTPException(400, "Invalid cursor") from exc
+    if not isinstance(payload, dict) or payload.get("s") != _sort_fingerprint(sort_keys):
+        raise HTTPException(400, "Cursor does not match the requested sort")
+    values = payload.get("v")
+    if not isinstance(values, list) or len(values) != len(sort_keys):
+        raise HTTPException(400, "Invalid cursor")
+    return values
+
+
+def _keyset_predicate(sort_keys: list[SortKey], values: list[Any], add_param) -> str:
+    """Build the "row sorts strictly after `values`" predicate for a mixed-direction ORDER BY.
+
+    The OR-chain alone gives the planner no bound on the leading sort column, so a
+    redundant range on it is ANDed in front (see _leading_bound).
+    """
+    disjuncts: list[str] = []
+    equal_prefix: list[str] = []
+    placeholders: list[Optional[str]] = []
+    for (expr, direction, nulls_first), value in zip(sort_keys, values):
+        if value is None:
+            placeholders.append(None)
+            after = f"{expr} IS NOT NULL" if nulls_first else None
+            equal = f"{expr} IS NULL"
+        else:
+            placeholder = add_param(value)
+            placeholders.append(placeholder)
+            after = f"{expr} {'<' if direction == 'desc' else '>'} {placeholder}"
+            if not nulls_first:
+                after = f"({after} OR {expr} IS NULL)"
+            equal = f"{expr} = {placeholder}"
+        if after:
+            disjuncts.append("(" + " AND ".join(equal_prefix + [after]) + ")")
+        equal_prefix.append(equal)
+    if not disjuncts:
+        return "FALSE"
+    predicate = "(" + " OR ".join(disjuncts) + ")"
+    bound = _leading_bound(sort_keys[0], placeholders[0])
+    return f"({bound} AND {predicate})" if bound else predicate
+
+
+def _leading_bound(key: SortKey, placeholder: Optional[str]) -> Optional[str]:
+    """Rows at or after the cursor (`placeholder`, None for NULL) on the first sort key, as a condition the index can start from.
+
+    With the curated order (permit_count_12m DESC NULLS LAST, matching
+    idx_ps_rich_curated_order), a cursor inside the NULL tail gives
+    `permit_count_12m IS NULL` and a NULLS FIRST key gives a plain `<=`/`>=`; both are
+    index conditions, so the scan starts at the cursor instead of the top. A non-NULL
+    value on a NULLS LAST key has to admit the NULL tail as well; that OR is not an
+    index condition, but it gives the planner the leading column's selectivity.
+    """
+    expr, direction, nulls_first = key
+    if placeholder is None:
+        # NULLS FIRST: every non-NULL row follows, so there is nothing to bound.
+        return None if nulls_first else f"{expr} IS NULL"
+    bound = f"{expr} {'<=' if direction == 'desc' else '>='} {placeholder}"
+    return bound if nulls_first else f"({bound} OR {expr} IS NULL)"
+
+
+async def _count_total(
+    conn,
+    mode: str,
+    base: str,
+    where_args: list[object],
+    cap: int,
+    filter_shape: frozenset = frozenset(),
+) -> tuple[Optional[int], Optional[str]]:
+    """Return (total, label) for the FROM/WHERE fragment `base` using the given count mode."""
+    if mode == "none":
+        return None, None
+    if mode == "capped":
+        cap_ph = f"${len(where_args) + 1}"
+        sql = f"SELECT COUNT(*) FROM (SELECT 1 {base} LIMIT {cap_ph}) capped"
+        counted = await SEARCH_STATEMENTS.fetchval(
+            conn, ("count:capped", filter_shape), sql, *where_args, cap + 1
+        )
+        if counted > cap:
+            return cap, f"{cap}+"
+        return counted, str(counted)
+    if mode == "estimate":
+        plan = await conn.fetchval(f"EXPLAIN (FORMAT JSON) SELECT 1 {base}", *where_args, **timeout_kwargs())
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimated = int(plan[0]["Plan"]["Plan Rows"])
+        return estimated, f"~{estimated}"
+    counted = await SEARCH_STATEMENTS.fetchval(
+        conn, ("count:exact", filter_shape), f"SELECT COUNT(*) {base}", *where_args
+    )
+    return counted, str(counted)
+
+
+def classify_query(q: str) -> tuple[str, Any]:
+    """Route a free-text query to the cheapest index-friendly predicate.
+
+    Returns one of ("bbl", int), ("bbl_prefix", (low, high)), ("borough", code)
+    or ("address", address_key).
+    """
+    compact = re.sub(r"[\s-]+", "", q)
+    if _BBL_PATTERN.fullmatch(compact):
+        return "bbl", int(compact)
+    if _BBL_PREFIX_PATTERN.fullmatch(compact):
+        scale = 10 ** (10 - len(compact))
+        return "bbl_prefix", (int(compact) * scale, (int(compact) + 1) * scale - 1)
+    token = q.strip().upper().replace(".", "")
+    if token in BOROUGH_ABBREVS:
+        return "borough", token
+    if token in BOROUGH_NAME_MAP:
+        return "borough", BOROUGH_NAME_MAP[token]
+    return "address", address_search_key(q) or token
+
+
+def parse_structured_address(q: Optional[str]) -> Optional[tuple[NormalizedAddress, Optional[str]]]:
+    """Return (normalized address, borough code) when `q` looks like "<house number> <street>".
+
+    A trailing ", Brooklyn" style component is picked up as the borough; other
+    trailing components (city, zip) are ignored.
+    """
+    if not q:
+        return None
+    head, *tail = [part.strip() for part in q.split(",")]
+    if not _STRUCTURED_ADDRESS_PATTERN.match(head):
+        return None
+    houseno, street = derive_houseno_street(head)
+    if not houseno:
+        match = re.match(r"^(\d+[A-Za-z]?)\s+(.+)$", head)
+        if not match:
+            return None
+        houseno, street = match.group(1), match.group(2)
+    address = normalize_address(houseno, street)
+    if not address.house_number or not address.street:
+        return None
+    borough_code = None
+    for part in tail:
+        token = part.upper().replace(".", "")
+        if token in BOROUGH_ABBREVS:
+            borough_code = token
+        elif token in BOROUGH_NAME_MAP:
+            borough_code = BOROUGH_NAME_MAP[token]
+    return address, borough_code
+
+
+# Columns the structured address lookup filters on; relations without them skip it.
+_STRUCTURED_COLUMNS = frozenset({"houseno", "street"})
+# Sorts after every character, so street prefixes become a byte-order range
+# (text_pattern_ops operators) without LIKE wildcards.
+_PREFIX_UPPER = "\U0010ffff"
+
+
+async def _has_structured_columns(conn) -> bool:
+    """Whether TABLE_SEARCH has the columns the structured lookup filters on (cached in SCHEMA)."""
+    return _STRUCTURED_COLUMNS <= await SCHEMA.acolumns(conn, TABLE_SEARCH)
+
+
+async def _structured_lookup(
+    pool, q: Optional[str], borough: Optional[str]
+) -> Optional[tuple[Optional[str], NormalizedAddress]]:
+    """(borough, address) for the structured lookup of `q`, or None when q is not address-shaped
+    or TABLE_SEARCH cannot answer it.
+
+    An explicit borough filter wins over one named in the query text.
+    """
+    structured = _parse_structured_lookup(q, borough)
+    if not structured or not await run_read(pool, _has_structured_columns):
+        return None
+    return structured
+
+
+def _parse_structured_lookup(
+    q: Optional[str], borough: Optional[str]
+) -> Optional[tuple[Optional[str], NormalizedAddress]]:
+    structured = parse_structured_address(q)
+    if not structured:
+        return None
+    address, q_borough = structured
+    return borough or q_borough, address
 
 
 def _map_search_row(record: Mapping[str, Any]) -> SearchRow:
@@ -86,36 +523,95 @@ def _map_search_row(record: Mapping[str, Any]) -> SearchRow:
     )
 
 
-async def run_search(
-    q: Optional[str],
-    borough: Optional[str],
-    floors_min: Optional[int],
-    units_min: Optional[int],
+def _search_snapshot(
+    snapshot,
+    sort_keys: list[SortKey],
+    borough_filter: Optional[str],
     year_min: Optional[int],
     permits_min_12m: Optional[int],
     sort: Optional[str],
-    order: Optional[str],
+    order: str,
     limit: int,
     offset: int,
-    pool,
-    *,
-    allow_yearbuilt_sort: bool = False,
-) -> tuple[int, list[SearchRow]]:
-    limit = max(1, min(limit, 50))
-    offset = max(0, offset)
+    count_mode: str,
+    count_cap: int,
+) -> tuple[list[dict], Optional[int], Optional[str]]:
+    """Answer a filter-only search from the snapshot with the SQL path's rows, cursors and totals."""
+    matched, records = snapshot.search(borough_filter, year_min, permits_min_12m, sort, order, limit, offset)
+    rows = []
+    for record in records:
+        # Same _sort_key_N columns the SQL query selects, so next_cursor continues on Postgres.
+        for idx, (expr, _, _) in enumerate(sort_keys):
+            column = expr.split(".", 1)[1]
+            record[f"_sort_key_{idx}"] = record["bbl_raw"] if column == "bbl" else record[column]
+        rows.append(record)
+    if count_mode == "none":
+        return rows, None, None
+    if count_mode == "capped" and matched > count_cap:
+        return rows, count_cap, f"{count_cap}+"
+    # The mask already counted every match, so estimates come out exact.
+    return rows, matched, str(matched)
 
-    select_columns = [
-        "(ps.bbl)::text AS bbl",
-        "ps.address AS address",
-        "ps.borough_full AS borough_full",
-        "ps.zonedist1 AS zonedist1",
-        "ps.yearbuilt AS yearbuilt",
-        "ps.unitsres AS unitsres",
-        "ps.unitstotal AS unitstotal",
-        "ps.permit_count_12m AS permit_count_12m",
-        "ps.last_permit_date AS last_permit_date",
-    ]
 
+def _parse_floats(value: Any, count: int, name: str, shape: str) -> Optional[tuple[float, ...]]:
+    if value is None or value == "":
+        return None
+    parts = value.split(",") if isinstance(value, str) else list(value)
+    try:
+        numbers = tuple(float(part) for part in parts)
+    except (TypeError, ValueError):
+        numbers = ()
+    if len(numbers) != count or not all(math.isfinite(n) for n in numbers):
+        raise HTTPException(400, f"Invalid {name}; use {shape}")
+    return numbers
+
+
+def parse_bbox(value: Any) -> Optional[tuple[float, float, float, float]]:
+    """Parse "minx,miny,maxx,maxy" (lon/lat, EPSG:4326) or a 4-sequence; 400 when malformed."""
+    bbox = _parse_floats(value, 4, "bbox", "minx,miny,maxx,maxy in degrees")
+    if bbox is None:
+        return None
+    minx, miny, maxx, maxy = bbox
+    if not (-180 <= minx < maxx <= 180 and -90 <= miny < maxy <= 90):
+        raise HTTPException(400, "Invalid bbox; use minx,miny,maxx,maxy in degrees")
+    return bbox
+
+
+def parse_radius(value: Any) -> Optional[tuple[float, float, float]]:
+    """Parse "lat,lon,meters" or a 3-sequence; 400 when malformed or wider than MAX_RADIUS_METERS."""
+    radius = _parse_floats(value, 3, "radius", "lat,lon,meters")
+    if radius is None:
+        return None
+    lat, lon, meters = radius
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180 and 0 < meters <= MAX_RADIUS_METERS):
+        raise HTTPException(400, f"Invalid radius; use lat,lon,meters with meters up to {MAX_RADIUS_METERS:g}")
+    return radius
+
+
+class SearchFilters(NamedTuple):
+    normalized_q: Optional[str]
+    borough: Optional[str]
+    where_clauses: list[str]
+    where_args: list[object]
+    active_filters: list[str]
+    knn_placeholder: Optional[str]
+    # Point expression for radius searches; ORDER BY geom <-> origin is a GiST KNN scan.
+    origin: Optional[str] = None
+
+
+def _build_filters(
+    q: Optional[str],
+    borough: Optional[str],
+    floors_min: Optional[int],
+    units_min: Optional[int],
+    year_min: Optional[int],
+    permits_min_12m: Optional[int],
+    match_mode: str,
+    structured_address: Optional[NormalizedAddress] = None,
+    bbox: Optional[tuple[float, float, float, float]] = None,
+    radius: Optional[tuple[float, float, float]] = None,
+) -> SearchFilters:
+    """Translate the search filters into WHERE clauses over TABLE_SEARCH (alias ps)."""
     where_clauses: list[str] = [
         "1=1",
         "ps.address IS NOT NULL",
@@ -130,7 +626,31 @@ async def run_search(
         return f"${len(where_args)}"
 
     normalized_q = q.strip() if isinstance(q, str) else None
-    if normalized_q:
+    knn_placeholder = None
+    if normalized_q and structured_address is not None:
+        # B-tree friendly: exact house number plus a street prefix range. Unlike
+        # `LIKE 'prefix%'` the bounds need no escaping and stay sargable in generic plans.
+        where_clauses.append(f"ps.houseno = {add_param(structured_address.house_number)}")
+        where_clauses.append(f"ps.street ~>=~ {add_param(structured_address.street)}")
+        where_clauses.append(f"ps.street ~<~ {add_param(structured_address.street + _PREFIX_UPPER)}")
+        if match_mode == "trigram":
+            # Not filtered on; keeps the ORDER BY (and cursors) identical to the fuzzy path.
+            knn_placeholder = add_param(address_search_key(normalized_q))
+        active_filters.append("q:structured")
+    elif normalized_q and match_mode == "trigram":
+        kind, value = classify_query(normalized_q)
+        if kind == "bbl":
+            where_clauses.append(f"ps.bbl = {add_param(value)}::bigint")
+        elif kind == "bbl_prefix":
+            low, high = value
+            where_clauses.append(f"ps.bbl BETWEEN {add_param(low)}::bigint AND {add_param(high)}::bigint")
+        elif kind == "borough":
+            where_clauses.append(f"ps.borough = {add_param(value)}")
+        else:
+            knn_placeholder = add_param(value)
+            where_clauses.append(f"ps.{ADDRESS_KEY_COLUMN} % {knn_placeholder}")
+        active_filters.append(f"q:{kind}")
+    elif normalized_q:
         like_value = f"%{normalized_q}%"
         clause_parts = [
             "ps.address ILIKE " + add_param(like_value),
@@ -168,56 +688,161 @@ async def run_search(
         where_clauses.append(f"ps.permit_count_12m >= {add_param(permits_min_12m)}")
         active_filters.append("permits_min_12m")
 
-    # property_search_rich_mv exposes extended PLUTO attributes used here
-    base = f"FROM {TABLE_SEARCH} ps WHERE " + " AND ".join(where_clauses)
+    if bbox is not None:
+        envelope = ", ".join(add_param(value) for value in bbox)
+        where_clauses.append(f"ps.{GEOM_COLUMN} && ST_MakeEnvelope({envelope}, 4326)")
+        active_filters.append("bbox")
+
+    origin = None
+    if radius is not None:
+        lat, lon, meters = radius
+        origin = f"ST_SetSRID(ST_MakePoint({add_param(lon)}, {add_param(lat)}), 4326)"
+        # && against a degree box around the point uses the GiST index; ST_DWithin on
+        # geography then trims the box corners to the exact radius in meters.
+        dlat = meters / _METERS_PER_DEGREE
+        dlon = meters / (_METERS_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+        envelope = ", ".join(add_param(value) for value in (lon - dlon, lat - dlat, lon + dlon, lat + dlat))
+        where_clauses.append(f"ps.{GEOM_COLUMN} && ST_MakeEnvelope({envelope}, 4326)")
+        where_clauses.append(f"ST_DWithin(ps.{GEOM_COLUMN}::geography, {origin}::geography, {add_param(meters)})")
+        active_filters.append("radius")
+
+    return SearchFilters(
+        normalized_q, borough_filter, where_clauses, where_args, active_filters, knn_placeholder, origin
+    )
+
+
+async def run_search(
+    q: Optional[str],
+    borough: Optional[str],
+    floors_min: Optional[int],
+    units_min: Optional[int],
+    year_min: Optional[int],
+    permits_min_12m: Optional[int],
+    sort: Optional[str],
+    order: Optional[str],
+    limit: int,
+    offset: int,
+    pool,
+    **options: Any,
+) -> SearchResult:
+    """Search the property index; see `_run_search` for the keyword options.
+
+    Address-shaped queries ("120 Broadway") are first answered with equality/prefix
+    lookups on (borough, street, houseno) and only fall back to fuzzy matching when
+    that finds nothing.
+    """
+    params = dict(
+        q=q,
+        borough=borough,
+        floors_min=floors_min,
+        units_min=units_min,
+        year_min=year_min,
+        permits_min_12m=permits_min_12m,
+        sort=sort,
+        order=order,
+        limit=limit,
+        offset=offset,
+        pool=pool,
+        **options,
+    )
+    structured = await _structured_lookup(pool, q, borough)
+    if structured:
+        exact_borough, address = structured
+        exact_params = {**params, "borough": exact_borough}
+        exact = await _run_search(**exact_params, structured_address=address)
+        if exact.rows:
+            return exact
+        if offset > 0 or options.get("cursor"):
+            # Past page 1 an empty page is just the end of the results; stay on the
+            # structured path whenever page 1 of the same query found anything.
+            first = await _run_search(
+                **{**exact_params, "limit": 1, "offset": 0, "cursor": None, "count_mode": "none"},
+                structured_address=address,
+            )
+            if first.rows:
+                return exact
+        logger.info("PF-BE-SEARCH no structured match for %r; falling back to fuzzy search", q)
+    return await _run_search(**params)
+
 
-    sql_total = f"SELECT COUNT(*) {base}"
+class SearchOrder(NamedTuple):
+    sort_keys: list[SortKey]
+    requested_sort: Optional[str]
+    # Explicit column sort after relevance/distance handling (None for the curated order).
+    sort: Optional[str]
+    order: str
+    # where_args plus any parameters the ORDER BY needs.
+    rows_args: list[object]
 
+
+def _build_order(
+    filters: SearchFilters,
+    sort: Optional[str],
+    order: Optional[str],
+    match_mode: str,
+    allow_yearbuilt_sort: bool = False,
+) -> SearchOrder:
+    """Validate sort/order and build the ORDER BY keys (always ending in the curated tiebreakers)."""
+    normalized_q, knn_placeholder, origin = filters.normalized_q, filters.knn_placeholder, filters.origin
+    active_filters = filters.active_filters
     normalized_sort = (sort or "").strip().lower() or None
     normalized_order = (order or "").strip().lower() or None
 
     valid_sorts = {"last_permit_date", "permit_count_12m", "relevance"}
     if allow_yearbuilt_sort:
         valid_sorts.add("yearbuilt")
+    if origin:
+        valid_sorts.add("distance")
     if normalized_sort and normalized_sort not in valid_sorts:
         raise HTTPException(400, f"Invalid sort '{normalized_sort}'")
 
     if normalized_order not in {"asc", "desc"}:
         normalized_order = "desc"
+    requested_sort = normalized_sort
 
-    def nulls_clause(direction: str) -> str:
-        return "NULLS LAST" if direction == "desc" else "NULLS FIRST"
-
-    order_by_parts: list[str] = []
-    rows_args: list[object] = list(where_args)
-    curated_order: list[str] = [
-        "ps.permit_count_12m DESC NULLS LAST",
-        "ps.last_permit_date DESC NULLS LAST",
-        "ps.yearbuilt DESC NULLS LAST",
-        "ps.address ASC",
+    sort_keys: list[SortKey] = []
+    rows_args: list[object] = list(filters.where_args)
+    curated_order: list[SortKey] = [
+        ("ps.permit_count_12m", "desc", False),
+        ("ps.last_permit_date", "desc", False),
+        ("ps.yearbuilt", "desc", False),
+        ("ps.address", "asc", False),
+        # bbl is unique per row and keeps keyset pagination deterministic.
+        ("ps.bbl", "asc", False),
     ]
 
-    similarity_placeholder = None
+    def add_rows_param(value: object) -> str:
+        rows_args.append(value)
+        return f"${len(rows_args)}"
+
     use_similarity = bool(normalized_q and normalized_sort in (None, "relevance"))
+    if match_mode == "trigram":
+        # Only address-shaped queries have a distance to rank by.
+        use_similarity = use_similarity and knn_placeholder is not None
     if use_similarity:
-        similarity_placeholder = f"${len(rows_args) + 1}"
-        rows_args.append(normalized_q)
-
-    if use_similarity and similarity_placeholder:
-        order_by_parts.append(
-            f"similarity(ps.address, UPPER(unaccent({similarity_placeholder}))) DESC NULLS LAST",
-        )
+        if knn_placeholder:
+            # Trigram distance on the precomputed key; a GiST index serves this as a KNN scan.
+            sort_keys.append((f"ps.{ADDRESS_KEY_COLUMN} <-> {knn_placeholder}", "asc", False))
+        else:
+            similarity_placeholder = add_rows_param(normalized_q)
+            sort_keys.append(
+                (f"similarity(ps.address, UPPER(unaccent({similarity_placeholder})))", "desc", False),
+            )
         if normalized_sort == "relevance":
             active_filters.append("sort=relevance")
         normalized_sort = "last_permit_date"
 
-    if normalized_sort == "relevance" and not normalized_q:
+    if normalized_sort == "relevance":
+        normalized_sort = None
+
+    if origin and (normalized_sort == "distance" or (normalized_sort is None and not normalized_q)):
+        # Nearest first; planar degrees order closely enough at city scale and stay index-assisted.
+        sort_keys.append((f"ps.{GEOM_COLUMN} <-> {origin}", "asc", False))
         normalized_sort = None
 
     def append_sort(column: str, direction: str):
-        order_by_parts.append(
-            f"ps.{column} {'DESC' if direction == 'desc' else 'ASC'} {nulls_clause(direction)}",
-        )
+        # NULLS LAST for descending, NULLS FIRST for ascending.
+        sort_keys.append((f"ps.{column}", direction, direction != "desc"))
 
     if normalized_sort == "last_permit_date":
         append_sort("last_permit_date", normalized_order)
@@ -226,31 +851,119 @@ async def run_search(
     elif normalized_sort == "yearbuilt" and allow_yearbuilt_sort:
         append_sort("yearbuilt", normalized_order)
 
-    order_by_parts.extend(curated_order)
-    order_by = ", ".join(order_by_parts)
+    sort_keys.extend(curated_order)
+    return SearchOrder(sort_keys, requested_sort, normalized_sort, normalized_order, rows_args)
+
+
+def _order_by_sql(sort_keys: list[SortKey]) -> str:
+    return ", ".join(
+        f"{expr} {direction.upper()} {'NULLS FIRST' if nulls_first else 'NULLS LAST'}"
+        for expr, direction, nulls_first in sort_keys
+    )
+
+
+async def _run_search(
+    q: Optional[str],
+    borough: Optional[str],
+    floors_min: Optional[int],
+    units_min: Optional[int],
+    year_min: Optional[int],
+    permits_min_12m: Optional[int],
+    sort: Optional[str],
+    order: Optional[str],
+    limit: int,
+    offset: int,
+    pool,
+    *,
+    cursor: Optional[str] = None,
+    count_mode: str = "exact",
+    count_cap: Optional[int] = None,
+    match_mode: str = "contains",
+    allow_yearbuilt_sort: bool = False,
+    structured_address: Optional[NormalizedAddress] = None,
+    bbox: Any = None,
+    radius: Any = None,
+) -> SearchResult:
+    limit = max(1, min(limit, 50))
+    offset = max(0, offset)
+    count_mode = (count_mode or "exact").strip().lower()
+    if count_mode not in COUNT_MODES:
+        raise HTTPException(400, f"Invalid count '{count_mode}'; use exact, capped, estimate or none")
+    count_cap = max(1, count_cap if count_cap is not None else settings.SEARCH_COUNT_CAP)
+    match_mode = (match_mode or "contains").strip().lower()
+    if match_mode not in MATCH_MODES:
+        raise HTTPException(400, f"Invalid mode '{match_mode}'; use contains or trigram")
+
+    bbox = parse_bbox(bbox)
+    radius = parse_radius(radius)
+    filters = _build_filters(
+        q,
+        borough,
+        floors_min,
+        units_min,
+        year_min,
+        permits_min_12m,
+        match_mode,
+        structured_address,
+        bbox=bbox,
+        radius=radius,
+    )
+    normalized_q, borough_filter, where_clauses, where_args, active_filters, knn_placeholder, origin = filters
+
+    filter_shape = frozenset(active_filters)
+
+    # property_search_rich_mv exposes extended PLUTO attributes used here
+    base = f"FROM {TABLE_SEARCH} ps WHERE " + " AND ".join(where_clauses)
+
+    search_order = _build_order(filters, sort, order, match_mode, allow_yearbuilt_sort)
+    sort_keys, requested_sort, normalized_sort, normalized_order, rows_args = search_order
+
+    def add_rows_param(value: object) -> str:
+        rows_args.append(value)
+        return f"${len(rows_args)}"
+
+    order_by = _order_by_sql(sort_keys)
 
-    lim_ph = f"${len(rows_args) + 1}"
-    rows_args.append(limit)
-    off_ph = f"${len(rows_args) + 1}"
-    rows_args.append(offset)
+    rows_where = base
+    page_shape = "offset"
+    if cursor:
+        cursor_values = decode_cursor(cursor, sort_keys)
+        rows_where = f"{base} AND {_keyset_predicate(sort_keys, cursor_values, add_rows_param)}"
+        offset = 0
+        active_filters.append("cursor")
+        # NULL cursor values change the keyset predicate, so they are part of the shape.
+        page_shape = "cursor:" + "".join("n" if value is None else "v" for value in cursor_values)
+    rows_shape = ("rows", filter_shape, f"sort={requested_sort or 'default'}:{normalized_order}", page_shape)
+
+    sort_key_columns = [f"{expr} AS _sort_key_{idx}" for idx, (expr, _, _) in enumerate(sort_keys)]
+
+    # Fetch one extra row so we only hand out next_cursor when another page exists.
+    lim_ph = add_rows_param(limit + 1)
+    off_ph = add_rows_param(offset)
 
     sql_rows = f"""
       SELECT
-        {', '.join(select_columns)}
-      {base}
+        {', '.join(SEARCH_COLUMNS + sort_key_columns)}
+      {rows_where}
       ORDER BY {order_by}
       LIMIT {lim_ph} OFFSET {off_ph}
     """
 
     validated_params = {
-        "q": q if normalized_q else None,
+        "q": normalized_q,
         "borough": borough_filter,
         "year_min": year_min,
         "permits_min_12m": permits_min_12m,
-        "sort": sort,
+        "sort": requested_sort,
         "order": normalized_order,
         "limit": limit,
         "offset": offset,
+        "cursor": cursor,
+        "count": count_mode,
+        "mode": match_mode,
+        "structured": structured_address.full if structured_address else None,
+        "bbox": bbox,
+        "radius": radius,
     }
     logger.info(
         "PF-BE-SEARCH params: %s order: %s where: %s",
@@ -258,26 +971,426 @@ async def run_search(
         order_by,
         ", ".join(active_filters) or "none",
     )
-    logger.debug("PF-BE-SEARCH sql_total: %s params=%s", sql_total.strip(), list(where_args))
+    logger.debug("PF-BE-SEARCH count base (%s): %s params=%s", count_mode, base, list(where_args))
     logger.debug("PF-BE-SEARCH sql_rows: %s params=%s", sql_rows.strip(), list(rows_args))
 
-    try:
-        async with pool.acquire() as conn:
-            total = await conn.fetchval(sql_total, *where_args)
-            rows = await conn.fetch(sql_rows, *rows_args)
-    except (asyncpg.exceptions.UndefinedTableError, asyncpg.exceptions.UndefinedColumnError) as exc:
-        logger.exception("PF-BE-SEARCH relation/columns missing for table %s", TABLE_SEARCH)
-        raise HTTPException(
-            status_code=500,
-            detail="Search backing relation/columns not found. Create the 'property_search' view or set TABLE_SEARCH.",
-        ) from exc
+    cache_key = (
+        tuple(sorted(validated_params.items())),
+        count_cap,
+        allow_yearbuilt_sort,
+    )
+    snapshot = None
+    if _memory_engine_enabled() and not normalized_q and not cursor and not (bbox or radius):
+        snapshot = get_property_snapshot()
+
+    if snapshot is not None:
+        rows, total, total_label = _search_snapshot(
+            snapshot,
+            sort_keys,
+            borough_filter,
+            year_min,
+            permits_min_12m,
+            normalized_sort,
+            normalized_order,
+            limit,
+            offset,
+            count_mode,
+            count_cap,
+        )
+    else:
+        cached = SEARCH_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+        async def fetch_page(conn):
+            page = await SEARCH_STATEMENTS.fetch(conn, rows_shape, sql_rows, *rows_args)
+            if count_mode != "none" and offset == 0 and not cursor and len(page) <= limit:
+                # A short first page already is the full result set.
+                return page, len(page), str(len(page))
+            counted, label = await _count_total(conn, count_mode, base, where_args, count_cap, filter_shape)
+            return page, counted, label
+
+        try:
+            # Identical requests arriving while this one runs share its connection and result.
+            # On replicas, run_read balances the call and may hedge it onto a second replica.
+            rows, total, total_label = await SEARCH_FLIGHTS.run(cache_key, lambda: run_read(pool, fetch_page))
+        except (asyncpg.exceptions.UndefinedTableError, asyncpg.exceptions.UndefinedColumnError) as exc:
+            logger.exception("PF-BE-SEARCH relation/columns missing for table %s", TABLE_SEARCH)
+            raise HTTPException(
+                status_code=500,
+                detail="Search backing relation/columns not found. Create the 'property_search' view or set TABLE_SEARCH.",
+            ) from exc
+        except (asyncio.TimeoutError, asyncpg.exceptions.QueryCanceledError) as exc:
+            logger.warning("PF-BE-SEARCH query exceeded its budget: %s", validated_params)
+            raise HTTPException(status_code=504, detail="Search timed out; narrow the filters") from exc
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            sort_keys,
+            [last[f"_sort_key_{idx}"] for idx in range(len(sort_keys))],
+        )
 
     mapped_rows = [_map_search_row(r) for r in rows]
-    return total, mapped_rows
+    result = SearchResult(
+        total=total,
+        rows=mapped_rows,
+        next_cursor=next_cursor,
+        total_label=total_label,
+        count_mode=count_mode,
+    )
+    if snapshot is None:
+        SEARCH_CACHE.set(cache_key, result)
+    return result
+
+
+def _facets_sql(base: str) -> str:
+    band_cases = " ".join(
+        f"WHEN COALESCE(ps.permit_count_12m, 0) >= {floor} THEN {idx}"
+        for idx, (_, floor) in reversed(list(enumerate(PERMIT_BANDS)))
+    )
+    # One scan: GROUPING SETS yields per-facet rows plus the grand total ().
+    return f"""
+      WITH matched AS (
+        SELECT
+          ps.borough AS borough,
+          CASE WHEN ps.yearbuilt > 0 THEN (FLOOR(ps.yearbuilt / 10) * 10)::int END AS decade,
+          CASE {band_cases} ELSE 0 END AS permit_band
+        {base}
+      )
+      SELECT
+        borough,
+        decade,
+        permit_band,
+        GROUPING(borough, decade, permit_band) AS grouping_id,
+        COUNT(*) AS n
+      FROM matched
+      GROUP BY GROUPING SETS ((borough), (decade), (permit_band), ())
+    """
+
+
+def _facet_counts_from_rows(rows) -> dict[str, Any]:
+    counts: dict[str, Any] = {"total": 0, "borough": {}, "decade": {}, "permit_band": {}}
+    for row in rows:
+        # GROUPING() sets a bit for every column rolled up in that row's set.
+        grouping_id = row["grouping_id"]
+        if grouping_id == 0b011:
+            counts["borough"][row["borough"]] = row["n"]
+        elif grouping_id == 0b101:
+            counts["decade"][row["decade"]] = row["n"]
+        elif grouping_id == 0b110:
+            counts["permit_band"][row["permit_band"]] = row["n"]
+        elif grouping_id == 0b111:
+            counts["total"] = row["n"]
+    return counts
+
+
+def _facets_response(counts: Mapping[str, Any]) -> dict[str, Any]:
+    decades = sorted(counts["decade"].items(), key=lambda item: (item[0] is None, item[0] or 0))
+    return {
+        "total": counts["total"],
+        "borough": [
+            {"value": code, "count": counts["borough"].get(code, 0)} for code in BOROUGH_FACET_ORDER
+        ],
+        "decade_built": [
+            {"value": "unknown" if decade is None else f"{decade}s", "count": n} for decade, n in decades
+        ],
+        "permit_activity": [
+            {"value": label, "count": counts["permit_band"].get(idx, 0)}
+            for idx, (label, _) in enumerate(PERMIT_BANDS)
+        ],
+    }
+
+
+async def run_facets(
+    q: Optional[str],
+    borough: Optional[str],
+    year_min: Optional[int],
+    permits_min_12m: Optional[int],
+    pool,
+    match_mode: str = "contains",
+    bbox: Any = None,
+    radius: Any = None,
+) -> dict[str, Any]:
+    """Borough, decade-built and permit-activity counts for the rows run_search would match.
+
+    Address-shaped queries follow run_search: structured lookup first, fuzzy when it matches nothing.
+    """
+    structured = await _structured_lookup(pool, q, borough)
+    if structured:
+        exact_borough, address = structured
+        exact = await _run_facets(
+            q, exact_borough, year_min, permits_min_12m, pool, match_mode, address, bbox, radius
+        )
+        if exact["total"]:
+            return exact
+    return await _run_facets(q, borough, year_min, permits_min_12m, pool, match_mode, None, bbox, radius)
 
 
-@router.get("/api/search", response_model=SearchResponse)
+async def _run_facets(
+    q: Optional[str],
+    borough: Optional[str],
+    year_min: Optional[int],
+    permits_min_12m: Optional[int],
+    pool,
+    match_mode: str = "contains",
+    structured_address: Optional[NormalizedAddress] = None,
+    bbox: Any = None,
+    radius: Any = None,
+) -> dict[str, Any]:
+    match_mode = (match_mode or "contains").strip().lower()
+    if match_mode not in MATCH_MODES:
+        raise HTTPException(400, f"Invalid mode '{match_mode}'; use contains or trigram")
+    bbox = parse_bbox(bbox)
+    radius = parse_radius(radius)
+    filters = _build_filters(
+        q,
+        borough,
+        None,
+        None,
+        year_min,
+        permits_min_12m,
+        match_mode,
+        structured_address,
+        bbox=bbox,
+        radius=radius,
+    )
+    cache_key = (
+        filters.normalized_q,
+        filters.borough,
+        year_min,
+        permits_min_12m,
+        match_mode,
+        structured_address.full if structured_address else None,
+        bbox,
+        radius,
+    )
+    cached = FACETS_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    snapshot = None
+    if _memory_engine_enabled() and not filters.normalized_q and not (bbox or radius):
+        snapshot = get_property_snapshot()
+    if snapshot is not None:
+        counts = snapshot.facets(
+            filters.borough, year_min, permits_min_12m, [floor for _, floor in PERMIT_BANDS]
+        )
+    else:
+        base = f"FROM {TABLE_SEARCH} ps WHERE " + " AND ".join(filters.where_clauses)
+        try:
+            rows = await run_read(
+                pool,
+                lambda conn: SEARCH_STATEMENTS.fetch(
+                    conn,
+                    ("facets", frozenset(filters.active_filters)),
+                    _facets_sql(base),
+                    *filters.where_args,
+                ),
+            )
+        except (asyncpg.exceptions.UndefinedTableError, asyncpg.exceptions.UndefinedColumnError) as exc:
+            logger.exception("PF-BE-SEARCH relation/columns missing for table %s", TABLE_SEARCH)
+            raise HTTPException(
+                status_code=500,
+                detail="Search backing relation/columns not found. Create the 'property_search' view or set TABLE_SEARCH.",
+            ) from exc
+        except (asyncio.TimeoutError, asyncpg.exceptions.QueryCanceledError) as exc:
+            raise HTTPException(status_code=504, detail="Facet counts timed out; narrow the filters") from exc
+        counts = _facet_counts_from_rows(rows)
+
+    result = _facets_response(counts)
+    FACETS_CACHE.set(cache_key, result)
+    return result
+
+
+class ExportPlan(NamedTuple):
+    base: str
+    base_args: list[object]
+    sql: str
+    args: list[object]
+
+
+def plan_export(
+    q: Optional[str],
+    borough: Optional[str],
+    year_min: Optional[int],
+    permits_min_12m: Optional[int],
+    sort: Optional[str],
+    order: Optional[str],
+    match_mode: str = "contains",
+    bbox: Any = None,
+    radius: Any = None,
+) -> list[ExportPlan]:
+    """Validate export filters up front (errors must surface before streaming starts).
+
+    Returns the structured-address plan first when q looks like an address, then the
+    regular plan; stream_export uses the first one that matches anything.
+    """
+    match_mode = (match_mode or "contains").strip().lower()
+    if match_mode not in MATCH_MODES:
+        raise HTTPException(400, f"Invalid mode '{match_mode}'; use contains or trigram")
+    bbox = parse_bbox(bbox)
+    radius = parse_radius(radius)
+    candidates = []
+    # stream_export skips this plan when TABLE_SEARCH lacks houseno/street.
+    structured = _parse_structured_lookup(q, borough)
+    if structured:
+        candidates.append(structured)
+    candidates.append((borough, None))
+
+    plans = []
+    for plan_borough, address in candidates:
+        filters = _build_filters(
+            q, plan_borough, None, None, year_min, permits_min_12m, match_mode, address, bbox=bbox, radius=radius
+        )
+        search_order = _build_order(filters, sort, order, match_mode)
+        base = f"FROM {TABLE_SEARCH} ps WHERE " + " AND ".join(filters.where_clauses)
+        sql = f"SELECT {', '.join(SEARCH_COLUMNS)} {base} ORDER BY {_order_by_sql(search_order.sort_keys)}"
+        plans.append(ExportPlan(base, filters.where_args, sql, search_order.rows_args))
+    return plans
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _encode_export_rows(rows: list, fmt: str) -> str:
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerows([row[field] for field in EXPORT_FIELDS] for row in rows)
+        return buffer.getvalue()
+    return "".join(
+        json.dumps({field: row[field] for field in EXPORT_FIELDS}, default=_json_default) + "\n" for row in rows
+    )
+
+
+async def stream_export(
+    pool,
+    plans: list[ExportPlan],
+    fmt: str,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    batch_size: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> AsyncIterator[str]:
+    """Yield encoded chunks of `batch_size` rows from a server-side cursor.
+
+    Memory stays at one batch whatever the result size. The cursor is closed (and the
+    connection returned to the pool) as soon as the client goes away: either the server
+    cancels this generator or `is_disconnected` reports it between batches. `timeout`
+    (seconds) bounds each batch fetch; the stream runs after the endpoint returns, so it
+    cannot use the endpoint's statement_timeout block.
+    """
+    options = {"timeout": timeout} if timeout else {}
+    batch_size = max(1, batch_size or settings.EXPORT_BATCH_SIZE)
+    if fmt == "csv":
+        yield ",".join(EXPORT_FIELDS) + "\n"
+    exported = 0
+    async with pool.acquire() as conn:
+        # Server-side cursors only live inside a transaction.
+        async with conn.transaction(readonly=True):
+            plan = plans[-1]
+            # Only structured-address plans precede the regular one (see plan_export).
+            candidates = plans[:-1] if len(plans) > 1 and await _has_structured_columns(conn) else []
+            for candidate in candidates:
+                if await conn.fetchval(f"SELECT 1 {candidate.base} LIMIT 1", *candidate.base_args, **options):
+                    plan = candidate
+                    break
+            chunk = []
+            async for record in conn.cursor(plan.sql, *plan.args, prefetch=batch_size, **options):
+                chunk.append(record)
+                if len(chunk) < batch_size:
+                    continue
+                if is_disconnected is not None and await is_disconnected():
+                    logger.info("PF-BE-SEARCH export cancelled by client after %d rows", exported)
+                    return
+                exported += len(chunk)
+                yield _encode_export_rows(chunk, fmt)
+                chunk = []
+            if chunk:
+                exported += len(chunk)
+                yield _encode_export_rows(chunk, fmt)
+    logger.info("PF-BE-SEARCH export finished: %d rows (%s)", exported, fmt)
+
+
+async def run_search_batch(queries: list[BatchSearchQuery], pool, concurrency: Optional[int] = None) -> list[dict]:
+    """Run independent searches concurrently (at most `concurrency` at once); results keep input order.
+
+    A failing query becomes {"ok": false, "error": ...} in its slot instead of failing the batch.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency or settings.SEARCH_BATCH_CONCURRENCY))
+
+    async def run_one(query: BatchSearchQuery) -> dict:
+        async with semaphore:
+            try:
+                result = await run_search(
+                    q=query.q,
+                    borough=query.borough,
+                    floors_min=query.floors_min,
+                    units_min=query.units_min,
+                    year_min=query.year_min,
+                    permits_min_12m=query.permits_min_12m,
+                    sort=query.sort,
+                    order=query.order,
+                    limit=query.limit,
+                    offset=query.offset,
+                    pool=pool,
+                    cursor=query.cursor,
+                    count_mode=query.count,
+                    match_mode=query.mode,
+                    bbox=query.bbox,
+                    radius=query.radius,
+                )
+            except HTTPException as exc:
+                return {"ok": False, "error": {"status": exc.status_code, "detail": str(exc.detail)}}
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as exc:
+                logger.warning("PF-BE-SEARCH batch item failed: %s", exc)
+                return {"ok": False, "error": {"status": 500, "detail": "Search failed"}}
+        return {"ok": True, "result": _search_payload(result)}
+
+    return list(await asyncio.gather(*(run_one(query) for query in queries)))
+
+
+def _search_payload(result: SearchResult) -> dict[str, Any]:
+    return {
+        "total": result.total,
+        "total_label": result.total_label,
+        "count_mode": result.count_mode,
+        "rows": result.rows,
+        "next_cursor": result.next_cursor,
+    }
+
+
+@router.get("/api/search/suggest", response_model=SuggestResponse)
+async def suggest(
+    q: str = Query(..., min_length=1, description="Address or street prefix as typed"),
+    limit: int = Query(10, ge=1, le=25),
+):
+    """Address autocomplete served from the in-memory prefix index (never queries Postgres).
+
+    `ready` is false until the index has been loaded at startup.
+    """
+    index = get_suggest_index()
+    if index is None:
+        return {"ready": False, "suggestions": []}
+    return {"ready": True, "suggestions": index.suggest(q, limit)}
+
+
+async def _search_conditional(request: Request, response: Response) -> None:
+    # Planner estimates move with ANALYZE, not with the data version, so
+    # count=estimate bodies get no strong tag.
+    if request.query_params.get("count", "").strip().lower() == "estimate":
+        return
+    await conditional_get(request, response)
+
+
+@router.get("/api/search", response_model=SearchResponse, dependencies=[Depends(_search_conditional)])
 async def search(
+    request: Request,
     q: Optional[str] = Query(None, description="Free-text address or BBL"),
     borough: Optional[str] = Query(None, description="Two-letter code or borough name"),
     floors_min: Optional[int] = Query(None, ge=0),
@@ -286,18 +1399,32 @@ async def search(
     permits_min_12m: Optional[int] = Query(None, ge=0),
     sort: Optional[str] = Query(
         None,
-        description="Sort field: last_permit_date|year_built|permit_count_12m|relevance",
+        description="Sort field: last_permit_date|year_built|permit_count_12m|relevance|distance (with radius)",
     ),
     order: Optional[str] = Query(None, description="asc|desc"),
     limit: int = Query(20, ge=1, le=200),
     offset: int = Query(0, ge=0),
-    pool=Depends(get_pool),
+    cursor: Optional[str] = Query(
+        None,
+        description="Opaque next_cursor from a previous page; takes precedence over offset",
+    ),
+    count: str = Query("exact", description="Total count strategy: exact|capped|estimate|none"),
+    mode: str = Query(
+        "contains",
+        description="Text matching: contains (ILIKE) | trigram (address-key KNN, BBL/borough equality)",
+    ),
+    bbox: Optional[str] = Query(None, description="minx,miny,maxx,maxy in EPSG:4326 degrees"),
+    radius: Optional[str] = Query(
+        None,
+        description="lat,lon,meters; without q or sort, rows come back nearest first",
+    ),
+    pool=Depends(get_read_pool),
 ):
     """Search property inventory with optional filters.
 
     Response rows expose standardized property card fields sourced from property_search_rich_mv with permit summaries.
     """
-    total, mapped_rows = await run_search(
+    search_call = run_search(
         q=q,
         borough=borough,
         floors_min=floors_min,
@@ -309,5 +1436,108 @@ async def search(
         limit=limit,
         offset=offset,
         pool=pool,
+        cursor=cursor,
+        count_mode=count,
+        match_mode=mode,
+        bbox=bbox,
+        radius=radius,
+    )
+    # Autocomplete-style callers abandon requests constantly; stop their queries early.
+    with statement_timeout(settings.SEARCH_TIMEOUT_MS):
+        result = await cancel_on_disconnect(request, search_call)
+    return _search_payload(result)
+
+
+@router.post("/api/search/batch", response_model=BatchSearchResponse)
+async def search_batch(request: Request, body: BatchSearchRequest, pool=Depends(get_read_pool)):
+    """Run many /api/search queries in one request; each result slot reports its own success or error.
+
+    Every query gets the /api/search statement budget; a timed-out query is a 504 in its slot.
+    """
+    if len(body.queries) > settings.SEARCH_BATCH_MAX_ITEMS:
+        raise HTTPException(413, f"Batch too large; at most {settings.SEARCH_BATCH_MAX_ITEMS} queries")
+    with statement_timeout(settings.SEARCH_TIMEOUT_MS):
+        results = await cancel_on_disconnect(request, run_search_batch(body.queries, pool))
+    return {"results": results}
+
+
+@router.get("/api/search/facets", response_model=FacetsResponse)
+async def search_facets(
+    request: Request,
+    q: Optional[str] = Query(None, description="Free-text address or BBL"),
+    borough: Optional[str] = Query(None, description="Two-letter code or borough name"),
+    year_min: Optional[int] = Query(None, ge=0),
+    permits_min_12m: Optional[int] = Query(None, ge=0),
+    mode: str = Query("contains", description="Text matching: contains | trigram (as /api/search)"),
+    bbox: Optional[str] = Query(None, description="minx,miny,maxx,maxy in EPSG:4326 degrees"),
+    radius: Optional[str] = Query(None, description="lat,lon,meters"),
+    pool=Depends(get_read_pool),
+):
+    """Facet counts for the current /api/search filters, computed in one grouped query."""
+    with statement_timeout(settings.FACETS_TIMEOUT_MS):
+        return await cancel_on_disconnect(
+            request,
+            run_facets(q, borough, year_min, permits_min_12m, pool, match_mode=mode, bbox=bbox, radius=radius),
+        )
+
+
+@router.get("/api/search/export")
+async def search_export(
+    request: Request,
+    format: str = Query("ndjson", description="ndjson | csv"),
+    q: Optional[str] = Query(None, description="Free-text address or BBL"),
+    borough: Optional[str] = Query(None, description="Two-letter code or borough name"),
+    year_min: Optional[int] = Query(None, ge=0),
+    permits_min_12m: Optional[int] = Query(None, ge=0),
+    sort: Optional[str] = Query(None, description="Same sorts as /api/search"),
+    order: Optional[str] = Query(None, description="asc|desc"),
+    mode: str = Query("contains", description="Text matching: contains | trigram (as /api/search)"),
+    bbox: Optional[str] = Query(None, description="minx,miny,maxx,maxy in EPSG:4326 degrees"),
+    radius: Optional[str] = Query(None, description="lat,lon,meters"),
+    pool=Depends(get_read_pool),
+):
+    """Stream every row matching the /api/search filters (no limit, no count) as NDJSON or CSV."""
+    fmt = (format or "").strip().lower()
+    if fmt not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(400, f"Invalid format '{fmt}'; use ndjson or csv")
+    plans = plan_export(q, borough, year_min, permits_min_12m, sort, order, mode, bbox, radius)
+    return StreamingResponse(
+        stream_export(
+            pool,
+            plans,
+            fmt,
+            is_disconnected=request.is_disconnected,
+            timeout=settings.EXPORT_TIMEOUT_MS / 1000.0 if settings.EXPORT_TIMEOUT_MS else None,
+        ),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="search_export.{fmt}"'},
     )
-    return {"total": total, "rows": mapped_rows}
+
+
+@router.get("/api/search/clusters", response_model=ClustersResponse)
+async def search_clusters(
+    bbox: str = Query(..., description="Viewport minx,miny,maxx,maxy in EPSG:4326 degrees"),
+    zoom: int = Query(..., ge=0, le=22),
+):
+    """Grid clusters (count, centroid, max permit activity) for a map viewport, served from memory.
+
+    Zooms outside the precomputed range are clamped; `zoom` in the response is the level used.
+    `ready` is false until the index has been built at startup.
+    """
+    bounds = parse_bbox(bbox)
+    index = get_cluster_index()
+    if index is None:
+        return {"ready": False, "zoom": None, "clusters": []}
+    return {"ready": True, "zoom": index.clamp_zoom(zoom), "clusters": index.clusters(bounds, zoom)}
+
+
+@router.get("/api/search/cache")
+async def search_cache_stats():
+    """Hit/miss/eviction counters for the search result cache plus single-flight deduplication."""
+    return {**SEARCH_CACHE.stats(), "single_flight": SEARCH_FLIGHTS.stats()}
+
+
+@router.get("/api/search/statements")
+async def search_statement_stats(limit: int = Query(50, ge=1, le=500)):
+    """Per-shape execution statistics for run_search statements, slowest first."""
+    return {"shapes": SEARCH_STATEMENTS.stats(limit=limit)}
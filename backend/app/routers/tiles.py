@@ -0,0 +1,148 @@
+import asyncio
+import logging
+
+import asyncpg
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+
+from app.db.data_version import DATA_VERSION
+from app.db.pool import get_read_pool
+from app.db.refresh import on_refresh
+from app.db.replicas import run_read
+from app.db.statements import StatementRegistry
+from app.db.timeouts import statement_timeout
+from app.routers.search import GEOM_COLUMN, TABLE_SEARCH
+from app.utils.cache import TTLCache
+from app.utils.cancellation import cancel_on_disconnect
+from app.utils.conditional import conditional_get
+from settings.config import settings
+
+router = APIRouter(prefix="/tiles", tags=["tiles"])
+
+logger = logging.getLogger(__name__)
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+LAYER_NAME = "parcels"
+TILE_EXTENT = 4096
+TILE_BUFFER = 64
+MAX_ZOOM = 22
+# Web Mercator world width in meters.
+_WORLD_METERS = 40075016.68557849
+
+# Rendered tiles keyed on (data version, z, x, y) and cleared on every refresh, so
+# stale tiles are never served.
+TILE_CACHE = TTLCache(maxsize=settings.TILE_CACHE_SIZE, ttl=settings.TILE_CACHE_TTL)
+TILE_STATEMENTS = StatementRegistry()
+
+
+@on_refresh
+def _clear_tile_cache(payload: str) -> None:
+    TILE_CACHE.clear()
+    logger.info("PF-BE-TILES tile cache cleared after refresh of %s", payload or "backing view")
+
+
+def thinning_cell_meters(z: int) -> float:
+    """Grid cell (Web Mercator meters) that keeps one point per cell; 0 disables thinning."""
+    if z >= settings.TILE_FULL_DETAIL_ZOOM:
+        return 0.0
+    return _WORLD_METERS / (2 ** z) / TILE_EXTENT * settings.TILE_THIN_PIXELS
+
+
+def _tile_sql(thinned: bool) -> str:
+    points = f"""
+        SELECT
+          (ps.bbl)::text AS bbl,
+          ps.permit_count_12m AS permit_count_12m,
+          ps.yearbuilt AS yearbuilt,
+          ST_Transform(ps.{GEOM_COLUMN}, 3857) AS geom
+        FROM {TABLE_SEARCH} ps, bounds
+        WHERE ps.{GEOM_COLUMN} && bounds.buffered_4326
+    """
+    if thinned:
+        # Keep the most active lot per grid cell and report how many it stands for.
+        points = f"""
+        SELECT DISTINCT ON (cx, cy) bbl, permit_count_12m, yearbuilt, geom, point_count
+        FROM (
+          SELECT
+            p.*,
+            FLOOR(ST_X(p.geom) / $4) AS cx,
+            FLOOR(ST_Y(p.geom) / $4) AS cy,
+            COUNT(*) OVER (PARTITION BY FLOOR(ST_X(p.geom) / $4), FLOOR(ST_Y(p.geom) / $4)) AS point_count
+          FROM ({points}) p
+        ) cells
+        ORDER BY cx, cy, permit_count_12m DESC NULLS LAST, bbl
+        """
+    else:
+        points = f"SELECT p.*, 1 AS point_count FROM ({points}) p"
+    return f"""
+      WITH bounds AS (
+        SELECT
+          ST_TileEnvelope($1, $2, $3) AS env_3857,
+          -- Widened by TILE_BUFFER so points drawn into the tile's buffer are selected too.
+          ST_Transform(
+            ST_TileEnvelope($1, $2, $3, margin => {TILE_BUFFER}::float8 / {TILE_EXTENT}), 4326
+          ) AS buffered_4326
+      )
+      SELECT ST_AsMVT(tile, '{LAYER_NAME}', {TILE_EXTENT}, 'geom')
+      FROM (
+        SELECT
+          pts.bbl,
+          pts.permit_count_12m,
+          pts.yearbuilt,
+          pts.point_count,
+          ST_AsMVTGeom(pts.geom, bounds.env_3857, {TILE_EXTENT}, {TILE_BUFFER}, true) AS geom
+        FROM ({points}) pts, bounds
+      ) tile
+      WHERE tile.geom IS NOT NULL
+    """
+
+
+async def render_tile(pool, z: int, x: int, y: int) -> bytes:
+    if not 0 <= z <= MAX_ZOOM or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise HTTPException(400, f"Invalid tile {z}/{x}/{y}")
+    key = (await DATA_VERSION.current(), z, x, y)
+    cached = TILE_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    cell = thinning_cell_meters(z)
+    args = [z, x, y] + ([cell] if cell else [])
+    try:
+        tile = await run_read(
+            pool,
+            lambda conn: TILE_STATEMENTS.fetchval(
+                conn, ("tile", "thinned" if cell else "full"), _tile_sql(bool(cell)), *args
+            ),
+        )
+    except (
+        asyncpg.exceptions.UndefinedTableError,
+        asyncpg.exceptions.UndefinedColumnError,
+        asyncpg.exceptions.UndefinedFunctionError,
+    ) as exc:
+        logger.exception("PF-BE-TILES relation/columns/PostGIS functions missing for table %s", TABLE_SEARCH)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Tile source not available. {TABLE_SEARCH} needs {GEOM_COLUMN} and PostGIS 3.1 (ST_TileEnvelope).",
+        ) from exc
+    except (asyncio.TimeoutError, asyncpg.exceptions.QueryCanceledError) as exc:
+        raise HTTPException(status_code=504, detail=f"Tile {z}/{x}/{y} timed out") from exc
+    tile = bytes(tile or b"")
+    TILE_CACHE.set(key, tile)
+    return tile
+
+
+@router.get("/{z}/{x}/{y}.mvt", response_class=Response, dependencies=[Depends(conditional_get)])
+async def parcel_tile(request: Request, response: Response, z: int, x: int, y: int, pool=Depends(get_read_pool)):
+    """Mapbox Vector Tile of lots with permit_count_12m / yearbuilt; low zooms keep one lot per grid cell."""
+    # Panning abandons tiles quickly; cancel their queries instead of finishing them.
+    with statement_timeout(settings.TILE_TIMEOUT_MS):
+        tile = await cancel_on_disconnect(request, render_tile(pool, z, x, y))
+    # A returned Response does not inherit the injected one's headers (conditional_get's
+    # ETag), so copy them over; tiles keep their own max-age.
+    response.headers["Cache-Control"] = f"public, max-age={settings.TILE_MAX_AGE}"
+    return Response(content=tile, media_type=MVT_MEDIA_TYPE, headers=dict(response.headers))
+
+
+@router.get("/cache")
+async def tile_cache_stats():
+    """Hit/miss counters for the in-process tile cache plus the current data version."""
+    return {"data_version": await DATA_VERSION.current(), **TILE_CACHE.stats()}
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TILE_SIZE = 256
+# Web Mercator stops being defined at the poles; clamp like every slippy map does.
+_MAX_LATITUDE = 85.05112878
+
+# (count, sum of lon, sum of lat, max permit_count_12m) per grid cell.
+Cell = List[float]
+
+
+def project(lon: float, lat: float, zoom: int) -> Tuple[float, float]:
+    """Web Mercator world pixel coordinates of lon/lat at `zoom` (256px tiles)."""
+    lat = max(-_MAX_LATITUDE, min(_MAX_LATITUDE, lat))
+    scale = TILE_SIZE * (2 ** zoom)
+    x = (lon + 180.0) / 360.0 * scale
+    sin_lat = math.sin(math.radians(lat))
+    y = (0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)) * scale
+    return x, y
+
+
+class ClusterIndex:
+    """Grid clusters of lot coordinates for every zoom in [min_zoom, max_zoom].
+
+    Cells are `cell_px` screen pixels wide at their zoom. The finest zoom is
+    binned from the points; every coarser zoom merges 2x2 cells of the next finer
+    one, so the whole pyramid costs one pass over the points.
+    """
+
+    def __init__(
+        self,
+        records: Iterable[Tuple[float, float, Optional[int]]] = (),
+        min_zoom: int = 8,
+        max_zoom: int = 15,
+        cell_px: int = 64,
+    ) -> None:
+        self.min_zoom = min_zoom
+        self.max_zoom = max(min_zoom, max_zoom)
+        self.cell_px = cell_px
+        finest: Dict[Tuple[int, int], Cell] = {}
+        points = 0
+        for lon, lat, permits in records:
+            if lon is None or lat is None:
+                continue
+            x, y = project(lon, lat, self.max_zoom)
+            key = (int(x // cell_px), int(y // cell_px))
+            cell = finest.get(key)
+            if cell is None:
+                finest[key] = [1, lon, lat, permits or 0]
+            else:
+                cell[0] += 1
+                cell[1] += lon
+                cell[2] += lat
+                cell[3] = max(cell[3], permits or 0)
+            points += 1
+        self.points = points
+        self._levels: Dict[int, Dict[Tuple[int, int], Cell]] = {self.max_zoom: finest}
+        for zoom in range(self.max_zoom - 1, self.min_zoom - 1, -1):
+            coarser: Dict[Tuple[int, int], Cell] = {}
+            for (cx, cy), (count, sum_lon, sum_lat, max_permits) in self._levels[zoom + 1].items():
+                key = (cx // 2, cy // 2)
+                cell = coarser.get(key)
+                if cell is None:
+                    coarser[key] = [count, sum_lon, sum_lat, max_permits]
+                else:
+                    cell[0] += count
+                    cell[1] += sum_lon
+                    cell[2] += sum_lat
+                    cell[3] = max(cell[3], max_permits)
+            self._levels[zoom] = coarser
+
+    def clamp_zoom(self, zoom: int) -> int:
+        return max(self.min_zoom, min(self.max_zoom, zoom))
+
+    def clusters(self, bbox: Tuple[float, float, float, float], zoom: int) -> List[Dict[str, Any]]:
+        """Clusters whose grid cell intersects bbox (minx, miny, maxx, maxy in degrees) at `zoom`."""
+        zoom = self.clamp_zoom(zoom)
+        cells = self._levels[zoom]
+        minx, miny, maxx, maxy = bbox
+        left, top = project(minx, maxy, zoom)
+        right, bottom = project(maxx, miny, zoom)
+        x0, x1 = int(left // self.cell_px), int(right // self.cell_px)
+        y0, y1 = int(top // self.cell_px), int(bottom // self.cell_px)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) <= len(cells):
+            keys = ((cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1))
+            found = ((key, cells[key]) for key in keys if key in cells)
+        else:
+            # Viewport has more grid slots than populated cells; scan the cells instead.
+            found = ((key, cell) for key, cell in cells.items() if x0 <= key[0] <= x1 and y0 <= key[1] <= y1)
+        return [
+            {
+                "count": int(count),
+                "lon": sum_lon / count,
+                "lat": sum_lat / count,
+                "max_permit_count_12m": int(max_permits),
+            }
+            for _, (count, sum_lon, sum_lat, max_permits) in sorted(found)
+        ]
+
+
+_INDEX: Optional[ClusterIndex] = None
+_REBUILD_LOCK: Optional[asyncio.Lock] = None
+
+
+def get_cluster_index() -> Optional[ClusterIndex]:
+    return _INDEX
+
+
+async def rebuild_cluster_index(
+    pool,
+    table: str,
+    geom_column: str,
+    min_zoom: int = 8,
+    max_zoom: int = 15,
+    cell_px: int = 64,
+    batch_size: int = 20000,
+) -> ClusterIndex:
+    """Stream lot coordinates out of `table`, precompute every zoom and swap the index in atomically."""
+    global _REBUILD_LOCK
+    if _REBUILD_LOCK is None:
+        _REBUILD_LOCK = asyncio.Lock()
+    async with _REBUILD_LOCK:
+        return await _rebuild(pool, table, geom_column, min_zoom, max_zoom, cell_px, batch_size)
+
+
+async def _rebuild(pool, table, geom_column, min_zoom, max_zoom, cell_px, batch_size) -> ClusterIndex:
+    global _INDEX
+    sql = f"""
+      SELECT ST_X(ps.{geom_column}) AS lon, ST_Y(ps.{geom_column}) AS lat, ps.permit_count_12m AS permit_count_12m
+      FROM {table} ps
+      WHERE ps.{geom_column} IS NOT NULL
+    """
+    records: List[Tuple[float, float, Optional[int]]] = []
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            async for row in conn.cursor(sql, prefetch=batch_size):
+                records.append((row["lon"], row["lat"], row["permit_count_12m"]))
+    index = await asyncio.to_thread(ClusterIndex, records, min_zoom, max_zoom, cell_px)
+    _INDEX = index
+    logger.info(
+        "cluster index rebuilt from %s: %d points, zooms %d-%d", table, index.points, index.min_zoom, index.max_zoom
+    )
+    return index
+
+
+__all__ = ["ClusterIndex", "get_cluster_index", "project", "rebuild_cluster_index"]
@@ -0,0 +1,242 @@
+import logging
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+import asyncpg
+
+from app.db.timeouts import timeout_kwargs
+from app.ingestion.normalizers import normalize_pluto as normalize_pluto_row
+from app.utils.normalize import normalize_borough
+
+logger = logging.getLogger(__name__)
+
+BOROUGH_CODE_TO_ABBR = {
+    "1": ("MN", "Manhattan"),
+    "2": ("BX", "Bronx"),
+    "3": ("BK", "Brooklyn"),
+    "4": ("QN", "Queens"),
+    "5": ("SI", "Staten Island"),
+}
+
+# Most recent permits kept per document; the API's `limit` slices from these.
+DOCUMENT_PERMITS = 50
+
+PROPERTY_BASE_COLUMNS = """
+      p.bbl, p.address, p.zipcode, p.borough, p.houseno, p.street,
+      p.latitude, p.longitude, p.raw
+"""
+
+# Recent-permit sort key; idx_dob_permits_bbl_norm_recent indexes (bbl_norm, this DESC NULLS LAST).
+RECENT_PERMIT_DATE_SQL = "COALESCE(issuance_date, filing_date, filed_date, status_date, latest_status_date)"
+
+PROPERTY_RECENT_COLUMNS = (
+    f"job_number, status, {RECENT_PERMIT_DATE_SQL} AS issuance_date_norm, "
+    "filing_date, filed_date"
+)
+
+# Set-based reads for many lots ($1 = bigint[] of BBLs, $2 = recent permits per lot);
+# shared by POST /api/property/batch and the property_documents rebuild.
+PROPERTY_BATCH_BASE_SQL = f"""
+  SELECT DISTINCT ON (NULLIF(p.bbl,'')::bigint)
+    NULLIF(p.bbl,'')::bigint AS bbl_key, {PROPERTY_BASE_COLUMNS}
+  FROM public.pluto p
+  WHERE NULLIF(p.bbl,'')::bigint = ANY($1::bigint[])
+  ORDER BY NULLIF(p.bbl,'')::bigint
+"""
+
+PROPERTY_BATCH_AGG_SQL = """
+  SELECT bbl_norm AS bbl_key, permit_count_12m, last_permit_date
+  FROM public.mv_permit_agg
+  WHERE bbl_norm = ANY($1::bigint[])
+"""
+
+# Per-lot top-N through LATERAL keeps the single-lot index path for each BBL.
+PROPERTY_BATCH_RECENT_SQL = f"""
+  SELECT b.bbl_key, r.*
+  FROM unnest($1::bigint[]) AS b(bbl_key)
+  CROSS JOIN LATERAL (
+    SELECT {PROPERTY_RECENT_COLUMNS}
+    FROM public.dob_permits
+    WHERE bbl_norm = b.bbl_key
+    ORDER BY {RECENT_PERMIT_DATE_SQL} DESC NULLS LAST
+    LIMIT $2
+  ) r
+"""
+
+_DOCUMENT_SQL = "SELECT doc FROM public.property_documents WHERE bbl = $1"
+
+
+def _borough_labels_from_bbl(bbl_int: int) -> tuple[Optional[str], Optional[str]]:
+    digits = str(bbl_int)
+    if digits:
+        entry = BOROUGH_CODE_TO_ABBR.get(digits[0])
+        if entry:
+            return entry
+    return None, None
+
+
+def _borough_labels_from_code(code: Optional[str]) -> tuple[Optional[str], Optional[str]]:
+    if not code:
+        return None, None
+    entry = BOROUGH_CODE_TO_ABBR.get(str(code)[0])
+    if entry:
+        return entry
+    return None, None
+
+
+def _maybe_decimal_to_float(value: Any):
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _safe_float(value: Any) -> Optional[float]:
+    if value in (None, "", "N/A"):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_lower_dict(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {str(key).lower(): value for key, value in data.items()}
+
+
+def to_iso(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def property_payload(bbl_int: int, base_row, agg_row, recent_rows) -> Dict[str, Any]:
+    """The `/property/{bbl}` response from its pluto row, permit aggregate and recent permits."""
+    raw_pluto = base_row["raw"] or {}
+    raw_lower = _to_lower_dict(raw_pluto) if isinstance(raw_pluto, dict) else {}
+    normalized_pluto = normalize_pluto_row(raw_pluto) if isinstance(raw_pluto, dict) else {}
+
+    centroid = None
+    if base_row["latitude"] is not None and base_row["longitude"] is not None:
+        centroid = {
+            "latitude": float(base_row["latitude"]),
+            "longitude": float(base_row["longitude"]),
+        }
+
+    bbox = None
+    xmin = raw_lower.get("xmin")
+    ymin = raw_lower.get("ymin")
+    xmax = raw_lower.get("xmax")
+    ymax = raw_lower.get("ymax")
+    if all(value not in (None, "", "N/A") for value in (xmin, ymin, xmax, ymax)):
+        try:
+            bbox = [float(xmin), float(ymin), float(xmax), float(ymax)]
+        except (TypeError, ValueError):
+            bbox = None
+
+    pluto_data = {
+        "bbl": base_row["bbl"],
+        "address": base_row["address"],
+        "zipcode": base_row["zipcode"],
+        "borough": base_row["borough"],
+        "house_number": base_row["houseno"],
+        "street": base_row["street"],
+        "block": normalized_pluto.get("block"),
+        "lot": normalized_pluto.get("lot"),
+        "land_use": normalized_pluto.get("landuse"),
+        "lot_area": _maybe_decimal_to_float(normalized_pluto.get("lot_area")),
+        "building_area": _maybe_decimal_to_float(normalized_pluto.get("bldg_area")),
+        "units_residential": normalized_pluto.get("units_res"),
+        "units_rental": normalized_pluto.get("units_rent"),
+        "year_built": normalized_pluto.get("year_built"),
+        "num_floors": _safe_float(raw_lower.get("numfloors")),
+        "latitude": float(base_row["latitude"]) if base_row["latitude"] is not None else None,
+        "longitude": float(base_row["longitude"]) if base_row["longitude"] is not None else None,
+        "geometry": {
+            "centroid": centroid,
+            "bbox": bbox,
+        },
+    }
+
+    agg_data = {
+        "permit_count_12m": agg_row["permit_count_12m"] if agg_row else 0,
+        "last_permit_date": to_iso(agg_row["last_permit_date"]) if agg_row else None,
+    }
+
+    recent_permits = [
+        {
+            "job_number": row["job_number"],
+            "status": row["status"],
+            "issuance_date_norm": to_iso(row["issuance_date_norm"]),
+            "filing_date": to_iso(row["filing_date"]),
+            "filed_date": to_iso(row["filed_date"]),
+        }
+        for row in recent_rows
+    ]
+
+    borough_abbr, borough_full = _borough_labels_from_bbl(bbl_int)
+    if not borough_abbr:
+        borough_abbr, borough_full = _borough_labels_from_code(normalized_pluto.get("borough"))
+    if not borough_abbr and base_row["borough"]:
+        borough_code, borough_name = normalize_borough(base_row["borough"])
+        if borough_code:
+            borough_abbr, borough_full = _borough_labels_from_code(borough_code)
+        elif borough_name:
+            borough_full = borough_name.title()
+            borough_abbr = (borough_name[:2] or "").upper()
+
+    return {
+        "bbl": bbl_int,
+        "address": base_row["address"],
+        "borough": borough_abbr,
+        "borough_full": borough_full,
+        "pluto": pluto_data,
+        "agg": agg_data,
+        "recent_permits": recent_permits,
+    }
+
+
+def payloads_by_bbl(base_rows, agg_rows, recent_rows) -> Dict[int, Dict[str, Any]]:
+    """`property_payload` for every lot in the rows returned by the PROPERTY_BATCH_* queries."""
+    aggs = {row["bbl_key"]: row for row in agg_rows}
+    recents: Dict[int, List[Any]] = {}
+    for row in recent_rows:
+        recents.setdefault(row["bbl_key"], []).append(row)
+    return {
+        row["bbl_key"]: property_payload(row["bbl_key"], row, aggs.get(row["bbl_key"]), recents.get(row["bbl_key"], []))
+        for row in base_rows
+    }
+
+
+async def aget_document(conn, bbl_int: int, limit: int) -> Optional[Dict[str, Any]]:
+    """The prebuilt `/property/{bbl}` response, or None when the lot has no document yet.
+
+    A missing property_documents table (migration not applied) also yields None, so
+    callers fall back to building the response live.
+    """
+    try:
+        doc = await conn.fetchval(_DOCUMENT_SQL, bbl_int, **timeout_kwargs())
+    except asyncpg.UndefinedTableError:
+        logger.warning("property_documents table missing; building property responses live")
+        return None
+    if doc is None:
+        return None
+    doc["recent_permits"] = doc.get("recent_permits", [])[:limit]
+    return doc
+
+
+__all__ = [
+    "BOROUGH_CODE_TO_ABBR",
+    "DOCUMENT_PERMITS",
+    "PROPERTY_BASE_COLUMNS",
+    "PROPERTY_BATCH_AGG_SQL",
+    "PROPERTY_BATCH_BASE_SQL",
+    "PROPERTY_BATCH_RECENT_SQL",
+    "PROPERTY_RECENT_COLUMNS",
+    "RECENT_PERMIT_DATE_SQL",
+    "aget_document",
+    "payloads_by_bbl",
+    "property_payload",
+    "to_iso",
+]
@@ -1,7 +1,11 @@
 from typing import Any, Dict, List, Optional
 
 from app.db.connection import get_conn
-from app.utils.resolve import bbl_for_address
+from app.db.pool import get_read_pool
+from app.db.replicas import run_read
+from app.db.timeouts import timeout_kwargs
+from app.utils.normalize import bbl_key
+from app.utils.resolve import abbl_for_address, bbl_for_address
 
 
 def get_summary_by_bbl(bbl: str) -> Optional[Dict[str, Any]]:
@@ -92,13 +96,16 @@ def get_permits_by_bbl(bbl: str, limit: int = 20) -> List[Dict[str, Any]]:
                estimated_cost,
                raw
         FROM dob_permits
-        WHERE bbl = %s
+        WHERE bbl_norm = %s
         ORDER BY COALESCE(filing_date, latest_status_date) DESC NULLS LAST
         LIMIT %s;
         """
     )
+    key = bbl_key(bbl)
+    if key is None:
+        return []
     with get_conn() as conn, conn.cursor() as cur:
-        cur.execute(sql, (bbl, limit))
+        cur.execute(sql, (key, limit))
         rows = cur.fetchall() or []
         return [dict(r) for r in rows]
 
@@ -137,6 +144,9 @@ def get_zoning_by_bbl(bbl: str) -> Optional[Dict[str, Any]]:
 
 
 def get_permits(conn, bbl: str) -> List[Dict[str, Any]]:
+    key = bbl_key(bbl)
+    if key is None:
+        return []
     with conn.cursor() as cur:
         cur.execute(
             """
@@ -147,11 +157,11 @@ def get_permits(conn, bbl: str) -> List[Dict[str, Any]]:
                    estimated_cost,
                    raw
             FROM dob_permits
-            WHERE bbl = %s
+            WHERE bbl_norm = %s
             ORDER BY filing_date DESC NULLS LAST
             LIMIT 200
             """,
-            (bbl,),
+            (key,),
         )
         rows = cur.fetchall() or []
         return [dict(r) for r in rows]
@@ -159,3 +169,166 @@ def get_permits(conn, bbl: str) -> List[Dict[str, Any]]:
 
 def resolve_to_bbl(conn, params: Dict[str, Any]) -> List[Dict[str, Any]]:
     return bbl_for_address(conn, **params)
+
+
+# Async variants on the shared asyncpg pool (app.db.pool), used by the API routes.
+# The sync functions above stay for scripts and other blocking callers.
+
+
+async def _afetch(sql: str, *args: Any) -> List[Dict[str, Any]]:
+    options = timeout_kwargs()
+    rows = await run_read(await get_read_pool(), lambda conn: conn.fetch(sql, *args, **options))
+    return [dict(r) for r in rows]
+
+
+def _bigint_or_none(bbl: str) -> Optional[int]:
+    try:
+        return int(str(bbl).split(".", 1)[0])
+    except ValueError:
+        return None
+
+
+async def aget_summary_by_bbl(bbl: str) -> Optional[Dict[str, Any]]:
+    bbl_int = _bigint_or_none(bbl)
+    if bbl_int is None:
+        return None
+    rows = await _afetch(
+        """
+        SELECT
+            bbl,
+            address,
+            borough,
+            borough_full,
+            yearbuilt,
+            numfloors,
+            unitsres,
+            unitstotal,
+            zonedist1,
+            landuse,
+            bldgarea,
+            lotarea,
+            permit_count_12m AS permit_count_12mo,
+            last_permit_date  AS latest_permit_date
+        FROM property_search_rich_mv
+        WHERE bbl = $1::bigint
+        LIMIT 1;
+        """,
+        bbl_int,
+    )
+    return rows[0] if rows else None
+
+
+async def aresolve_candidates(q: str, limit: int = 5) -> List[Dict[str, Any]]:
+    return await _afetch(
+        """
+        SELECT bbl, address_std
+        FROM parcels
+        WHERE address_std ILIKE $1
+        ORDER BY similarity(address_std, $2) DESC
+        LIMIT $3;
+        """,
+        f"%{q}%",
+        q,
+        limit,
+    )
+
+
+async def _aget_acris_by_bbl(bbl: str, doc_type: str, limit: int) -> List[Dict[str, Any]]:
+    return await _afetch(
+        """
+        SELECT recorded_at, consideration, parties, doc_id, doc_url
+        FROM acris_events
+        WHERE bbl = $1 AND doc_type = $2
+        ORDER BY recorded_at DESC
+        LIMIT $3;
+        """,
+        str(bbl),
+        doc_type,
+        limit,
+    )
+
+
+async def aget_deeds_by_bbl(bbl: str, limit: int) -> List[Dict[str, Any]]:
+    return await _aget_acris_by_bbl(bbl, "deed", limit)
+
+
+async def aget_mortgages_by_bbl(bbl: str, limit: int) -> List[Dict[str, Any]]:
+    return await _aget_acris_by_bbl(bbl, "mortgage", limit)
+
+
+async def aget_permits_by_bbl(bbl: str, limit: int = 20) -> List[Dict[str, Any]]:
+    key = bbl_key(bbl)
+    if key is None:
+        return []
+    return await _afetch(
+        """
+        SELECT job_number,
+               status,
+               job_type,
+               work_type,
+               filing_date,
+               latest_status_date,
+               estimated_cost,
+               raw
+        FROM dob_permits
+        WHERE bbl_norm = $1
+        ORDER BY COALESCE(filing_date, latest_status_date) DESC NULLS LAST
+        LIMIT $2;
+        """,
+        key,
+        limit,
+    )
+
+
+async def aget_violations_by_bbl(bbl: str, since: str | None = None) -> List[Dict[str, Any]]:
+    # issued_at stored in filed_at; alias on select
+    sql = """
+        SELECT filed_at AS issued_at, details
+        FROM permits_violations
+        WHERE bbl=$1 AND kind='violation'
+    """
+    args: List[Any] = [str(bbl)]
+    if since:
+        # Text in, cast server-side: same accepted formats as the sync variant.
+        sql += " AND filed_at >= $2::text::date"
+        args.append(since)
+    sql += " ORDER BY filed_at DESC"
+    return await _afetch(sql, *args)
+
+
+async def aget_zoning_by_bbl(bbl: str) -> Optional[Dict[str, Any]]:
+    rows = await _afetch(
+        """
+        SELECT base_codes, overlays, sp_districts, far_notes, last_updated
+        FROM zoning_layers WHERE bbl=$1 LIMIT 1
+        """,
+        str(bbl),
+    )
+    return rows[0] if rows else None
+
+
+async def aget_permits(conn, bbl: str) -> List[Dict[str, Any]]:
+    key = bbl_key(bbl)
+    if key is None:
+        return []
+    rows = await conn.fetch(
+        """
+        SELECT bbl,
+               job_number,
+               status,
+               filing_date AS filed_date,
+               estimated_cost,
+               raw
+        FROM dob_permits
+        WHERE bbl_norm = $1
+        ORDER BY filing_date DESC NULLS LAST
+        LIMIT 200
+        """,
+        key,
+        **timeout_kwargs(),
+    )
+    return [dict(r) for r in rows]
+
+
+async def aresolve_to_bbl(conn, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return await abbl_for_address(conn, **params)
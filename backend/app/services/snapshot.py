@@ -0,0 +1,234 @@
+import asyncio
+import logging
+import re
+from datetime import date
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # only needed for SEARCH_ENGINE=memory
+    np = None
+
+logger = logging.getLogger(__name__)
+
+_NUMERIC_COLUMNS = ("yearbuilt", "unitsres", "unitstotal", "permit_count_12m")
+_TEXT_COLUMNS = ("bbl", "address", "borough", "borough_full", "zonedist1")
+_LEADING_DIGIT = re.compile(r"^[0-9]")
+
+# Sorts the snapshot pre-ranks; None is the curated default order.
+SNAPSHOT_SORTS = (None, "last_permit_date", "permit_count_12m", "yearbuilt")
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+class PropertySnapshot:
+    """Columnar, read-only copy of the search relation's filter/sort columns.
+
+    Filters are evaluated as vectorized boolean masks. Every supported ORDER BY is
+    turned into a per-row rank at load time (np.lexsort), so a page is an
+    argpartition over the ranks of the matching rows.
+    The ORDER BY mirrors run_search's sort keys: optional explicit sort, then
+    permit_count_12m, last_permit_date, yearbuilt DESC NULLS LAST, address, bbl.
+    Address order is the database's collation, which Python cannot reproduce, so
+    records loaded from Postgres carry it as `address_rank` (see _reload).
+    """
+
+    def __init__(self, records: List[Mapping[str, Any]]) -> None:
+        if np is None:
+            raise ImportError("numpy not installed. Run: pip install numpy (required for SEARCH_ENGINE=memory)")
+        self.size = len(records)
+        self.text: Dict[str, Any] = {
+            column: np.array([r.get(column) for r in records], dtype=object) for column in _TEXT_COLUMNS
+        }
+        self.bbl_raw = np.array([r.get("bbl_raw") for r in records], dtype=object)
+        # NaN stands in for NULL: comparisons against it are False, like SQL.
+        self.numeric: Dict[str, Any] = {
+            column: np.array(
+                [np.nan if r.get(column) is None else float(r[column]) for r in records],
+                dtype=np.float64,
+            )
+            for column in _NUMERIC_COLUMNS
+        }
+        self.numeric["last_permit_date"] = np.array(
+            [np.nan if r.get("last_permit_date") is None else float(r["last_permit_date"].toordinal()) for r in records],
+            dtype=np.float64,
+        )
+        addresses = self.text["address"]
+        self.base_mask = np.array(
+            [bool(a) and bool(_LEADING_DIGIT.match(a)) for a in addresses],
+            dtype=bool,
+        )
+        if records and all(r.get("address_rank") is not None for r in records):
+            self._address_rank = np.array([r["address_rank"] for r in records], dtype=np.int64)
+        else:
+            # Not loaded from Postgres: codepoint order, which only matches a "C" collation.
+            self._address_rank = _dense_rank(list(addresses))
+        # bbl ranks on the column's own (numeric) values, as Postgres does.
+        self._bbl_rank = _dense_rank(list(self.bbl_raw))
+        self.ranks: Dict[Tuple[Optional[str], str], Any] = {}
+        for sort in SNAPSHOT_SORTS:
+            for order in ("desc", "asc") if sort else ("desc",):
+                self.ranks[(sort, order)] = self._rank(sort, order)
+
+    def _sort_array(self, column: str, direction: str, nulls_first: bool):
+        values = self.numeric[column]
+        keyed = -values if direction == "desc" else values.copy()
+        keyed[np.isnan(values)] = -np.inf if nulls_first else np.inf
+        return keyed
+
+    def _rank(self, sort: Optional[str], order: str):
+        keys = []
+        if sort:
+            keys.append(self._sort_array(sort, order, order != "desc"))
+        for column in ("permit_count_12m", "last_permit_date", "yearbuilt"):
+            keys.append(self._sort_array(column, "desc", False))
+        keys.append(self._address_rank)
+        keys.append(self._bbl_rank)
+        # np.lexsort treats the last key as primary.
+        permutation = np.lexsort(tuple(reversed(keys)))
+        rank = np.empty(self.size, dtype=np.int64)
+        rank[permutation] = np.arange(self.size, dtype=np.int64)
+        return rank
+
+    def mask(self, borough: Optional[str], year_min: Optional[int], permits_min_12m: Optional[int]):
+        mask = self.base_mask.copy()
+        if borough:
+            mask &= self.text["borough"] == borough
+        if year_min is not None:
+            mask &= self.numeric["yearbuilt"] >= year_min
+        if permits_min_12m is not None:
+            mask &= self.numeric["permit_count_12m"] >= permits_min_12m
+        return mask
+
+    def facets(
+        self,
+        borough: Optional[str],
+        year_min: Optional[int],
+        permits_min_12m: Optional[int],
+        permit_band_floors: List[int],
+    ) -> Dict[str, Any]:
+        """Total plus counts per borough, decade built and permit band for the rows matching the filters.
+
+        Decades are None when yearbuilt is unknown (NULL or 0); permit bands are
+        indexes into `permit_band_floors` (ascending lower bounds, NULL counts as 0).
+        """
+        mask = self.mask(borough, year_min, permits_min_12m)
+        boroughs, borough_counts = np.unique(self.text["borough"][mask].astype(str), return_counts=True)
+
+        years = self.numeric["yearbuilt"][mask]
+        known = years > 0
+        decades, decade_counts = np.unique((np.floor(years[known] / 10) * 10).astype(np.int64), return_counts=True)
+        by_decade: Dict[Any, int] = {int(d): int(c) for d, c in zip(decades, decade_counts)}
+        unknown = int(years.size - known.sum())
+        if unknown:
+            by_decade[None] = unknown
+
+        permits = np.nan_to_num(self.numeric["permit_count_12m"][mask], nan=0.0)
+        bands = np.digitize(permits, np.asarray(permit_band_floors[1:], dtype=np.float64))
+        band_counts = np.bincount(bands, minlength=len(permit_band_floors))
+        return {
+            "total": int(mask.sum()),
+            "borough": {str(b): int(c) for b, c in zip(boroughs, borough_counts)},
+            "decade": by_decade,
+            "permit_band": {i: int(c) for i, c in enumerate(band_counts)},
+        }
+
+    def search(
+        self,
+        borough: Optional[str],
+        year_min: Optional[int],
+        permits_min_12m: Optional[int],
+        sort: Optional[str],
+        order: str,
+        limit: int,
+        offset: int,
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """Return (matching row count, up to limit+1 rows starting at offset)."""
+        matches = np.flatnonzero(self.mask(borough, year_min, permits_min_12m))
+        total = int(matches.size)
+
+        rank = self.ranks[(sort, order if sort else "desc")][matches]
+        wanted = min(offset + limit + 1, total)
+        if wanted == 0:
+            return total, []
+        if wanted < total:
+            top = np.argpartition(rank, wanted - 1)[:wanted]
+        else:
+            top = np.arange(total)
+        top = top[np.argsort(rank[top], kind="stable")]
+        return total, [self.row(int(i)) for i in matches[top][offset:]]
+
+    def row(self, i: int) -> Dict[str, Any]:
+        data: Dict[str, Any] = {column: self.text[column][i] for column in _TEXT_COLUMNS}
+        for column in _NUMERIC_COLUMNS:
+            value = self.numeric[column][i]
+            data[column] = None if np.isnan(value) else int(value)
+        ordinal = self.numeric["last_permit_date"][i]
+        data["last_permit_date"] = None if np.isnan(ordinal) else date.fromordinal(int(ordinal))
+        data["bbl_raw"] = self.bbl_raw[i]
+        return data
+
+
+def _dense_rank(values: List[Any]):
+    # NULLs rank after every value (ASC NULLS LAST).
+    distinct = sorted({value for value in values if value is not None})
+    positions = {value: idx for idx, value in enumerate(distinct)}
+    return np.array([positions.get(value, len(distinct)) for value in values], dtype=np.int64)
+
+
+_SNAPSHOT: Optional[PropertySnapshot] = None
+_RELOAD_LOCK: Optional[asyncio.Lock] = None
+
+
+def get_property_snapshot() -> Optional[PropertySnapshot]:
+    return _SNAPSHOT
+
+
+async def reload_property_snapshot(pool, table: str, batch_size: int = 20000) -> PropertySnapshot:
+    """Load `table` into a new snapshot and swap it in atomically; readers never see a partial one."""
+    global _RELOAD_LOCK
+    if _RELOAD_LOCK is None:
+        _RELOAD_LOCK = asyncio.Lock()
+    async with _RELOAD_LOCK:
+        return await _reload(pool, table, batch_size)
+
+
+async def _reload(pool, table: str, batch_size: int) -> PropertySnapshot:
+    global _SNAPSHOT
+    sql = f"""
+      SELECT
+        ps.bbl AS bbl_raw,
+        (ps.bbl)::text AS bbl,
+        ps.address AS address,
+        ps.borough AS borough,
+        ps.borough_full AS borough_full,
+        ps.zonedist1 AS zonedist1,
+        ps.yearbuilt AS yearbuilt,
+        ps.unitsres AS unitsres,
+        ps.unitstotal AS unitstotal,
+        ps.permit_count_12m AS permit_count_12m,
+        ps.last_permit_date AS last_permit_date,
+        -- Postgres ranks addresses so ties break in its collation, as run_search's ORDER BY does.
+        dense_rank() OVER (ORDER BY ps.address) AS address_rank
+      FROM {table} ps
+    """
+    records: List[Mapping[str, Any]] = []
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            async for row in conn.cursor(sql, prefetch=batch_size):
+                records.append(dict(row))
+    snapshot = await asyncio.to_thread(PropertySnapshot, records)
+    _SNAPSHOT = snapshot
+    logger.info("property snapshot reloaded from %s: %d rows", table, snapshot.size)
+    return snapshot
+
+
+__all__ = [
+    "PropertySnapshot",
+    "SNAPSHOT_SORTS",
+    "get_property_snapshot",
+    "numpy_available",
+    "reload_property_snapshot",
+]
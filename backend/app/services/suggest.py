@@ -0,0 +1,167 @@
+import asyncio
+import heapq
+import logging
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.utils.normalize import address_search_key
+
+logger = logging.getLogger(__name__)
+
+_LEADING_HOUSE_NUMBER = re.compile(r"^[0-9]+[A-Z]?(?: [0-9]+)? ")
+
+# Prefix ranges up to this many entries are ranked by scanning them per request;
+# broader prefixes ("1", "BR") are ranked when the index is built.
+SCAN_LIMIT = 2048
+MAX_LIMIT = 25
+# Over-fetch so duplicates (address + street entry for one lot) still leave K rows.
+_WANTED = MAX_LIMIT * 2
+
+
+class AddressSuggestIndex:
+    """Sorted-array prefix index over property addresses, ranked by permit activity.
+
+    Every property is indexed under its full address key ("120 BROADWAY") and its
+    street key without the house number ("BROADWAY"), so typing either finds it.
+    Lookups are a bisect over the sorted keys plus a top-K over the matching range;
+    the top-K of every prefix broader than SCAN_LIMIT is computed at build time, so
+    no request scans more than SCAN_LIMIT entries.
+    """
+
+    def __init__(self, records: Iterable[Tuple[str, str, Optional[int]]] = ()) -> None:
+        bbls: List[str] = []
+        addresses: List[str] = []
+        scores = array("l")
+        entries: List[Tuple[str, int]] = []
+        for bbl, address, permit_count in records:
+            key = address_search_key(address)
+            if not key or not bbl:
+                continue
+            row = len(bbls)
+            bbls.append(str(bbl))
+            addresses.append(address)
+            scores.append(int(permit_count or 0))
+            entries.append((key, row))
+            street_key = _LEADING_HOUSE_NUMBER.sub("", key, count=1)
+            if street_key and street_key != key:
+                entries.append((street_key, row))
+        entries.sort()
+        self._keys: List[str] = [key for key, _ in entries]
+        self._rows = array("l", (row for _, row in entries))
+        self._bbls = bbls
+        self._addresses = addresses
+        self._scores = scores
+        # prefix -> precomputed top rows, for every prefix matching more than SCAN_LIMIT entries.
+        self._ranked: Dict[str, array] = {}
+        if len(self._keys) > SCAN_LIMIT:
+            self._rank_prefix("", 0, len(self._keys))
+
+    def __len__(self) -> int:
+        return len(self._bbls)
+
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        lo = bisect_left(self._keys, prefix)
+        # U+FFFF sorts after every character that can appear in a key.
+        hi = bisect_left(self._keys, prefix + "\uffff", lo)
+        return lo, hi
+
+    def _scan(self, lo: int, hi: int) -> List[int]:
+        scores = self._scores
+        addresses = self._addresses
+        return heapq.nsmallest(
+            _WANTED,
+            {self._rows[i] for i in range(lo, hi)},
+            key=lambda row: (-scores[row], addresses[row]),
+        )
+
+    def _rank_prefix(self, prefix: str, lo: int, hi: int) -> List[int]:
+        """Top rows for keys[lo:hi] (all keys starting with `prefix`), memoizing broad prefixes.
+
+        Broad ranges are split by their next character and the children's top-K lists
+        merged, so building touches each key about once instead of once per prefix.
+        """
+        if hi - lo <= SCAN_LIMIT:
+            return self._scan(lo, hi)
+        keys = self._keys
+        depth = len(prefix)
+        # Keys equal to the prefix itself sort first.
+        exact_end = bisect_right(keys, prefix, lo, hi)
+        candidates = set(self._scan(lo, exact_end)) if exact_end > lo else set()
+        i = exact_end
+        while i < hi:
+            child = prefix + keys[i][depth]
+            j = bisect_left(keys, child + "\uffff", i, hi)
+            candidates.update(self._rank_prefix(child, i, j))
+            i = j
+        scores = self._scores
+        addresses = self._addresses
+        top = heapq.nsmallest(_WANTED, candidates, key=lambda row: (-scores[row], addresses[row]))
+        self._ranked[prefix] = array("l", top)
+        return top
+
+    def _top_rows(self, prefix: str, lo: int, hi: int) -> List[int]:
+        if hi - lo > SCAN_LIMIT:
+            return list(self._ranked[prefix])
+        return self._scan(lo, hi)
+
+    def suggest(self, text: str, limit: int = 10) -> List[Dict[str, Any]]:
+        prefix = address_search_key(text)
+        if not prefix or not self._keys:
+            return []
+        lo, hi = self._range(prefix)
+        if lo == hi:
+            return []
+        limit = max(1, min(limit, MAX_LIMIT))
+        return [
+            {
+                "bbl": self._bbls[row],
+                "address": self._addresses[row],
+                "permit_count_12m": self._scores[row],
+            }
+            for row in self._top_rows(prefix, lo, hi)[:limit]
+        ]
+
+
+_INDEX: Optional[AddressSuggestIndex] = None
+_REBUILD_LOCK: Optional[asyncio.Lock] = None
+
+
+def get_suggest_index() -> Optional[AddressSuggestIndex]:
+    return _INDEX
+
+
+async def rebuild_suggest_index(pool, table: str, batch_size: int = 20000) -> AddressSuggestIndex:
+    """Stream addresses out of `table`, build a fresh index and swap it in atomically.
+
+    Concurrent callers are serialized so overlapping refresh notifications do not
+    build several indexes at once.
+    """
+    global _REBUILD_LOCK
+    if _REBUILD_LOCK is None:
+        _REBUILD_LOCK = asyncio.Lock()
+    async with _REBUILD_LOCK:
+        return await _rebuild(pool, table, batch_size)
+
+
+async def _rebuild(pool, table: str, batch_size: int) -> AddressSuggestIndex:
+    global _INDEX
+    sql = f"""
+      SELECT (ps.bbl)::text AS bbl, ps.address AS address, ps.permit_count_12m AS permit_count_12m
+      FROM {table} ps
+      WHERE ps.address IS NOT NULL AND ps.address <> ''
+    """
+    records: List[Tuple[str, str, Optional[int]]] = []
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            async for row in conn.cursor(sql, prefetch=batch_size):
+                records.append((row["bbl"], row["address"], row["permit_count_12m"]))
+    # Sorting ~1.7M keys takes seconds; keep the event loop responsive meanwhile.
+    index = await asyncio.to_thread(AddressSuggestIndex, records)
+    _INDEX = index
+    logger.info("suggest index rebuilt from %s: %d properties", table, len(index))
+    return index
+
+
+__all__ = ["AddressSuggestIndex", "get_suggest_index", "rebuild_suggest_index"]
@@ -0,0 +1,34 @@
+import asyncio
+import logging
+from typing import Any, Awaitable
+
+from fastapi import HTTPException, Request
+
+logger = logging.getLogger(__name__)
+
+# nginx's "client closed request"; nobody reads it, but it keeps logs honest.
+CLIENT_CLOSED_REQUEST = 499
+
+
+async def cancel_on_disconnect(request: Request, awaitable: Awaitable[Any], poll_interval: float = 0.1) -> Any:
+    """Await `awaitable`, cancelling it as soon as the client disconnects.
+
+    Cancelling an asyncpg query sends a cancel request to the server and returns the
+    connection to the pool, so abandoned requests stop holding pool slots.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                logger.info("client disconnected; cancelled %s %s", request.method, request.url.path)
+                raise HTTPException(CLIENT_CLOSED_REQUEST, "Client closed request")
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+__all__ = ["CLIENT_CLOSED_REQUEST", "cancel_on_disconnect"]
@@ -0,0 +1,68 @@
+import hashlib
+from typing import Dict, Optional
+
+from fastapi import HTTPException, Request, Response
+
+from app.db.data_version import DATA_VERSION
+from settings.config import settings
+
+
+def etag_for(version: str, request: Request) -> str:
+    """Strong ETag for `request` at data `version`.
+
+    The same URL at the same data version and app version returns the same bytes,
+    so the tag covers the path, the query string (order-insensitive) and both versions.
+    """
+    query = "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+    app_version = getattr(request.app, "version", "")
+    digest = hashlib.sha1(f"{app_version}|{version}|{request.url.path}?{query}".encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def if_none_match(header: Optional[str], etag: str) -> bool:
+    """True when an If-None-Match header matches `etag` (weak comparison, as RFC 9110 asks)."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+async def validators(request: Request) -> Optional[Dict[str, str]]:
+    """ETag + Cache-Control headers for `request` at the current data version, or None
+    when validators are off, the method is not GET/HEAD, or there is no data version.
+    """
+    if not settings.HTTP_ETAGS_ENABLED or request.method not in ("GET", "HEAD"):
+        return None
+    version = await DATA_VERSION.current()
+    if version is None:
+        return None
+    return {
+        "ETag": etag_for(version, request),
+        "Cache-Control": f"public, max-age={settings.HTTP_CACHE_MAX_AGE}",
+    }
+
+
+async def conditional_get(request: Request, response: Response) -> None:
+    """Route dependency: ETag + Cache-Control from the data version, 304 on a matching If-None-Match.
+
+    It runs before the endpoint, so a revalidation that matches never reaches the
+    endpoint's queries. Without a data version (table unreadable) responses carry no
+    validators and are served normally. Endpoints whose body can vary within one data
+    version call `validators` themselves once they know it cannot.
+    """
+    headers = await validators(request)
+    if headers is None:
+        return
+    if if_none_match(request.headers.get("if-none-match"), headers["ETag"]):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+
+__all__ = ["conditional_get", "etag_for", "if_none_match", "validators"]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+import unicodedata
 from typing import Any, NamedTuple, Optional, Tuple
 
 BOROUGH_CODE_TO_NAME: dict[str, str] = {
@@ -113,6 +114,20 @@ def normalize_bbl(borough: Any, block: Any, lot: Any) -> Optional[str]:
     return f"{borough_code}{block_int:05d}{lot_int:04d}"
 
 
+def bbl_key(value: Any) -> Optional[int]:
+    """
+    BIGINT form of a BBL, as stored in the bbl_norm columns.
+    Accepts "1015457502", "1-01545-7502" or "1015457502.000"; anything that is
+    not a 10-digit BBL with a 1-5 borough digit yields None.
+    """
+    if value in (None, ""):
+        return None
+    digits = _only_digits(str(value).split(".", 1)[0])
+    if len(digits) == 10 and digits[0] in BOROUGH_CODE_TO_NAME:
+        return int(digits)
+    return None
+
+
 def _normalize_house_number(value: Any) -> Optional[str]:
     if value in (None, ""):
         return None
@@ -157,10 +172,25 @@ def normalize_address(house_number: Any, street: Any) -> NormalizedAddress:
     return NormalizedAddress(house, street_norm, full)
 
 
+def address_search_key(value: Any) -> Optional[str]:
+    """
+    Python twin of the SQL public.address_search_key(): strip accents, uppercase,
+    collapse anything that is not A-Z/0-9 into single spaces.
+    """
+    if value in (None, ""):
+        return None
+    decomposed = unicodedata.normalize("NFKD", str(value))
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    key = re.sub(r"[^A-Z0-9]+", " ", stripped.upper()).strip()
+    return key or None
+
+
 __all__ = [
     "BOROUGH_ALIASES",
     "BOROUGH_CODE_TO_NAME",
     "NormalizedAddress",
+    "address_search_key",
+    "bbl_key",
     "normalize_address",
     "normalize_bbl",
     "normalize_borough",
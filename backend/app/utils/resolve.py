@@ -14,6 +14,15 @@ def _split_address(address: str) -> Tuple[str, str]:
     return parts[0], parts[1]
 
 
+def _lookup_terms(
+    address: Optional[str], houseno: Optional[str], street: Optional[str], borough: Optional[str]
+) -> Tuple[str, str, str]:
+    if address and not (houseno and street):
+        houseno, street = _split_address(address)
+    addr = normalize_address(houseno, street)
+    return (borough or "").upper(), addr.street or "", addr.house_number or ""
+
+
 def bbl_for_address(
     conn,
     *,
@@ -23,13 +32,7 @@ def bbl_for_address(
     borough: Optional[str] = None,
     limit: int = 25,
 ) -> List[Dict[str, str]]:
-    if address and not (houseno and street):
-        houseno, street = _split_address(address)
-
-    addr = normalize_address(houseno, street)
-    street_norm = addr.street or ""
-    houseno = addr.house_number or ""
-    borough = (borough or "").upper()
+    borough, street_norm, houseno = _lookup_terms(address, houseno, street, borough)
 
     params = {
         "boro": borough,
@@ -70,3 +73,46 @@ def bbl_for_address(
         )
         rows = cur.fetchall()
         return [dict(r) for r in rows]
+
+
+async def abbl_for_address(
+    conn,
+    *,
+    address: Optional[str] = None,
+    houseno: Optional[str] = None,
+    street: Optional[str] = None,
+    borough: Optional[str] = None,
+    limit: int = 25,
+) -> List[Dict[str, str]]:
+    """bbl_for_address over an asyncpg connection."""
+    borough, street_norm, houseno = _lookup_terms(address, houseno, street, borough)
+    args = (borough, street_norm, houseno, limit)
+
+    rows = await conn.fetch(
+        """
+        SELECT bbl, address, street, zipcode
+        FROM pluto
+        WHERE ($1::text = '' OR borough = $1)
+          AND upper(street) = $2::text
+          AND ($3::text = '' OR houseno = $3)
+        ORDER BY address
+        LIMIT $4
+        """,
+        *args,
+    )
+    if rows:
+        return [dict(r) for r in rows]
+
+    rows = await conn.fetch(
+        """
+        SELECT bbl, address, street, zipcode
+        FROM pluto
+        WHERE ($1::text = '' OR borough = $1)
+          AND upper(street) ILIKE '%' || $2::text || '%'
+          AND ($3::text = '' OR houseno = $3)
+        ORDER BY address
+        LIMIT $4
+        """,
+        *args,
+    )
+    return [dict(r) for r in rows]
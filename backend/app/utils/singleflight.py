@@ -0,0 +1,73 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution.
+
+    The first caller for a key runs the work; callers arriving while it is in flight
+    wait for and share its result (or exception). Nothing is kept once the call
+    finishes, so this complements result caches rather than replacing them.
+    Calls are coroutines on one event loop.
+    """
+
+    def __init__(self) -> None:
+        self._async_calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.executions = 0
+        self.deduplicated = 0
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self.calls += 1
+            future = self._async_calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._async_calls[key] = loop.create_future()
+                self.executions += 1
+            else:
+                self.deduplicated += 1
+        if not leader:
+            try:
+                # shield: a cancelled follower must not cancel the leader's query.
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if future.cancelled() and not (task is not None and task.cancelling()):
+                    # The leader was cancelled (e.g. its client went away); run it ourselves.
+                    return await self.run(key, fn)
+                raise
+
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Followers re-raise it; retrieve here so an unshared failure is not logged as unhandled.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                if self._async_calls.get(key) is future:
+                    del self._async_calls[key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = len(self._async_calls)
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "deduplicated": self.deduplicated,
+            "in_flight": in_flight,
+        }
+
+
+__all__ = ["SingleFlight"]
@@ -5,6 +5,56 @@ from dataclasses import dataclass
 @dataclass(frozen=True)
 class Settings:
     TABLE_SEARCH: str = os.getenv("TABLE_SEARCH", "property_search_rich_mv")
+    SEARCH_ADDRESS_KEY_COLUMN: str = os.getenv("SEARCH_ADDRESS_KEY_COLUMN", "address_key")
+    SEARCH_GEOM_COLUMN: str = os.getenv("SEARCH_GEOM_COLUMN", "geom_4326")
+    SEARCH_COUNT_CAP: int = int(os.getenv("SEARCH_COUNT_CAP", "10000"))
+    # Chat only ever shows one page of rows, so a bounded count is plenty.
+    CHAT_COUNT_MODE: str = os.getenv("CHAT_COUNT_MODE", "capped")
+    CHAT_COUNT_CAP: int = int(os.getenv("CHAT_COUNT_CAP", "1000"))
+    SEARCH_CACHE_SIZE: int = int(os.getenv("SEARCH_CACHE_SIZE", "1024"))
+    SEARCH_CACHE_TTL: float = float(os.getenv("SEARCH_CACHE_TTL", "60"))
+    SUGGEST_ENABLED: bool = os.getenv("SUGGEST_ENABLED", "true").lower() in ("1", "true", "yes")
+    SEARCH_STATEMENT_CACHE_SIZE: int = int(os.getenv("SEARCH_STATEMENT_CACHE_SIZE", "128"))
+    TILE_CACHE_SIZE: int = int(os.getenv("TILE_CACHE_SIZE", "4096"))
+    TILE_CACHE_TTL: float = float(os.getenv("TILE_CACHE_TTL", "86400"))
+    TILE_MAX_AGE: int = int(os.getenv("TILE_MAX_AGE", "300"))
+    TILE_FULL_DETAIL_ZOOM: int = int(os.getenv("TILE_FULL_DETAIL_ZOOM", "15"))
+    TILE_THIN_PIXELS: int = int(os.getenv("TILE_THIN_PIXELS", "16"))
+    CLUSTERS_ENABLED: bool = os.getenv("CLUSTERS_ENABLED", "true").lower() in ("1", "true", "yes")
+    CLUSTER_MIN_ZOOM: int = int(os.getenv("CLUSTER_MIN_ZOOM", "8"))
+    CLUSTER_MAX_ZOOM: int = int(os.getenv("CLUSTER_MAX_ZOOM", "15"))
+    CLUSTER_CELL_PX: int = int(os.getenv("CLUSTER_CELL_PX", "64"))
+    SEARCH_BATCH_CONCURRENCY: int = int(os.getenv("SEARCH_BATCH_CONCURRENCY", "8"))
+    SEARCH_BATCH_MAX_ITEMS: int = int(os.getenv("SEARCH_BATCH_MAX_ITEMS", "500"))
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))
+    # psycopg2 pool for the synchronous routes (app.db.connection); seconds unless noted.
+    SYNC_DB_POOL_MIN: int = int(os.getenv("SYNC_DB_POOL_MIN", "1"))
+    SYNC_DB_POOL_MAX: int = int(os.getenv("SYNC_DB_POOL_MAX", "10"))
+    SYNC_DB_POOL_MAX_LIFETIME: float = float(os.getenv("SYNC_DB_POOL_MAX_LIFETIME", "1800"))
+    SYNC_DB_POOL_HEALTH_CHECK_AFTER: float = float(os.getenv("SYNC_DB_POOL_HEALTH_CHECK_AFTER", "30"))
+    SYNC_DB_POOL_ACQUIRE_TIMEOUT: float = float(os.getenv("SYNC_DB_POOL_ACQUIRE_TIMEOUT", "10"))
+    # Per-endpoint statement budgets in milliseconds (0 disables; the pool's DB_COMMAND_TIMEOUT still applies).
+    SEARCH_TIMEOUT_MS: int = int(os.getenv("SEARCH_TIMEOUT_MS", "5000"))
+    FACETS_TIMEOUT_MS: int = int(os.getenv("FACETS_TIMEOUT_MS", "10000"))
+    TILE_TIMEOUT_MS: int = int(os.getenv("TILE_TIMEOUT_MS", "10000"))
+    EXPORT_TIMEOUT_MS: int = int(os.getenv("EXPORT_TIMEOUT_MS", "60000"))
+    PROPERTY_TIMEOUT_MS: int = int(os.getenv("PROPERTY_TIMEOUT_MS", "5000"))
+    PROPERTY_BATCH_MAX_ITEMS: int = int(os.getenv("PROPERTY_BATCH_MAX_ITEMS", "500"))
+    PROPERTY_DOCUMENTS_ENABLED: bool = os.getenv("PROPERTY_DOCUMENTS_ENABLED", "true").lower() in ("1", "true", "yes")
+    PROPERTY_BUNDLE_SECTION_TIMEOUT_MS: int = int(os.getenv("PROPERTY_BUNDLE_SECTION_TIMEOUT_MS", "2000"))
+    # Comma-separated read replica DSNs for read-only endpoints (app.db.pool.get_read_pool).
+    DATABASE_REPLICA_URLS: tuple = tuple(
+        dsn.strip() for dsn in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if dsn.strip()
+    )
+    READ_HEDGE_ENABLED: bool = os.getenv("READ_HEDGE_ENABLED", "false").lower() in ("1", "true", "yes")
+    READ_HEDGE_AFTER_MS: float = float(os.getenv("READ_HEDGE_AFTER_MS", "0"))
+    READ_HEDGE_MIN_MS: float = float(os.getenv("READ_HEDGE_MIN_MS", "20"))
+    READ_REPLICA_RETRY_AFTER: float = float(os.getenv("READ_REPLICA_RETRY_AFTER", "5"))
+    # ETag / Cache-Control on property and search GETs (app.utils.conditional).
+    HTTP_ETAGS_ENABLED: bool = os.getenv("HTTP_ETAGS_ENABLED", "true").lower() in ("1", "true", "yes")
+    HTTP_CACHE_MAX_AGE: int = int(os.getenv("HTTP_CACHE_MAX_AGE", "60"))
+    DATA_VERSION_TTL: float = float(os.getenv("DATA_VERSION_TTL", "30"))
+    SEARCH_ENGINE: str = os.getenv("SEARCH_ENGINE", "sql").strip().lower()
 
 
 settings = Settings()
@@ -2,9 +2,94 @@ import pytest
 from httpx import AsyncClient, ASGITransport
 
 
+@pytest.fixture(autouse=True)
+def _clear_search_cache():
+    from app.routers import search
+
+    search.SEARCH_CACHE.clear()
+    search.FACETS_CACHE.clear()
+    yield
+
+
 @pytest.fixture
 async def app_client():
     from app.main import app
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
+
+
+class FakeConn:
+    """Minimal asyncpg connection stand-in that records every query."""
+
+    def __init__(self, rows, fetchval_result=None):
+        self.rows = rows
+        self.fetchval_result = fetchval_result
+        self.queries: list[tuple[str, tuple]] = []
+        self.prepared: list[str] = []
+        self.timeouts: list = []
+
+    async def fetchval(self, sql, *args, timeout=None):
+        self.queries.append((sql, args))
+        self.timeouts.append(timeout)
+        if self.fetchval_result is not None:
+            return self.fetchval_result
+        return len(self.rows)
+
+    async def fetch(self, sql, *args, timeout=None):
+        self.queries.append((sql, args))
+        self.timeouts.append(timeout)
+        return self.rows
+
+    async def prepare(self, sql):
+        self.prepared.append(sql)
+        return FakeStatement(self, sql)
+
+    def transaction(self, **kwargs):
+        class _Tx:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Tx()
+
+    async def cursor(self, sql, *args, prefetch=None, timeout=None):
+        self.queries.append((sql, args))
+        for row in self.rows:
+            yield row
+
+
+class FakeStatement:
+    def __init__(self, conn, sql):
+        self.conn = conn
+        self.sql = sql
+
+    async def fetch(self, *args, timeout=None):
+        return await self.conn.fetch(self.sql, *args, timeout=timeout)
+
+    async def fetchval(self, *args, timeout=None):
+        return await self.conn.fetchval(self.sql, *args, timeout=timeout)
+
+
+class FakePool:
+    def __init__(self, rows, fetchval_result=None):
+        self.conn = FakeConn(rows, fetchval_result)
+
+    def acquire(self):
+        pool = self
+
+        class _Ctx:
+            async def __aenter__(self):
+                return pool.conn
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Ctx()
+
+
+@pytest.fixture
+def fake_pool():
+    return FakePool
@@ -0,0 +1,169 @@
+import time
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db import data_version
+from app.db.data_version import DATA_VERSION, DataVersion
+from app.main import app
+from app.routers import property as property_router
+from app.routers import search as search_router
+from app.utils.conditional import if_none_match
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def pinned_version(monkeypatch):
+    monkeypatch.setattr(DATA_VERSION, "_value", "v1")
+    monkeypatch.setattr(DATA_VERSION, "_updated", "2026-10-01T00:00:00+00:00")
+    monkeypatch.setattr(DATA_VERSION, "_expires_at", time.monotonic() + 3600)
+    return DATA_VERSION
+
+
+def test_matching_if_none_match_returns_304_without_running_the_endpoint(monkeypatch, pinned_version):
+    calls = []
+
+    async def fake_zoning(bbl: str):
+        calls.append(bbl)
+        return {"base_codes": ["C5-3"]}
+
+    monkeypatch.setattr(property_router, "aget_zoning_by_bbl", fake_zoning)
+    client = TestClient(app)
+
+    first = client.get("/api/property/1012700008/zoning")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert etag.startswith('"') and not etag.startswith("W/")
+    assert first.headers["cache-control"].startswith("public, max-age=")
+
+    second = client.get("/api/property/1012700008/zoning", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+    assert calls == ["1012700008"]
+
+    # Another URL or another data version gets another tag.
+    other = client.get("/property/1012700008/zoning")
+    assert other.headers["etag"] != etag
+    monkeypatch.setattr(DATA_VERSION, "_value", "v2")
+    third = client.get("/api/property/1012700008/zoning", headers={"If-None-Match": etag})
+    assert third.status_code == 200
+    assert third.headers["etag"] != etag
+
+
+def test_validated_bodies_repeat_byte_for_byte(monkeypatch, pinned_version):
+    async def fake_deeds(bbl, limit):
+        return [{"doc_id": "D1"}]
+
+    monkeypatch.setattr(property_router, "aget_deeds_by_bbl", fake_deeds)
+    client = TestClient(app)
+    first = client.get("/api/property/1012700008/deeds")
+    time.sleep(0.01)
+    second = client.get("/api/property/1012700008/deeds")
+    # Same ETag means same bytes; a strong tag cannot cover a wall-clock field.
+    assert first.headers["etag"] == second.headers["etag"]
+    assert first.content == second.content
+    # sources[].updated comes from the data version, not the clock.
+    assert first.json()["sources"][0]["updated"] == "2026-10-01T00:00:00+00:00"
+
+
+def test_bundle_validators_only_when_every_section_succeeds(monkeypatch, pinned_version):
+    outcome = {"ok": True}
+
+    async def fake_section(name, bbl, pool, timeout_ms):
+        return dict(outcome)
+
+    async def no_pool():
+        return None
+
+    monkeypatch.setattr(property_router, "_bundle_section", fake_section)
+    app.dependency_overrides[property_router.get_read_pool] = no_pool
+    try:
+        client = TestClient(app)
+        url = "/api/property/1012700008/bundle"
+        ok = client.get(url, params={"include": "summary"})
+        etag = ok.headers["etag"]
+        assert client.get(url, params={"include": "summary"}, headers={"If-None-Match": etag}).status_code == 304
+
+        outcome.update(ok=False)
+        failed = client.get(url, params={"include": "summary"}, headers={"If-None-Match": etag})
+    finally:
+        app.dependency_overrides.clear()
+    # A failed section is never cached under the tag, nor answered with a 304.
+    assert failed.status_code == 200
+    assert "etag" not in failed.headers and "cache-control" not in failed.headers
+
+
+def test_search_estimate_counts_carry_no_validators(monkeypatch, pinned_version):
+    async def fake_run_search(**kwargs):
+        return search_router.SearchResult(total=7, rows=[], total_label="~7", count_mode=kwargs["count_mode"])
+
+    async def no_pool():
+        return None
+
+    monkeypatch.setattr(search_router, "run_search", fake_run_search)
+    app.dependency_overrides[search_router.get_read_pool] = no_pool
+    try:
+        client = TestClient(app)
+        exact = client.get("/api/search", params={"borough": "MN"})
+        estimate = client.get("/api/search", params={"borough": "MN", "count": "estimate"})
+    finally:
+        app.dependency_overrides.clear()
+    assert "etag" in exact.headers
+    assert estimate.status_code == 200 and "etag" not in estimate.headers
+
+
+def test_stats_routes_carry_no_validators(pinned_version):
+    r = TestClient(app).get("/api/property/stats/single-flight")
+    assert r.status_code == 200
+    assert "etag" not in r.headers
+
+
+def test_if_none_match_parsing():
+    assert if_none_match('"a", W/"b"', '"b"')
+    assert if_none_match("*", '"b"')
+    assert not if_none_match('"a"', '"b"')
+    assert not if_none_match(None, '"b"')
+
+
+@pytest.mark.anyio
+async def test_data_version_is_cached_and_dropped_on_refresh(monkeypatch):
+    queries = []
+
+    class _Conn:
+        async def fetch(self, sql):
+            queries.append(sql)
+            return [{"source": "dob_permits", "last_run": datetime(2026, 10, len(queries), tzinfo=timezone.utc)}]
+
+    class _Pool:
+        def acquire(self):
+            class _Ctx:
+                async def __aenter__(self):
+                    return _Conn()
+
+                async def __aexit__(self, *exc):
+                    return False
+
+            return _Ctx()
+
+    async def fake_read_pool():
+        return _Pool()
+
+    monkeypatch.setattr(data_version, "get_read_pool", fake_read_pool)
+    version = DataVersion(ttl=60)
+    monkeypatch.setattr(data_version, "DATA_VERSION", version)
+
+    first = await version.current()
+    assert await version.current() == first
+    assert await version.updated() == "2026-10-01T00:00:00+00:00"
+    assert len(queries) == 1
+
+    data_version._invalidate_data_version("mv_permit_agg")
+    second = await version.current()
+    assert second != first
+    assert len(queries) == 2
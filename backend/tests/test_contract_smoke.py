@@ -9,7 +9,7 @@ from backend.app.main import app
 def test_summary_200_with_sources(monkeypatch):
     from app.routers import property as property_router
 
-    def fake_get_summary_by_bbl(bbl: str):
+    async def fake_get_summary_by_bbl(bbl: str):
         return {
             "bbl": bbl,
             "address": "6 E 43rd St, New York, NY 10017",
@@ -26,7 +26,7 @@ def test_summary_200_with_sources(monkeypatch):
             "last_updated": "2025-01-01T00:00:00Z",
         }
 
-    monkeypatch.setattr(property_router, "get_summary_by_bbl", fake_get_summary_by_bbl)
+    monkeypatch.setattr(property_router, "aget_summary_by_bbl", fake_get_summary_by_bbl)
 
     client = TestClient(app)
     r = client.get("/property/1012700008/summary")
@@ -39,10 +39,10 @@ def test_summary_200_with_sources(monkeypatch):
 def test_resolve_returns_candidate(monkeypatch):
     from app.routers import resolve as resolve_router
 
-    def fake_resolve_candidates(q: str, limit: int = 5):
+    async def fake_resolve_candidates(q: str, limit: int = 5):
         return [{"bbl": "1012700008", "address_std": "6 E 43rd St, New York, NY 10017"}]
 
-    monkeypatch.setattr(resolve_router, "resolve_candidates", fake_resolve_candidates)
+    monkeypatch.setattr(resolve_router, "aresolve_candidates", fake_resolve_candidates)
 
     client = TestClient(app)
     r = client.get("/resolve", params={"query": "6 E 43rd"})
@@ -54,7 +54,7 @@ def test_resolve_returns_candidate(monkeypatch):
 def test_deeds_endpoint_sorted_and_limited(monkeypatch):
     from app.routers import property as property_router
 
-    def fake_get_deeds_by_bbl(bbl: str, limit: int):
+    async def fake_get_deeds_by_bbl(bbl: str, limit: int):
         return [
             {
                 "recorded_at": "2022-06-15",
@@ -72,7 +72,7 @@ def test_deeds_endpoint_sorted_and_limited(monkeypatch):
             },
         ][:limit]
 
-    monkeypatch.setattr(property_router, "get_deeds_by_bbl", fake_get_deeds_by_bbl)
+    monkeypatch.setattr(property_router, "aget_deeds_by_bbl", fake_get_deeds_by_bbl)
 
     client = TestClient(app)
     r = client.get("/property/1012700008/deeds", params={"limit": 2})
@@ -89,7 +89,7 @@ def test_deeds_endpoint_sorted_and_limited(monkeypatch):
 def test_mortgages_endpoint_sorted_and_limited(monkeypatch):
     from app.routers import property as property_router
 
-    def fake_get_mortgages_by_bbl(bbl: str, limit: int):
+    async def fake_get_mortgages_by_bbl(bbl: str, limit: int):
         return [
             {
                 "recorded_at": "2022-06-15",
@@ -100,7 +100,7 @@ def test_mortgages_endpoint_sorted_and_limited(monkeypatch):
             }
         ][:limit]
 
-    monkeypatch.setattr(property_router, "get_mortgages_by_bbl", fake_get_mortgages_by_bbl)
+    monkeypatch.setattr(property_router, "aget_mortgages_by_bbl", fake_get_mortgages_by_bbl)
 
     client = TestClient(app)
     r = client.get("/property/1012700008/mortgages", params={"limit": 2})
@@ -116,13 +116,13 @@ def test_mortgages_endpoint_sorted_and_limited(monkeypatch):
 def test_permits_endpoint_has_filed_at(monkeypatch):
     from app.routers import property as property_router
 
-    def fake_get_permits_by_bbl(bbl: str, since: str | None = None):
+    async def fake_get_permits_by_bbl(bbl: str, since: str | None = None):
         return [
             {"filed_at": "2025-06-01", "details": {"job_type": "Alteration", "status": "Permit - Issued", "description": "HVAC replacement", "initial_cost": 120000}},
             {"filed_at": "2024-12-11", "details": {"job_type": "Alteration CO", "status": "Issued", "description": "CO for lobby", "initial_cost": 250000}},
         ]
 
-    monkeypatch.setattr(property_router, "get_permits_by_bbl", fake_get_permits_by_bbl)
+    monkeypatch.setattr(property_router, "aget_permits_by_bbl", fake_get_permits_by_bbl)
 
     client = TestClient(app)
     r = client.get("/property/1012700008/permits")
@@ -136,13 +136,13 @@ def test_permits_endpoint_has_filed_at(monkeypatch):
 def test_violations_endpoint_has_issued_at(monkeypatch):
     from app.routers import property as property_router
 
-    def fake_get_violations_by_bbl(bbl: str, since: str | None = None):
+    async def fake_get_violations_by_bbl(bbl: str, since: str | None = None):
         return [
             {"issued_at": "2025-01-22", "details": {"code": "DOB-YY", "status": "Open", "description": "Guardrail not to code"}},
             {"issued_at": "2024-10-18", "details": {"code": "ECB-XX", "status": "Resolved", "description": "Boiler violation resolved"}},
         ]
 
-    monkeypatch.setattr(property_router, "get_violations_by_bbl", fake_get_violations_by_bbl)
+    monkeypatch.setattr(property_router, "aget_violations_by_bbl", fake_get_violations_by_bbl)
 
     client = TestClient(app)
     r = client.get("/property/1012700008/violations")
@@ -156,10 +156,10 @@ def test_violations_endpoint_has_issued_at(monkeypatch):
 def test_zoning_endpoint_has_base_codes(monkeypatch):
     from app.routers import property as property_router
 
-    def fake_get_zoning_by_bbl(bbl: str):
+    async def fake_get_zoning_by_bbl(bbl: str):
         return {"base_codes": ["C5-3"], "overlays": ["Special Midtown District"], "sp_districts": ["SP-MID"], "far_notes": "See §81-00 et seq"}
 
-    monkeypatch.setattr(property_router, "get_zoning_by_bbl", fake_get_zoning_by_bbl)
+    monkeypatch.setattr(property_router, "aget_zoning_by_bbl", fake_get_zoning_by_bbl)
 
     client = TestClient(app)
     r = client.get("/property/1012700008/zoning")
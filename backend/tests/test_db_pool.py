@@ -0,0 +1,100 @@
+import threading
+
+import pytest
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+
+from app.db import connection
+
+
+class _Info:
+    transaction_status = extensions.TRANSACTION_STATUS_IDLE
+
+
+class _PgConn:
+    def __init__(self):
+        self.closed = 0
+        self.info = _Info()
+        self.rollbacks = 0
+        self.healthy = True
+
+    def cursor(self):
+        conn = self
+
+        class _Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, sql, params=None):
+                if not conn.healthy:
+                    raise connection.psycopg2.OperationalError("server closed the connection")
+                conn.info.transaction_status = extensions.TRANSACTION_STATUS_INTRANS
+
+        return _Cursor()
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.info.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    conns = []
+
+    def connect(dsn):
+        conns.append(_PgConn())
+        return conns[-1]
+
+    monkeypatch.setattr(connection.psycopg2, "connect", connect)
+    return conns
+
+
+def test_connections_are_reused_and_rolled_back(opened):
+    pool = connection.SyncPool("postgresql://test", max_size=2)
+    conn = pool.getconn()
+    with conn.cursor() as cur:
+        cur.execute("SET LOCAL statement_timeout = 5")
+    pool.putconn(conn)
+    assert conn.rollbacks == 1
+
+    assert pool.getconn() is conn
+    assert len(opened) == 1
+    stats = pool.stats()
+    assert stats["checkouts"] == 2
+    assert stats["created"] == 1
+    assert stats["in_use"] == 1
+
+
+def test_size_limit_waits_then_times_out(opened):
+    pool = connection.SyncPool("postgresql://test", max_size=1, acquire_timeout=0.05)
+    held = pool.getconn()
+    with pytest.raises(PoolError):
+        pool.getconn()
+    assert pool.stats()["timeouts"] == 1
+
+    threading.Timer(0.01, pool.putconn, args=(held,)).start()
+    pool.acquire_timeout = 1.0
+    assert pool.getconn() is held
+    assert pool.stats()["wait_ms_max"] > 0
+
+
+def test_unhealthy_and_expired_connections_are_replaced(opened):
+    pool = connection.SyncPool("postgresql://test", max_size=2, health_check_after=0)
+    conn = pool.getconn()
+    pool.putconn(conn)
+    conn.healthy = False
+    replacement = pool.getconn()
+    assert replacement is not conn and conn.closed
+    assert pool.stats()["unhealthy"] == 1
+
+    pool.max_lifetime = 0
+    pool.putconn(replacement)
+    assert replacement.closed
+    assert pool.stats()["recycled"] == 1
+    assert pool.stats()["open"] == 0
@@ -3,7 +3,8 @@ import os
 import psycopg2
 import pytest
 
-from app.utils.normalize import normalize_address, normalize_bbl
+from app.ingestion.normalizers import normalize_dob_permit
+from app.utils.normalize import address_search_key, bbl_key, normalize_address, normalize_bbl
 
 
 def test_normalize_bbl_padding_and_borough_alias():
@@ -12,6 +13,16 @@ def test_normalize_bbl_padding_and_borough_alias():
     assert normalize_bbl("4", "123", "45") == "40012300045"
 
 
+def test_bbl_key_matches_bbl_norm_columns():
+    assert bbl_key("1015457502") == 1015457502
+    assert bbl_key("1015457502.000000000") == 1015457502
+    assert bbl_key("1-01545-7502") == 1015457502
+    assert bbl_key("6015457502") is None
+    assert bbl_key("") is None
+    record = normalize_dob_permit({"job__": "J1", "borough": "MANHATTAN", "block": "1545", "lot": "7502"})
+    assert record["bbl_norm"] == 1015457502
+
+
 def test_normalize_address_queens_hyphen():
     addr = normalize_address(" 41 -2 ", "Main st.")
     assert addr.house_number == "41-02"
@@ -43,3 +54,8 @@ def test_crs_transform_contains():
         assert contains is True
     finally:
         conn.close()
+
+
+def test_address_search_key_strips_accents_and_punctuation():
+    assert address_search_key(" 12 Café-Rd., Apt #3 ") == "12 CAFE RD APT 3"
+    assert address_search_key("  ") is None
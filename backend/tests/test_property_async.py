@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+from app.db.catalog import SCHEMA
+from app.db.timeouts import statement_timeout
+from app.routers import property as property_router
+from app.services import property_service
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class _DetailConn:
+    def __init__(self):
+        self.queries = []
+        self.timeouts = []
+
+    async def fetch(self, sql, *args, timeout=None):
+        self.queries.append((sql, args))
+        self.timeouts.append(timeout)
+        if "pg_attribute" in sql:
+            return [{"column_name": name} for name in ("bbl", "address", "year_built", "permit_count_12m")]
+        await asyncio.sleep(0.01)
+        return [{"job_number": "J1", "status": "ISSUED"}]
+
+    async def fetchrow(self, sql, *args, timeout=None):
+        self.queries.append((sql, args))
+        self.timeouts.append(timeout)
+        return {"bbl": "1012700008", "address": "6 E 43 ST", "yearbuilt": 1968, "permit_count_12m": 3}
+
+
+class _Pool:
+    def __init__(self, conn):
+        self.conn = conn
+        self.acquired = 0
+
+    def acquire(self):
+        pool = self
+
+        class _Ctx:
+            async def __aenter__(self):
+                pool.acquired += 1
+                return pool.conn
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Ctx()
+
+
+@pytest.mark.anyio
+async def test_property_detail_runs_on_asyncpg_and_coalesces():
+    SCHEMA.invalidate()
+    conn = _DetailConn()
+    pool = _Pool(conn)
+
+    first, second = await asyncio.gather(
+        property_router.property_detail("1012700008", pool=pool),
+        property_router.property_detail("1012700008", pool=pool),
+    )
+    assert first == second
+    assert first.summary.yearbuilt == 1968
+    assert first.summary.zonedist1 is None
+    assert first.recent_permits[0].job_number == "J1"
+    assert pool.acquired == 1
+    assert all("%s" not in sql for sql, _ in conn.queries)
+    assert conn.queries[1][1] == (1012700008,)
+    assert conn.timeouts[1:] == [5.0, 5.0]
+    SCHEMA.invalidate()
+
+
+@pytest.mark.anyio
+async def test_async_service_functions_share_the_asyncpg_pool(monkeypatch):
+    calls = []
+
+    class _Conn:
+        async def fetch(self, sql, *args, timeout=None):
+            calls.append((sql, args, timeout))
+            return [{"base_codes": ["C5-3"]}]
+
+    pool = _Pool(_Conn())
+
+    async def fake_get_read_pool():
+        return pool
+
+    monkeypatch.setattr(property_service, "get_read_pool", fake_get_read_pool)
+    with statement_timeout(250):
+        assert await property_service.aget_zoning_by_bbl("1012700008") == {"base_codes": ["C5-3"]}
+        await property_service.aget_violations_by_bbl("1012700008", since="2024-01-01")
+    assert calls[0][1:] == (("1012700008",), 0.25)
+    assert "$2::text::date" in calls[1][0]
+    assert calls[1][1] == ("1012700008", "2024-01-01")
+    assert await property_service.aget_summary_by_bbl("not-a-bbl") is None
+
+
+@pytest.mark.anyio
+async def test_permit_lookups_use_typed_bbl_norm(monkeypatch):
+    calls = []
+
+    class _Conn:
+        async def fetch(self, sql, *args, timeout=None):
+            calls.append((sql, args))
+            return []
+
+    pool = _Pool(_Conn())
+
+    async def fake_get_read_pool():
+        return pool
+
+    monkeypatch.setattr(property_service, "get_read_pool", fake_get_read_pool)
+    await property_service.aget_permits_by_bbl("1012700008.000", 5)
+    await property_service.aget_permits(_Conn(), "1012700008")
+    assert [args[0] for _, args in calls] == [1012700008, 1012700008]
+    assert all("bbl_norm = $1" in sql and "regexp" not in sql for sql, _ in calls)
+    assert await property_service.aget_permits_by_bbl("not-a-bbl") == []
+    assert len(calls) == 2
@@ -0,0 +1,76 @@
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+import app.main as main
+
+
+class _Conn:
+    def __init__(self):
+        self.queries = []
+
+    async def fetch(self, sql, *args):
+        self.queries.append((sql, args))
+        if "FROM public.pluto" in sql:
+            return [
+                {"bbl_key": bbl, "bbl": str(bbl), "address": f"{bbl} MAIN ST", "zipcode": "10001", "borough": "MN",
+                 "houseno": "1", "street": "MAIN ST", "latitude": None, "longitude": None, "raw": None}
+                for bbl in args[0] if bbl != 1000000002
+            ]
+        if "mv_permit_agg" in sql:
+            return [{"bbl_key": 1000000001, "permit_count_12m": 4, "last_permit_date": date(2024, 5, 1)}]
+        return [
+            {"bbl_key": 1000000001, "job_number": "J1", "status": "ISSUED", "issuance_date_norm": date(2024, 5, 1),
+             "filing_date": None, "filed_date": None},
+            {"bbl_key": 1000000003, "job_number": "J3", "status": "FILED", "issuance_date_norm": None,
+             "filing_date": None, "filed_date": None},
+        ]
+
+
+class _Pool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        conn = self.conn
+
+        class _Ctx:
+            async def __aenter__(self):
+                return conn
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Ctx()
+
+
+def test_batch_lookup_uses_one_query_per_table(monkeypatch):
+    conn = _Conn()
+
+    async def read_pool():
+        return _Pool(conn)
+
+    monkeypatch.setattr(main, "get_read_pool", read_pool)
+    client = TestClient(main.app)
+    r = client.post(
+        "/api/property/batch",
+        json={"bbls": ["1000000001", "1000000001.000", "1000000002", "1000000003", "not-a-bbl"]},
+    )
+    assert r.status_code == 200
+    data = r.json()
+    assert set(data["results"]) == {"1000000001", "1000000003"}
+    assert data["results"]["1000000001"]["agg"]["permit_count_12m"] == 4
+    assert data["results"]["1000000001"]["recent_permits"][0]["job_number"] == "J1"
+    assert data["results"]["1000000003"]["agg"] == {"permit_count_12m": 0, "last_permit_date": None}
+    assert data["not_found"] == ["1000000002"]
+    assert data["invalid"] == ["not-a-bbl"]
+    assert len(conn.queries) == 3
+    assert all("ANY($1::bigint[])" in sql or "unnest($1::bigint[])" in sql for sql, _ in conn.queries)
+    assert conn.queries[0][1] == ([1000000001, 1000000002, 1000000003],)
+    assert "bbl_norm = b.bbl_key" in conn.queries[2][0]
+
+
+def test_batch_lookup_rejects_oversized_requests():
+    client = TestClient(main.app)
+    r = client.post("/api/property/batch", json={"bbls": ["1"] * (main.settings.PROPERTY_BATCH_MAX_ITEMS + 1)})
+    assert r.status_code == 413
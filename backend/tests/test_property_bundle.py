@@ -0,0 +1,70 @@
+import asyncio
+import dataclasses
+
+import asyncpg
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routers import property as property_router
+
+
+def test_bundle_fetches_sections_concurrently_and_isolates_failures(monkeypatch):
+    running = 0
+    peak = 0
+
+    async def fake_summary(bbl):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        return {"bbl": bbl, "sources": []}
+
+    async def fake_zoning(bbl):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        return {"base": ["C5-3"], "sources": []}
+
+    async def slow_deeds(bbl, limit=5):
+        await asyncio.sleep(5)
+
+    async def missing_mortgages(bbl, limit=5):
+        raise property_router.HTTPException(status_code=404, detail="Not found")
+
+    async def missing_violations(bbl, limit=5):
+        raise asyncpg.UndefinedTableError('relation "dob_violations" does not exist')
+
+    async def no_pool():
+        return None
+
+    monkeypatch.setattr(property_router, "summary", fake_summary)
+    monkeypatch.setattr(property_router, "zoning", fake_zoning)
+    monkeypatch.setattr(property_router, "deeds", slow_deeds)
+    monkeypatch.setattr(property_router, "mortgages", missing_mortgages)
+    monkeypatch.setattr(property_router, "violations", missing_violations)
+    monkeypatch.setattr(
+        property_router, "settings", dataclasses.replace(property_router.settings, PROPERTY_BUNDLE_SECTION_TIMEOUT_MS=50)
+    )
+    app.dependency_overrides[property_router.get_read_pool] = no_pool
+    try:
+        client = TestClient(app)
+        r = client.get(
+            "/api/property/1012700008/bundle", params={"include": "summary,zoning,deeds,mortgages,violations"}
+        )
+        bad = client.get("/api/property/1012700008/bundle", params={"include": "summary,owners"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert r.status_code == 200
+    sections = r.json()["sections"]
+    assert list(sections) == ["summary", "zoning", "deeds", "mortgages", "violations"]
+    assert sections["summary"] == {"ok": True, "data": {"bbl": "1012700008", "sources": []}}
+    assert sections["zoning"]["data"]["base"] == ["C5-3"]
+    assert sections["deeds"] == {"ok": False, "error": {"status": 504, "detail": "deeds timed out"}}
+    assert sections["mortgages"]["error"]["status"] == 404
+    assert sections["violations"] == {"ok": False, "error": {"status": 503, "detail": "violations unavailable"}}
+    assert peak == 2
+    assert bad.status_code == 400
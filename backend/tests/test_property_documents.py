@@ -0,0 +1,140 @@
+import json
+from datetime import date, datetime, timezone
+
+import asyncpg
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.ingestion import property_documents
+
+
+class _Conn:
+    def __init__(self, doc=None, error=None):
+        self.doc = doc
+        self.error = error
+        self.queries = []
+
+    async def fetchval(self, sql, *args, timeout=None):
+        self.queries.append(sql)
+        if self.error:
+            raise self.error
+        return self.doc
+
+    async def fetchrow(self, sql, *args):
+        self.queries.append(sql)
+        if "FROM public.pluto" in sql:
+            return {"bbl": "1000000001", "address": "1 MAIN ST", "zipcode": "10001", "borough": "MN",
+                    "houseno": "1", "street": "MAIN ST", "latitude": None, "longitude": None, "raw": None}
+        return None
+
+    async def fetch(self, sql, *args):
+        self.queries.append(sql)
+        return []
+
+
+class _Pool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        conn = self.conn
+
+        class _Ctx:
+            async def __aenter__(self):
+                return conn
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Ctx()
+
+
+def _client(monkeypatch, conn):
+    async def read_pool():
+        return _Pool(conn)
+
+    monkeypatch.setattr(main, "get_read_pool", read_pool)
+    return TestClient(main.app)
+
+
+def test_property_serves_prebuilt_document_with_one_lookup(monkeypatch):
+    doc = {"bbl": 1000000001, "recent_permits": [{"job_number": f"J{i}"} for i in range(10)]}
+    conn = _Conn(doc=doc)
+    r = _client(monkeypatch, conn).get("/property/1000000001", params={"limit": 3})
+    assert r.status_code == 200
+    assert [p["job_number"] for p in r.json()["recent_permits"]] == ["J0", "J1", "J2"]
+    assert len(conn.queries) == 1
+    assert "property_documents WHERE bbl = $1" in conn.queries[0]
+
+
+def test_property_builds_live_without_document_or_table(monkeypatch):
+    for conn in (_Conn(), _Conn(error=asyncpg.UndefinedTableError("missing"))):
+        r = _client(monkeypatch, conn).get("/property/1000000001")
+        assert r.status_code == 200
+        assert r.json()["borough"] == "MN"
+        assert any("FROM public.pluto" in sql for sql in conn.queries)
+
+
+class _Cursor:
+    def __init__(self, log):
+        self.log = log
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.log.append((sql, params))
+        if "FROM public.pluto" in sql and "DISTINCT ON" in sql:
+            self.rows = [
+                {"bbl_key": 1000000001, "bbl": "1000000001", "address": "1 MAIN ST", "zipcode": "10001",
+                 "borough": "MN", "houseno": "1", "street": "MAIN ST", "latitude": 40.7, "longitude": -74.0,
+                 "raw": {"numfloors": "3"}}
+            ]
+        elif "updated_at >=" in sql:
+            self.rows = [(1000000001,), (1000000002,)]
+        elif "mv_permit_agg" in sql:
+            self.rows = [{"bbl_key": 1000000001, "permit_count_12m": 2, "last_permit_date": date(2024, 5, 1)}]
+        elif "dob_permits" in sql:
+            self.rows = [{"bbl_key": 1000000001, "job_number": "J1", "status": "ISSUED",
+                          "issuance_date_norm": date(2024, 5, 1), "filing_date": None, "filed_date": None}]
+        else:
+            self.rows = []
+
+    def fetchall(self):
+        return self.rows
+
+
+class _SyncConn:
+    def __init__(self):
+        self.log = []
+
+    def cursor(self, cursor_factory=None):
+        return _Cursor(self.log)
+
+
+def test_rebuild_writes_touched_lots_and_drops_vanished_ones(monkeypatch):
+    written = []
+
+    def fake_execute_values(cur, sql, rows, template=None):
+        written.extend(rows)
+
+    monkeypatch.setattr(property_documents, "execute_values", fake_execute_values)
+    conn = _SyncConn()
+    since = datetime(2026, 10, 18, tzinfo=timezone.utc)
+
+    assert property_documents.rebuild(conn, since=since) == 1
+    assert conn.log[0][1] == {"since": since}
+    assert all("$1" not in sql and "$2" not in sql for sql, _ in conn.log)
+    deletes = [params for sql, params in conn.log if sql.startswith("DELETE")]
+    assert deletes == [{"bbls": [1000000002]}]
+
+    (bbl, payload), = written
+    doc = json.loads(payload)
+    assert bbl == 1000000001
+    assert doc["agg"] == {"permit_count_12m": 2, "last_permit_date": "2024-05-01"}
+    assert doc["pluto"]["num_floors"] == 3.0
+    assert doc["recent_permits"][0]["issuance_date_norm"] == "2024-05-01"
@@ -0,0 +1,69 @@
+import asyncio
+import logging
+
+import pytest
+
+from app.db import refresh
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_async_callbacks_are_tracked_and_failures_logged(monkeypatch, caplog):
+    async def boom(payload):
+        raise RuntimeError("cache rebuild failed")
+
+    monkeypatch.setattr(refresh, "_CALLBACKS", [boom])
+    with caplog.at_level(logging.ERROR, logger=refresh.__name__):
+        refresh.dispatch_refresh("mv_property_search")
+        assert len(refresh._PENDING) == 1
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+    assert not refresh._PENDING
+    assert "async refresh callback failed" in caplog.text
+
+
+class _DeadConn:
+    terminated = False
+
+    def is_closed(self):
+        return True
+
+    def terminate(self):
+        self.terminated = True
+
+
+@pytest.mark.anyio
+async def test_supervisor_reconnects_a_dropped_listener(monkeypatch):
+    dead = _DeadConn()
+    connects = []
+    refreshed = []
+
+    async def fake_connect(dsn):
+        connects.append(dsn)
+        monkeypatch.setattr(refresh, "_LISTENER", object())
+        return refresh._LISTENER
+
+    async def alive(conn):
+        return True
+
+    monkeypatch.setattr(refresh, "_LISTENER", dead)
+    monkeypatch.setattr(refresh, "LISTENER_CHECK_INTERVAL", 0.001)
+    monkeypatch.setattr(refresh, "_connect_listener", fake_connect)
+    monkeypatch.setattr(refresh, "_listener_alive", lambda conn: alive(conn) if conn is not dead else _false())
+    monkeypatch.setattr(refresh, "_CALLBACKS", [refreshed.append])
+
+    task = asyncio.ensure_future(refresh._supervise_listener("postgres://x"))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    assert dead.terminated
+    assert connects == ["postgres://x"]
+    # Missed notifications are covered by one refresh after reconnecting.
+    assert refreshed == [""]
+
+
+async def _false():
+    return False
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from app.db.replicas import ReplicaSet, run_read
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class _Pool:
+    def __init__(self, name, delay=0.0, down=False):
+        self.name = name
+        self.delay = delay
+        self.down = down
+        self.cancelled = 0
+        self.served = 0
+
+    def acquire(self):
+        pool = self
+
+        class _Ctx:
+            async def __aenter__(self):
+                if pool.down:
+                    raise ConnectionRefusedError(f"{pool.name} is down")
+                return pool
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Ctx()
+
+    async def query(self):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        self.served += 1
+        return self.name
+
+
+async def _query(conn):
+    return await conn.query()
+
+
+@pytest.mark.anyio
+async def test_reads_spread_across_replicas():
+    a, b = _Pool("a", delay=0.01), _Pool("b", delay=0.01)
+    replicas = ReplicaSet([a, b], _Pool("primary"))
+    results = await asyncio.gather(*(run_read(replicas, _query) for _ in range(4)))
+    assert sorted(results) == ["a", "a", "b", "b"]
+
+
+@pytest.mark.anyio
+async def test_slow_replica_is_hedged_and_loser_cancelled():
+    slow, fast = _Pool("slow", delay=1.0), _Pool("fast", delay=0.0)
+    replicas = ReplicaSet([slow, fast], _Pool("primary"), hedge=True, hedge_after_ms=10)
+    # Make the slow replica the first pick.
+    replicas.replicas[1].in_flight = 1
+    task = asyncio.ensure_future(replicas.run(_query))
+    await asyncio.sleep(0)
+    replicas.replicas[1].in_flight = 0
+    assert await task == "fast"
+    await asyncio.sleep(0)
+    assert slow.cancelled == 1
+    stats = replicas.stats()
+    assert (stats["hedged"], stats["hedge_wins"]) == (1, 1)
+
+
+@pytest.mark.anyio
+async def test_unreachable_replica_is_skipped_and_reads_fall_back():
+    down, primary = _Pool("down", down=True), _Pool("primary")
+    replicas = ReplicaSet([down], primary, retry_after=60)
+    assert await replicas.run(_query) == "primary"
+    assert replicas.stats()["replicas"][0]["healthy"] is False
+    assert await replicas.run(_query) == "primary"
+    assert replicas.stats()["fallbacks"] == 2
+
+
+def test_hedge_delay_tracks_p95():
+    replicas = ReplicaSet([_Pool("a")], _Pool("primary"), hedge=True, hedge_min_ms=1)
+    for ms in range(1, 101):
+        replicas._record(replicas.replicas[0], float(ms))
+    assert replicas.hedge_delay() == pytest.approx(0.095)
@@ -0,0 +1,63 @@
+from app.db.catalog import PROPERTY_SEARCH, SchemaRegistry
+from app.db.refresh import _CALLBACKS
+
+
+class _Cursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params):
+        self.conn.executed.append(params)
+
+    def fetchall(self):
+        return [{"column_name": name} for name in self.conn.columns.get(self.conn.executed[-1][0], ())]
+
+
+class _SyncConn:
+    def __init__(self, columns):
+        self.columns = columns
+        self.executed = []
+
+    def cursor(self):
+        return _Cursor(self)
+
+
+def test_columns_are_introspected_once_until_invalidated():
+    registry = SchemaRegistry()
+    conn = _SyncConn({PROPERTY_SEARCH: ["bbl", "address", "year_built"]})
+
+    assert registry.columns(conn, PROPERTY_SEARCH) == {"bbl", "address", "year_built"}
+    assert registry.columns(conn, PROPERTY_SEARCH) == {"bbl", "address", "year_built"}
+    assert len(conn.executed) == 1
+
+    conn.columns[PROPERTY_SEARCH].append("units_total")
+    registry.invalidate()
+    assert "units_total" in registry.columns(conn, PROPERTY_SEARCH)
+    assert registry.introspections == 2
+
+
+def test_missing_relation_is_not_cached():
+    registry = SchemaRegistry()
+    conn = _SyncConn({})
+
+    assert registry.columns(conn, PROPERTY_SEARCH) == frozenset()
+    conn.columns[PROPERTY_SEARCH] = ["bbl"]
+    assert registry.columns(conn, PROPERTY_SEARCH) == {"bbl"}
+
+
+def test_refresh_notification_clears_shared_registry():
+    from app.db.catalog import SCHEMA, _invalidate_schema
+
+    assert _invalidate_schema in _CALLBACKS
+    conn = _SyncConn({PROPERTY_SEARCH: ["bbl"]})
+    SCHEMA.columns(conn, PROPERTY_SEARCH)
+    _invalidate_schema("mv_property_search")
+    SCHEMA.columns(conn, PROPERTY_SEARCH)
+    assert len(conn.executed) == 2
+    SCHEMA.invalidate()
@@ -0,0 +1,87 @@
+import pytest
+
+from app.db.catalog import SCHEMA
+from app.routers import search as search_router
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def _search_columns(monkeypatch):
+    monkeypatch.setitem(SCHEMA._columns, search_router.TABLE_SEARCH, frozenset({"bbl", "houseno", "street"}))
+
+
+def test_parse_structured_address_normalizes_parts():
+    address, borough = search_router.parse_structured_address("41-2 Main St., Queens, NY 11355")
+    assert (address.house_number, address.street, borough) == ("41-02", "MAIN ST", "QN")
+    assert search_router.parse_structured_address("Broadway") is None
+    assert search_router.parse_structured_address("1012700008") is None
+
+
+async def _search(pool, q, **overrides):
+    params = dict(
+        q=q,
+        borough=None,
+        floors_min=None,
+        units_min=None,
+        year_min=None,
+        permits_min_12m=None,
+        sort=None,
+        order=None,
+        limit=5,
+        offset=0,
+        pool=pool,
+    )
+    params.update(overrides)
+    return await search_router.run_search(**params)
+
+
+@pytest.mark.anyio
+async def test_structured_address_uses_equality_lookup(fake_pool):
+    pool = fake_pool([{"bbl": "1000477501", "address": "120 BROADWAY"}])
+    result = await _search(pool, "120 Broadway, Manhattan")
+    assert [row.bbl for row in result.rows] == ["1000477501"]
+    assert len(pool.conn.queries) == 1
+    sql, args = pool.conn.queries[0]
+    assert "ps.houseno = $" in sql and "ps.street ~>=~ $" in sql and "ps.street ~<~ $" in sql
+    assert "ILIKE" not in sql.split("ORDER BY")[0]
+    # A prefix range, so "_" and "%" in a street name are literal characters.
+    assert {"120", "BROADWAY", "BROADWAY\U0010ffff", "MN"} <= set(args)
+
+
+@pytest.mark.anyio
+async def test_structured_address_needs_houseno_and_street_columns(fake_pool, monkeypatch):
+    monkeypatch.setitem(SCHEMA._columns, search_router.TABLE_SEARCH, frozenset({"bbl", "address"}))
+    pool = fake_pool([{"bbl": "1000477501", "address": "120 BROADWAY"}])
+    await _search(pool, "120 Broadway")
+    assert len(pool.conn.queries) == 1
+    assert "ps.houseno" not in pool.conn.queries[0][0]
+
+
+@pytest.mark.anyio
+async def test_structured_address_falls_back_to_fuzzy(fake_pool):
+    pool = fake_pool([])
+    await _search(pool, "120 Broadway")
+    assert len(pool.conn.queries) == 2
+    fallback_sql, _ = pool.conn.queries[1]
+    assert "ps.address ILIKE" in fallback_sql
+
+
+@pytest.mark.anyio
+async def test_structured_address_later_pages_never_fall_back(fake_pool):
+    pool = fake_pool([])
+    conn = pool.conn
+    hit = {"bbl": "1000477501", "address": "120 BROADWAY"}
+
+    async def fetch(sql, *args, timeout=None):
+        conn.queries.append((sql, args))
+        # Structured rows exist, but only on page 1 (the OFFSET is the last argument).
+        return [hit] if "ps.houseno" in sql and args[-1] == 0 else []
+
+    conn.fetch = fetch
+    result = await _search(pool, "120 Broadway", offset=5)
+    assert result.rows == []
+    assert all("ps.address ILIKE" not in sql for sql, _ in conn.queries)
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from app.routers import search as search_router
+from app.routers.search import BatchSearchQuery
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_batch_runs_concurrently_bounded_and_keeps_order(monkeypatch):
+    running = 0
+    peak = 0
+
+    async def fake_run_search(**kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01 if kwargs["q"] == "slow" else 0)
+        running -= 1
+        if kwargs["borough"] == "XX":
+            raise search_router.HTTPException(400, "Invalid borough")
+        return search_router.SearchResult(total=0, rows=[], total_label="0")
+
+    monkeypatch.setattr(search_router, "run_search", fake_run_search)
+    queries = [BatchSearchQuery(q="slow"), BatchSearchQuery(borough="XX")] + [
+        BatchSearchQuery(q=str(i)) for i in range(6)
+    ]
+    results = await search_router.run_search_batch(queries, pool=None, concurrency=3)
+
+    assert peak == 3
+    assert results[0]["ok"] is True and results[0]["result"]["total_label"] == "0"
+    assert results[1] == {"ok": False, "error": {"status": 400, "detail": "Invalid borough"}}
+    assert all(item["ok"] for item in results[2:])
+
+
+def test_batch_endpoint_limits_size(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    async def no_pool():
+        return None
+
+    async def fake_batch(queries, pool, concurrency=None):
+        return [{"ok": True, "result": {"total": 1, "rows": []}} for _ in queries]
+
+    monkeypatch.setattr(search_router, "run_search_batch", fake_batch)
+    app.dependency_overrides[search_router.get_read_pool] = no_pool
+    try:
+        client = TestClient(app)
+        ok = client.post("/api/search/batch", json={"queries": [{"q": "main st"}, {"borough": "BK"}]})
+        too_many = client.post(
+            "/api/search/batch",
+            json={"queries": [{}] * (search_router.settings.SEARCH_BATCH_MAX_ITEMS + 1)},
+        )
+    finally:
+        app.dependency_overrides.clear()
+    assert ok.status_code == 200 and len(ok.json()["results"]) == 2
+    assert too_many.status_code == 413
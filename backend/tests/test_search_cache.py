@@ -0,0 +1,57 @@
+import pytest
+
+from app.db.refresh import dispatch_refresh
+from app.routers import search as search_router
+from app.utils.cache import TTLCache
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_lru_eviction_and_expiry():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts "b", the least recently used
+    assert cache.get("b") is None
+    clock.now = 11
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["expirations"]) == (1, 2, 1, 1)
+
+
+@pytest.mark.anyio
+async def test_run_search_served_from_cache_until_refresh(fake_pool):
+    pool = fake_pool([])
+    params = dict(
+        q=" 10th st ",
+        borough="Brooklyn",
+        floors_min=None,
+        units_min=None,
+        year_min=None,
+        permits_min_12m=None,
+        sort=None,
+        order=None,
+        limit=10,
+        offset=0,
+        pool=pool,
+    )
+    await search_router.run_search(**params)
+    await search_router.run_search(**{**params, "q": "10th st", "borough": "BK"})
+    assert len(pool.conn.queries) == 1
+
+    dispatch_refresh("mv_property_search")
+    await search_router.run_search(**params)
+    assert len(pool.conn.queries) == 2
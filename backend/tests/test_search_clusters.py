@@ -0,0 +1,46 @@
+from app.routers import search as search_router
+from app.services.clusters import ClusterIndex
+
+# Two lots a block apart in lower Manhattan and one in Staten Island.
+RECORDS = [
+    (-74.0110, 40.7060, 3),
+    (-74.0105, 40.7065, 8),
+    (-74.1502, 40.5795, 1),
+    (None, None, 50),
+]
+NYC = (-74.26, 40.49, -73.70, 40.92)
+
+
+def test_clusters_merge_across_zooms_and_filter_by_viewport():
+    index = ClusterIndex(RECORDS, min_zoom=8, max_zoom=16, cell_px=64)
+    assert index.points == 3
+
+    coarse = index.clusters(NYC, 9)
+    assert sorted(c["count"] for c in coarse) == [1, 2]
+    downtown = next(c for c in coarse if c["count"] == 2)
+    assert downtown["max_permit_count_12m"] == 8
+    assert abs(downtown["lon"] - -74.01075) < 1e-9
+
+    fine = index.clusters(NYC, 22)  # clamped to max_zoom, lots fall apart
+    assert sorted(c["count"] for c in fine) == [1, 1, 1]
+
+    staten_island_only = index.clusters((-74.2, 40.55, -74.1, 40.6), 12)
+    assert [c["count"] for c in staten_island_only] == [1]
+
+
+def test_clusters_endpoint_reports_readiness(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    client = TestClient(app)
+    params = {"bbox": ",".join(str(v) for v in NYC), "zoom": 3}
+    monkeypatch.setattr(search_router, "get_cluster_index", lambda: None)
+    assert client.get("/api/search/clusters", params=params).json() == {"ready": False, "zoom": None, "clusters": []}
+
+    index = ClusterIndex(RECORDS, min_zoom=8, max_zoom=16)
+    monkeypatch.setattr(search_router, "get_cluster_index", lambda: index)
+    data = client.get("/api/search/clusters", params=params).json()
+    assert data["ready"] is True and data["zoom"] == 8
+    assert sum(c["count"] for c in data["clusters"]) == 3
+    assert client.get("/api/search/clusters", params={"bbox": "1,2", "zoom": 8}).status_code == 400
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from app.routers import search as search_router
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _rows(n: int):
+    rows = []
+    for i in range(n):
+        row = {"bbl": f"10000100{i:02d}", "address": f"{i} MAIN ST"}
+        row.update({f"_sort_key_{k}": None for k in range(5)})
+        rows.append(row)
+    return rows
+
+
+async def _search(pool, **overrides):
+    params = dict(
+        q=None,
+        borough="BK",
+        floors_min=None,
+        units_min=None,
+        year_min=None,
+        permits_min_12m=None,
+        sort=None,
+        order=None,
+        limit=2,
+        offset=0,
+        pool=pool,
+    )
+    params.update(overrides)
+    return await search_router.run_search(**params)
+
+
+@pytest.mark.anyio
+async def test_short_first_page_skips_count_query(fake_pool):
+    pool = fake_pool(_rows(1))
+    result = await _search(pool, count_mode="exact")
+    assert result.total == 1
+    assert len(pool.conn.queries) == 1
+
+
+@pytest.mark.anyio
+async def test_capped_count_reports_lower_bound(fake_pool):
+    pool = fake_pool(_rows(3), fetchval_result=11)
+    result = await _search(pool, count_mode="capped", count_cap=10)
+    assert (result.total, result.total_label) == (10, "10+")
+    count_sql, count_args = pool.conn.queries[-1]
+    assert "LIMIT $2" in count_sql
+    assert count_args == ("BK", 11)
+
+
+@pytest.mark.anyio
+async def test_estimate_count_reads_planner_rows(fake_pool):
+    plan = json.dumps([{"Plan": {"Node Type": "Seq Scan", "Plan Rows": 4321}}])
+    pool = fake_pool(_rows(3), fetchval_result=plan)
+    result = await _search(pool, count_mode="estimate")
+    assert (result.total, result.total_label) == (4321, "~4321")
+    assert pool.conn.queries[-1][0].startswith("EXPLAIN (FORMAT JSON)")
+
+
+@pytest.mark.anyio
+async def test_none_count_skips_total(fake_pool):
+    pool = fake_pool(_rows(3))
+    result = await _search(pool, count_mode="none")
+    assert result.total is None
+    assert len(pool.conn.queries) == 1
+
+
+@pytest.mark.anyio
+async def test_none_count_stays_null_on_short_first_page(fake_pool):
+    result = await _search(fake_pool(_rows(1)), count_mode="none")
+    assert (result.total, result.total_label) == (None, None)
+
+
+@pytest.mark.anyio
+async def test_invalid_count_mode_is_rejected(fake_pool):
+    with pytest.raises(HTTPException) as exc:
+        await _search(fake_pool([]), count_mode="fast")
+    assert exc.value.status_code == 400
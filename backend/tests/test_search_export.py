@@ -0,0 +1,93 @@
+import json
+from datetime import date
+
+import pytest
+
+from app.db.catalog import SCHEMA
+from app.routers import search as search_router
+
+ROWS = [
+    {
+        "bbl": f"30000100{i:02d}",
+        "address": f"{i} FULTON ST",
+        "borough_full": "Brooklyn",
+        "zonedist1": "R6",
+        "yearbuilt": 1931,
+        "unitsres": 4,
+        "unitstotal": 4,
+        "permit_count_12m": 6,
+        "last_permit_date": date(2024, 3, 1),
+    }
+    for i in range(5)
+]
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
+
+
+@pytest.mark.anyio
+async def test_export_streams_ndjson_in_batches_without_limit(fake_pool):
+    pool = fake_pool(ROWS)
+    plans = search_router.plan_export(None, "Brooklyn", None, 5, None, None)
+    chunks = await _collect(search_router.stream_export(pool, plans, "ndjson", batch_size=2))
+
+    assert len(chunks) == 3  # 2 + 2 + 1 rows
+    lines = "".join(chunks).splitlines()
+    assert json.loads(lines[0])["last_permit_date"] == "2024-03-01"
+    assert len(lines) == 5
+    sql, args = pool.conn.queries[0]
+    assert "LIMIT" not in sql and "ORDER BY ps.permit_count_12m DESC" in sql
+    assert args == ("BK", 5)
+
+
+@pytest.mark.anyio
+async def test_export_csv_header_and_stops_when_client_disconnects(fake_pool):
+    pool = fake_pool(ROWS)
+    plans = search_router.plan_export(None, None, None, None, None, None)
+    calls = []
+
+    async def is_disconnected():
+        calls.append(1)
+        return len(calls) > 1
+
+    chunks = await _collect(
+        search_router.stream_export(pool, plans, "csv", is_disconnected=is_disconnected, batch_size=2)
+    )
+    assert chunks[0] == ",".join(search_router.EXPORT_FIELDS) + "\n"
+    assert chunks[1].splitlines()[0].startswith("3000010000,0 FULTON ST,Brooklyn,R6,1931")
+    assert len(chunks) == 2
+
+
+@pytest.mark.anyio
+async def test_export_prefers_structured_address_plan_when_it_matches(fake_pool, monkeypatch):
+    monkeypatch.setitem(SCHEMA._columns, search_router.TABLE_SEARCH, frozenset({"houseno", "street"}))
+    pool = fake_pool(ROWS, fetchval_result=1)
+    plans = search_router.plan_export("5 Fulton St", None, None, None, None, None)
+    assert len(plans) == 2
+    await _collect(search_router.stream_export(pool, plans, "ndjson"))
+    probe_sql, _ = pool.conn.queries[0]
+    export_sql, _ = pool.conn.queries[1]
+    assert "LIMIT 1" in probe_sql
+    assert "ps.houseno" in export_sql
+
+
+def test_export_endpoint_rejects_unknown_format():
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    async def no_pool():
+        return None
+
+    app.dependency_overrides[search_router.get_read_pool] = no_pool
+    try:
+        response = TestClient(app).get("/api/search/export", params={"format": "xlsx"})
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 400
@@ -0,0 +1,60 @@
+import pytest
+
+from app.routers import search as search_router
+from app.services.snapshot import PropertySnapshot
+
+GROUPED_ROWS = [
+    {"borough": "MN", "decade": None, "permit_band": None, "grouping_id": 0b011, "n": 3},
+    {"borough": "BK", "decade": None, "permit_band": None, "grouping_id": 0b011, "n": 1},
+    {"borough": None, "decade": 1920, "permit_band": None, "grouping_id": 0b101, "n": 2},
+    {"borough": None, "decade": None, "permit_band": None, "grouping_id": 0b101, "n": 2},
+    {"borough": None, "decade": None, "permit_band": 0, "grouping_id": 0b110, "n": 1},
+    {"borough": None, "decade": None, "permit_band": 2, "grouping_id": 0b110, "n": 3},
+    {"borough": None, "decade": None, "permit_band": None, "grouping_id": 0b111, "n": 4},
+]
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_facets_use_one_grouping_sets_query_and_cache_by_filters(fake_pool):
+    pool = fake_pool(GROUPED_ROWS)
+    result = await search_router.run_facets("main", "Brooklyn", 1900, None, pool)
+
+    assert len(pool.conn.queries) == 1
+    sql, args = pool.conn.queries[0]
+    assert "GROUPING SETS ((borough), (decade), (permit_band), ())" in sql
+    assert args == ("%main%", "%main%", "%main%", "BK", 1900)
+
+    assert result["total"] == 4
+    assert result["borough"][0] == {"value": "MN", "count": 3}
+    assert {"value": "SI", "count": 0} in result["borough"]
+    assert result["decade_built"] == [{"value": "1920s", "count": 2}, {"value": "unknown", "count": 2}]
+    assert [b["count"] for b in result["permit_activity"]] == [1, 0, 3, 0, 0]
+
+    await search_router.run_facets(" main ", "BK", 1900, None, pool)
+    assert len(pool.conn.queries) == 1
+
+
+@pytest.mark.anyio
+async def test_facets_from_memory_snapshot(fake_pool, monkeypatch):
+    from test_search_snapshot import RECORDS
+
+    monkeypatch.setattr(search_router, "_memory_engine_enabled", lambda: True)
+    monkeypatch.setattr(search_router, "get_property_snapshot", lambda: PropertySnapshot(RECORDS))
+    pool = fake_pool([])
+    result = await search_router.run_facets(None, None, None, None, pool)
+
+    assert pool.conn.queries == []
+    assert result["total"] == 4
+    assert [b["count"] for b in result["borough"]] == [2, 0, 2, 0, 0]
+    assert result["decade_built"] == [
+        {"value": "1920s", "count": 1},
+        {"value": "1950s", "count": 1},
+        {"value": "1980s", "count": 1},
+        {"value": "unknown", "count": 1},
+    ]
+    assert [b["count"] for b in result["permit_activity"]] == [1, 1, 2, 0, 0]
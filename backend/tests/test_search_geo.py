@@ -0,0 +1,76 @@
+import pytest
+from fastapi import HTTPException
+
+from app.routers import search as search_router
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _params(pool, **overrides):
+    params = dict(
+        q=None,
+        borough=None,
+        floors_min=None,
+        units_min=None,
+        year_min=None,
+        permits_min_12m=None,
+        sort=None,
+        order=None,
+        limit=10,
+        offset=0,
+        pool=pool,
+    )
+    params.update(overrides)
+    return params
+
+
+@pytest.mark.anyio
+async def test_bbox_combines_with_filters_as_index_predicate(fake_pool):
+    pool = fake_pool([])
+    await search_router.run_search(**_params(pool, borough="BK", year_min=1900), bbox="-74.05,40.57,-73.83,40.74")
+    sql, args = pool.conn.queries[0]
+    assert "ps.geom_4326 && ST_MakeEnvelope($3, $4, $5, $6, 4326)" in sql
+    assert args[:6] == ("BK", 1900, -74.05, 40.57, -73.83, 40.74)
+
+
+@pytest.mark.anyio
+async def test_radius_filters_by_meters_and_orders_nearest_first(fake_pool):
+    pool = fake_pool([])
+    await search_router.run_search(**_params(pool), radius="40.7128,-74.0060,500")
+    sql, args = pool.conn.queries[0]
+    assert "ps.geom_4326 && ST_MakeEnvelope($3, $4, $5, $6, 4326)" in sql
+    assert "ST_DWithin(ps.geom_4326::geography, ST_SetSRID(ST_MakePoint($1, $2), 4326)::geography, $7)" in sql
+    assert "ORDER BY ps.geom_4326 <-> ST_SetSRID(ST_MakePoint($1, $2), 4326) ASC" in sql
+    assert args[:2] == (-74.006, 40.7128) and args[6] == 500.0
+    # The prefilter box is slightly larger than the circle in both axes.
+    assert args[2] < -74.006 - 500 / 111320 and args[3] == pytest.approx(40.7128 - 500 / 111320)
+
+    pool = fake_pool([])
+    await search_router.run_search(**_params(pool, sort="last_permit_date"), radius="40.7128,-74.0060,500")
+    assert "ORDER BY ps.last_permit_date DESC" in pool.conn.queries[0][0]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"bbox": "1,2,3"},
+        {"bbox": "-73,40.8,-74,40.5"},
+        {"bbox": "a,b,c,d"},
+        {"radius": "40.7,-74.0,0"},
+        {"radius": "40.7,-74.0,100000"},
+    ],
+)
+@pytest.mark.anyio
+async def test_malformed_geo_filters_are_rejected(fake_pool, kwargs):
+    with pytest.raises(HTTPException) as exc:
+        await search_router.run_search(**_params(fake_pool([])), **kwargs)
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_distance_sort_requires_radius(fake_pool):
+    with pytest.raises(HTTPException):
+        await search_router.run_search(**_params(fake_pool([]), sort="distance"))
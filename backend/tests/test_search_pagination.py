@@ -0,0 +1,97 @@
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+
+from app.routers import search as search_router
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _row(bbl: str, permits: int, last_permit: date | None):
+    return {
+        "bbl": bbl,
+        "address": f"{bbl[-3:]} MAIN ST",
+        "permit_count_12m": permits,
+        "last_permit_date": last_permit,
+        "_sort_key_0": permits,
+        "_sort_key_1": last_permit,
+        "_sort_key_2": None,
+        "_sort_key_3": f"{bbl[-3:]} MAIN ST",
+        "_sort_key_4": int(bbl),
+    }
+
+
+async def _search(pool, **overrides):
+    params = dict(
+        q=None,
+        borough=None,
+        floors_min=None,
+        units_min=None,
+        year_min=None,
+        permits_min_12m=None,
+        sort=None,
+        order=None,
+        limit=2,
+        offset=0,
+        pool=pool,
+    )
+    params.update(overrides)
+    return await search_router.run_search(**params)
+
+
+def test_cursor_round_trip_preserves_dates():
+    keys = [("ps.last_permit_date", "desc", False), ("ps.bbl", "asc", False)]
+    token = search_router.encode_cursor(keys, [date(2024, 5, 1), 1000010001])
+    assert search_router.decode_cursor(token, keys) == [date(2024, 5, 1), 1000010001]
+
+
+def test_cursor_rejects_mismatched_sort():
+    keys = [("ps.last_permit_date", "desc", False), ("ps.bbl", "asc", False)]
+    token = search_router.encode_cursor(keys, [None, 1000010001])
+    with pytest.raises(HTTPException) as exc:
+        search_router.decode_cursor(token, [("ps.bbl", "asc", False)])
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_run_search_emits_next_cursor_and_keyset_predicate(fake_pool):
+    rows = [
+        _row("1000010001", 5, date(2024, 5, 1)),
+        _row("1000010002", 4, None),
+        _row("1000010003", 3, None),
+    ]
+    first = await _search(fake_pool(rows))
+    assert [r.bbl for r in first.rows] == ["1000010001", "1000010002"]
+    assert first.next_cursor
+
+    pool = fake_pool(rows[2:])
+    second = await _search(pool, cursor=first.next_cursor)
+    assert second.next_cursor is None
+    rows_sql, rows_args = pool.conn.queries[0]
+    assert "ps.permit_count_12m < $" in rows_sql
+    assert "ps.last_permit_date IS NULL" in rows_sql
+    assert rows_args[-1] == 0
+    assert 1000010002 in rows_args
+
+
+def test_keyset_predicate_leads_with_a_bound_on_the_first_sort_key():
+    keys = [("ps.permit_count_12m", "desc", False), ("ps.bbl", "asc", False)]
+    args = []
+
+    def add(value):
+        args.append(value)
+        return f"${len(args)}"
+
+    sql = search_router._keyset_predicate(keys, [4, 1000010002], add)
+    assert sql.startswith("((ps.permit_count_12m <= $1 OR ps.permit_count_12m IS NULL) AND (")
+    assert args == [4, 1000010002]
+    # Inside the NULL tail the bound is a plain IS NULL index condition.
+    assert search_router._keyset_predicate(keys, [None, 1000010002], add).startswith(
+        "(ps.permit_count_12m IS NULL AND ("
+    )
+    nulls_first = [("ps.yearbuilt", "asc", True), ("ps.bbl", "asc", False)]
+    assert search_router._keyset_predicate(nulls_first, [1950, 1], add).startswith("(ps.yearbuilt >= $")
@@ -0,0 +1,118 @@
+from datetime import date
+
+import pytest
+
+from app.routers import search as search_router
+from app.services.snapshot import PropertySnapshot
+
+RECORDS = [
+    {"bbl_raw": 1000010001, "bbl": "1000010001", "address": "1 BROADWAY", "borough": "MN", "borough_full": "Manhattan",
+     "zonedist1": "C5-5", "yearbuilt": 1920, "unitsres": 10, "unitstotal": 12, "permit_count_12m": 4,
+     "last_permit_date": date(2024, 5, 1)},
+    {"bbl_raw": 1000010002, "bbl": "1000010002", "address": "2 BROADWAY", "borough": "MN", "borough_full": "Manhattan",
+     "zonedist1": None, "yearbuilt": None, "unitsres": None, "unitstotal": None, "permit_count_12m": 4,
+     "last_permit_date": date(2024, 6, 1)},
+    {"bbl_raw": 3000010001, "bbl": "3000010001", "address": "5 FULTON ST", "borough": "BK", "borough_full": "Brooklyn",
+     "zonedist1": "R6", "yearbuilt": 1985, "unitsres": 3, "unitstotal": 3, "permit_count_12m": None,
+     "last_permit_date": None},
+    {"bbl_raw": 3000010002, "bbl": "3000010002", "address": "7 FULTON ST", "borough": "BK", "borough_full": "Brooklyn",
+     "zonedist1": "R6", "yearbuilt": 1950, "unitsres": 2, "unitstotal": 2, "permit_count_12m": 1,
+     "last_permit_date": date(2023, 1, 1)},
+    {"bbl_raw": 3000010003, "bbl": "3000010003", "address": "PIER 6", "borough": "BK", "borough_full": "Brooklyn",
+     "zonedist1": None, "yearbuilt": 2000, "unitsres": 0, "unitstotal": 0, "permit_count_12m": 9,
+     "last_permit_date": date(2024, 1, 1)},
+]
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _bbls(rows):
+    return [row["bbl"] for row in rows]
+
+
+def test_snapshot_matches_curated_sql_order_and_filters():
+    snapshot = PropertySnapshot(RECORDS)
+    total, rows = snapshot.search(None, None, None, None, "desc", 10, 0)
+    # "PIER 6" fails the leading-digit filter; ties on permits fall through to last_permit_date.
+    assert total == 4
+    assert _bbls(rows) == ["1000010002", "1000010001", "3000010002", "3000010001"]
+
+    total, rows = snapshot.search("BK", 1900, None, None, "desc", 10, 0)
+    assert (total, _bbls(rows)) == (2, ["3000010002", "3000010001"])
+
+    total, rows = snapshot.search(None, None, 2, None, "desc", 10, 0)
+    assert total == 2  # NULL permit counts never satisfy the minimum
+
+
+def test_snapshot_explicit_sort_nulls_and_paging():
+    snapshot = PropertySnapshot(RECORDS)
+    _, rows = snapshot.search(None, None, None, "yearbuilt", "asc", 10, 0)
+    assert _bbls(rows) == ["1000010002", "1000010001", "3000010002", "3000010001"]  # NULLS FIRST ascending
+
+    total, rows = snapshot.search(None, None, None, "last_permit_date", "desc", 2, 1)
+    # limit+1 rows from the offset, so callers can tell whether another page exists.
+    assert total == 4
+    assert _bbls(rows) == ["1000010001", "3000010002", "3000010001"]
+    assert rows[0]["last_permit_date"] == date(2024, 5, 1)
+    assert rows[2]["permit_count_12m"] is None
+
+
+def test_snapshot_tiebreaks_follow_database_address_rank_and_numeric_bbl():
+    tie = {"borough": "MN", "permit_count_12m": 1, "last_permit_date": None, "yearbuilt": None}
+    snapshot = PropertySnapshot([
+        {**tie, "bbl_raw": 1000000000, "bbl": "1000000000", "address": "9 broadway", "address_rank": 1},
+        {**tie, "bbl_raw": 999999999, "bbl": "999999999", "address": "9 broadway", "address_rank": 1},
+        {**tie, "bbl_raw": 1000000001, "bbl": "1000000001", "address": "9 Broadway", "address_rank": 2},
+    ])
+    _, rows = snapshot.search(None, None, None, None, "desc", 10, 0)
+    # The loaded rank (e.g. en_US, "b" before "B") wins over codepoint order;
+    # bbl ties compare as numbers, not strings.
+    assert _bbls(rows) == ["999999999", "1000000000", "1000000001"]
+
+
+@pytest.mark.anyio
+async def test_memory_engine_serves_filter_only_queries(fake_pool, monkeypatch):
+    snapshot = PropertySnapshot(RECORDS)
+    monkeypatch.setattr(search_router, "_memory_engine_enabled", lambda: True)
+    monkeypatch.setattr(search_router, "get_property_snapshot", lambda: snapshot)
+    pool = fake_pool([])
+    params = dict(
+        q=None,
+        borough=None,
+        floors_min=None,
+        units_min=None,
+        year_min=None,
+        permits_min_12m=None,
+        sort="permit_count_12m",
+        order="desc",
+        limit=2,
+        offset=0,
+        pool=pool,
+    )
+    result = await search_router.run_search(**params)
+    assert pool.conn.queries == []
+    assert (result.total, result.total_label) == (4, "4")
+    assert [row.bbl for row in result.rows] == ["1000010002", "1000010001"]
+
+    # The cursor decodes against the SQL sort keys, so the next page continues on Postgres.
+    sort_keys = [
+        ("ps.permit_count_12m", "desc", False),
+        ("ps.permit_count_12m", "desc", False),
+        ("ps.last_permit_date", "desc", False),
+        ("ps.yearbuilt", "desc", False),
+        ("ps.address", "asc", False),
+        ("ps.bbl", "asc", False),
+    ]
+    assert search_router.decode_cursor(result.next_cursor, sort_keys)[-1] == 1000010001
+    await search_router.run_search(**params, cursor=result.next_cursor)
+    assert "ORDER BY" in pool.conn.queries[0][0]
+    sql_queries = len(pool.conn.queries)
+
+    capped = await search_router.run_search(**{**params, "limit": 1}, count_mode="capped", count_cap=2)
+    assert capped.total_label == "2+"
+    assert len(pool.conn.queries) == sql_queries
+    await search_router.run_search(**{**params, "q": "broadway"})
+    assert len(pool.conn.queries) > sql_queries
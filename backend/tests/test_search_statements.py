@@ -0,0 +1,46 @@
+import pytest
+
+from app.db.statements import StatementRegistry
+from app.routers import search as search_router
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_registry_runs_on_connection_cache_and_tracks_stats(fake_pool):
+    registry = StatementRegistry()
+    pool = fake_pool([{"x": 1}])
+    conn = pool.conn
+    shape = ("rows", frozenset({"borough"}), "sort=default:desc", "offset")
+    for _ in range(3):
+        await registry.fetch(conn, shape, "SELECT $1::int AS x", 1)
+    # Statements go through conn.fetch, so asyncpg's per-connection cache owns them.
+    assert conn.prepared == []
+    assert conn.queries == [("SELECT $1::int AS x", (1,))] * 3
+    [stat] = registry.stats()
+    assert stat["shape"] == "rows | borough | sort=default:desc | offset"
+    assert (stat["calls"], stat["rows"]) == (3, 3)
+
+
+@pytest.mark.anyio
+async def test_run_search_keeps_sql_text_stable_across_parameter_values(fake_pool):
+    pool = fake_pool([])
+    for year in (1900, 1950, 2000):
+        await search_router.run_search(
+            q=None,
+            borough="QN",
+            floors_min=None,
+            units_min=None,
+            year_min=year,
+            permits_min_12m=None,
+            sort=None,
+            order=None,
+            limit=5,
+            offset=0,
+            pool=pool,
+        )
+    assert len(pool.conn.queries) == 3
+    assert len({sql for sql, _ in pool.conn.queries}) == 1
@@ -0,0 +1,47 @@
+from app.routers import search as search_router
+from app.services import suggest as suggest_service
+from app.services.suggest import AddressSuggestIndex
+
+RECORDS = [
+    ("1000477501", "120 BROADWAY", 3),
+    ("1000150001", "1 BROADWAY", 9),
+    ("3012340001", "12 BROOKLYN AVENUE", 1),
+    ("1005550001", "120 BOWERY", 0),
+]
+
+
+def test_suggest_matches_address_and_street_prefixes_by_permit_activity():
+    index = AddressSuggestIndex(RECORDS)
+    assert [s["bbl"] for s in index.suggest("broadw")] == ["1000150001", "1000477501"]
+    assert [s["address"] for s in index.suggest("120 b")] == ["120 BROADWAY", "120 BOWERY"]
+    assert index.suggest("br", limit=1)[0]["address"] == "1 BROADWAY"
+    assert index.suggest("zzz") == []
+
+
+def test_suggest_ranks_broad_prefixes_at_build_time(monkeypatch):
+    monkeypatch.setattr(suggest_service, "SCAN_LIMIT", 1)
+    index = AddressSuggestIndex(RECORDS)
+    assert {"", "B"} <= set(index._ranked)
+    ranked = dict(index._ranked)
+    for text in ("", "b", "br", "12"):
+        lo, hi = index._range(text.upper())
+        # The precomputed lists agree with a straight scan of the range.
+        assert index._top_rows(text.upper(), lo, hi) == index._scan(lo, hi)
+    # Requests only read what the build computed.
+    assert index._ranked == ranked
+
+
+def test_suggest_endpoint_reports_readiness(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    client = TestClient(app)
+    monkeypatch.setattr(search_router, "get_suggest_index", lambda: None)
+    assert client.get("/api/search/suggest", params={"q": "12"}).json() == {"ready": False, "suggestions": []}
+
+    index = AddressSuggestIndex(RECORDS)
+    monkeypatch.setattr(search_router, "get_suggest_index", lambda: index)
+    data = client.get("/api/search/suggest", params={"q": "12", "limit": 2}).json()
+    assert data["ready"] is True
+    assert [s["address"] for s in data["suggestions"]] == ["120 BROADWAY", "12 BROOKLYN AVENUE"]
@@ -0,0 +1,56 @@
+import pytest
+
+from app.routers import search as search_router
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def test_classify_query_routes_bbls_boroughs_and_addresses():
+    assert search_router.classify_query("1012700008") == ("bbl", 1012700008)
+    assert search_router.classify_query("3-00123") == ("bbl_prefix", (3001230000, 3001239999))
+    assert search_router.classify_query("Staten Island") == ("borough", "SI")
+    assert search_router.classify_query("bk") == ("borough", "BK")
+    assert search_router.classify_query("120 Broadway") == ("address", "120 BROADWAY")
+
+
+async def _search(pool, q, **overrides):
+    params = dict(
+        q=q,
+        borough=None,
+        floors_min=None,
+        units_min=None,
+        year_min=None,
+        permits_min_12m=None,
+        sort=None,
+        order=None,
+        limit=5,
+        offset=0,
+        pool=pool,
+        match_mode="trigram",
+    )
+    params.update(overrides)
+    return await search_router.run_search(**params)
+
+
+@pytest.mark.anyio
+async def test_trigram_mode_orders_by_knn_distance(fake_pool):
+    pool = fake_pool([])
+    await _search(pool, "Broadway")
+    sql, args = pool.conn.queries[0]
+    assert "ps.address_key % $1" in sql
+    assert "ORDER BY ps.address_key <-> $1 ASC NULLS LAST" in sql
+    assert "ILIKE" not in sql and "unaccent" not in sql
+    assert args[0] == "BROADWAY"
+
+
+@pytest.mark.anyio
+async def test_trigram_mode_uses_equality_for_bbl(fake_pool):
+    pool = fake_pool([])
+    await _search(pool, "1012700008")
+    sql, args = pool.conn.queries[0]
+    assert "ps.bbl = $1::bigint" in sql
+    assert "<->" not in sql
+    assert args[0] == 1012700008
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from app.routers import search as search_router
+from app.utils.singleflight import SingleFlight
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_concurrent_identical_calls_share_one_execution():
+    flights = SingleFlight()
+    executions = 0
+
+    async def work():
+        nonlocal executions
+        executions += 1
+        await asyncio.sleep(0.01)
+        return executions
+
+    results = await asyncio.gather(*(flights.run("k", work) for _ in range(5)), flights.run("other", work))
+    assert results[:5] == [results[0]] * 5
+    assert executions == 2
+    assert flights.stats() == {"calls": 6, "executions": 2, "deduplicated": 4, "in_flight": 0}
+
+    # Nothing is remembered after the call completes.
+    await flights.run("k", work)
+    assert executions == 3
+
+
+@pytest.mark.anyio
+async def test_errors_are_shared_and_cancelled_leader_hands_over():
+    flights = SingleFlight()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise ValueError("db down")
+
+    outcomes = await asyncio.gather(flights.run("k", boom), flights.run("k", boom), return_exceptions=True)
+    assert all(isinstance(o, ValueError) for o in outcomes)
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    leader = asyncio.ensure_future(flights.run("k", slow))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(flights.run("k", slow))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await follower == "done"
+
+
+@pytest.mark.anyio
+async def test_identical_searches_share_one_query(fake_pool):
+    pool = fake_pool([])
+    acquired = 0
+    original_acquire = pool.acquire
+
+    def counting_acquire():
+        nonlocal acquired
+        acquired += 1
+        return original_acquire()
+
+    pool.acquire = counting_acquire
+    params = dict(
+        q="main st",
+        borough=None,
+        floors_min=None,
+        units_min=None,
+        year_min=None,
+        permits_min_12m=None,
+        sort=None,
+        order=None,
+        limit=10,
+        offset=0,
+        pool=pool,
+    )
+    await asyncio.gather(*(search_router.run_search(**params) for _ in range(4)))
+    assert acquired == 1
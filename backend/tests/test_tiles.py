@@ -0,0 +1,86 @@
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.db.data_version import DATA_VERSION
+from app.db.refresh import dispatch_refresh
+from app.routers import tiles
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def _clear_tile_cache(monkeypatch):
+    tiles.TILE_CACHE.clear()
+    monkeypatch.setattr(DATA_VERSION, "_value", "v1")
+    monkeypatch.setattr(DATA_VERSION, "_expires_at", time.monotonic() + 3600)
+    yield
+
+
+@pytest.mark.anyio
+async def test_tiles_are_cached_per_data_version(fake_pool):
+    pool = fake_pool([], fetchval_result=b"\x1a\x02mvt")
+    assert await tiles.render_tile(pool, 16, 19298, 24633) == b"\x1a\x02mvt"
+    assert await tiles.render_tile(pool, 16, 19298, 24633) == b"\x1a\x02mvt"
+    assert len(pool.conn.queries) == 1
+    sql, args = pool.conn.queries[0]
+    assert "ST_AsMVT" in sql and "DISTINCT ON" not in sql
+    assert "&& bounds.buffered_4326" in sql
+    assert args == (16, 19298, 24633)
+
+    dispatch_refresh("mv_property_search")
+    await tiles.render_tile(pool, 16, 19298, 24633)
+    assert len(pool.conn.queries) == 2
+
+    # A new data version (e.g. read by another worker first) never reuses old tiles.
+    DATA_VERSION._value = "v2"
+    await tiles.render_tile(pool, 16, 19298, 24633)
+    assert len(pool.conn.queries) == 3
+
+
+@pytest.mark.anyio
+async def test_low_zoom_tiles_thin_points_per_grid_cell(fake_pool):
+    pool = fake_pool([], fetchval_result=b"")
+    await tiles.render_tile(pool, 10, 301, 385)
+    sql, args = pool.conn.queries[0]
+    assert "DISTINCT ON (cx, cy)" in sql
+    assert args[3] == pytest.approx(tiles.thinning_cell_meters(10))
+    assert tiles.thinning_cell_meters(9) == pytest.approx(2 * tiles.thinning_cell_meters(10))
+
+
+@pytest.mark.anyio
+async def test_out_of_range_tile_is_rejected(fake_pool):
+    with pytest.raises(HTTPException) as exc:
+        await tiles.render_tile(fake_pool([]), 2, 4, 0)
+    assert exc.value.status_code == 400
+
+
+def test_tile_endpoint_serves_mvt(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    async def fake_render(pool, z, x, y):
+        return b"tile"
+
+    async def no_pool():
+        return None
+
+    monkeypatch.setattr(tiles, "render_tile", fake_render)
+    app.dependency_overrides[tiles.get_read_pool] = no_pool
+    try:
+        client = TestClient(app)
+        response = client.get("/tiles/14/4825/6156.mvt")
+        revalidated = client.get("/tiles/14/4825/6156.mvt", headers={"If-None-Match": response.headers["etag"]})
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 200
+    assert response.headers["content-type"] == tiles.MVT_MEDIA_TYPE
+    assert response.headers["cache-control"] == f"public, max-age={tiles.settings.TILE_MAX_AGE}"
+    assert "x-data-version" not in response.headers
+    assert response.content == b"tile"
+    assert revalidated.status_code == 304
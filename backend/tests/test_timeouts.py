@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.db.statements import StatementRegistry
+from app.db.timeouts import current_statement_timeout, statement_timeout
+from app.routers import search as search_router
+from app.utils.cancellation import CLIENT_CLOSED_REQUEST, cancel_on_disconnect
+from tests.conftest import FakeConn, FakePool
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_statement_budget_reaches_asyncpg_calls():
+    conn = FakeConn([{"x": 1}])
+    registry = StatementRegistry()
+
+    await registry.fetch(conn, "q", "SELECT 1")
+    with statement_timeout(1500):
+        assert current_statement_timeout() == 1.5
+        await registry.fetch(conn, "q", "SELECT 1")
+        # Tasks spawned inside the block inherit the budget.
+        await asyncio.ensure_future(registry.fetchval(conn, "q", "SELECT 1"))
+    assert current_statement_timeout() is None
+    assert conn.timeouts == [None, 1.5, 1.5]
+
+
+class _Request:
+    method = "GET"
+
+    def __init__(self, disconnect_after: int):
+        self.url = type("U", (), {"path": "/api/search"})()
+        self.polls = 0
+        self.disconnect_after = disconnect_after
+
+    async def is_disconnected(self):
+        self.polls += 1
+        return self.polls > self.disconnect_after
+
+
+@pytest.mark.anyio
+async def test_cancel_on_disconnect_cancels_the_query():
+    cancelled = asyncio.Event()
+
+    async def slow_query():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(HTTPException) as exc:
+        await cancel_on_disconnect(_Request(disconnect_after=1), slow_query(), poll_interval=0.01)
+    assert exc.value.status_code == CLIENT_CLOSED_REQUEST
+    await asyncio.wait_for(cancelled.wait(), 1)
+
+    async def fast_query():
+        return 42
+
+    assert await cancel_on_disconnect(_Request(disconnect_after=100), fast_query(), poll_interval=0.01) == 42
+
+
+@pytest.mark.anyio
+async def test_search_timeout_maps_to_504():
+    pool = FakePool([])
+
+    async def timed_out(sql, *args, timeout=None):
+        raise asyncio.TimeoutError
+
+    pool.conn.fetch = timed_out
+    with statement_timeout(10):
+        with pytest.raises(HTTPException) as exc:
+            await search_router.run_search(
+                q="broadway",
+                borough=None,
+                floors_min=None,
+                units_min=None,
+                year_min=None,
+                permits_min_12m=None,
+                sort=None,
+                order="desc",
+                limit=10,
+                offset=0,
+                pool=pool,
+            )
+    assert exc.value.status_code == 504
@@ -14,6 +14,9 @@ do
   psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f "$f"
 done
 
+# Running API workers re-read view columns (app.db.refresh.REFRESH_CHANNEL).
+psql "$DATABASE_URL" -c "NOTIFY property_search_refresh, 'migrations';"
+
 echo "Sanity:"
 psql "$DATABASE_URL" -c "SELECT COUNT(*) AS permits FROM vw_permits_norm;"
 psql "$DATABASE_URL" -c "SELECT COUNT(*) AS violations FROM vw_violations_norm;"
@@ -734,6 +734,7 @@ def normalize_row(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
 
     payload: Dict[str, Any] = {
         "bbl": bbl,
+        "bbl_norm": int(bbl),
         "job_number": job_number,
         "borough": borough_clean,
         "job_type": row.get("job_type") or row.get("jobtype"),
@@ -761,6 +762,7 @@ def upsert_records(conn, records: Iterable[Dict[str, Any]]) -> Tuple[int, int]:
         INSERT INTO dob_permits (
             job_number,
             bbl,
+            bbl_norm,
             borough,
             job_type,
             status,
@@ -778,6 +780,7 @@ def upsert_records(conn, records: Iterable[Dict[str, Any]]) -> Tuple[int, int]:
         VALUES (
             %(job_number)s,
             %(bbl)s,
+            %(bbl_norm)s,
             %(borough)s,
             %(job_type)s,
             %(status)s,
@@ -794,6 +797,7 @@ def upsert_records(conn, records: Iterable[Dict[str, Any]]) -> Tuple[int, int]:
         )
         ON CONFLICT (job_number) DO UPDATE SET
             bbl = COALESCE(EXCLUDED.bbl, dob_permits.bbl),
+            bbl_norm = COALESCE(EXCLUDED.bbl_norm, dob_permits.bbl_norm),
             borough = COALESCE(EXCLUDED.borough, dob_permits.borough),
             job_type = COALESCE(EXCLUDED.job_type, dob_permits.job_type),
             status = EXCLUDED.status,
@@ -0,0 +1,32 @@
+BEGIN;
+
+-- Typed BBL for per-lot permit lookups; ingestion fills it on upsert.
+ALTER TABLE dob_permits ADD COLUMN IF NOT EXISTS bbl_norm bigint;
+
+-- Backfill (idempotent: re-running picks up rows written before ingestion set it).
+-- Trailing ".000…" is dropped first, as the old query-time cast did.
+UPDATE dob_permits
+SET bbl_norm = n.bbl::bigint
+FROM (
+  SELECT job_number, public.bbl_normalize(regexp_replace(bbl, '\..*', '')) AS bbl
+  FROM dob_permits
+  WHERE bbl_norm IS NULL AND bbl IS NOT NULL
+) n
+WHERE dob_permits.job_number = n.job_number
+  AND n.bbl ~ '^[1-5][0-9]{9}$';
+
+COMMIT;
+
+-- Built outside the backfill transaction and CONCURRENTLY, so writes to dob_permits
+-- keep flowing while it builds (apply with plain psql -f, not --single-transaction).
+-- Equality on bbl_norm plus the recent-permits sort expression, NULLS placement
+-- included (RECENT_PERMIT_DATE_SQL in backend/app/services/property_documents.py),
+-- so "newest N permits for a lot" is an index scan with no sort.
+DROP INDEX CONCURRENTLY IF EXISTS idx_dob_permits_bbl_norm_issued;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_dob_permits_bbl_norm_recent
+  ON dob_permits (
+    bbl_norm,
+    (COALESCE(issuance_date, filing_date, filed_date, status_date, latest_status_date)) DESC NULLS LAST
+  );
+
+ANALYZE dob_permits;
@@ -0,0 +1,17 @@
+BEGIN;
+
+-- Ready-to-serve /property/{bbl} responses, one row per lot.
+-- Written by ingestion (app.ingestion.property_documents) for the lots each run touches.
+CREATE TABLE IF NOT EXISTS property_documents (
+  bbl       bigint PRIMARY KEY,
+  doc       jsonb NOT NULL,
+  built_at  timestamptz NOT NULL DEFAULT now()
+);
+
+-- Incremental rebuilds find touched lots by updated_at.
+CREATE INDEX IF NOT EXISTS idx_pluto_updated_at ON pluto (updated_at);
+CREATE INDEX IF NOT EXISTS idx_dob_permits_updated_at ON dob_permits (updated_at);
+
+COMMIT;
+
+-- Populate: cd backend && python -m app.ingestion.orchestrator property_documents
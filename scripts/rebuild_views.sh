@@ -3,3 +3,7 @@ set -euo pipefail
 psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f sql/joins/mv_permit_agg.sql
 psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f sql/joins/mv_property_search.sql
 echo "Views rebuilt."
+# Record the rebuild in ingestion_watermarks so HTTP ETags (app.db.data_version) move on.
+psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f sql/refresh_views_watermark.sql
+# Running API workers drop caches and re-read view columns (app.db.refresh.REFRESH_CHANNEL).
+psql "$DATABASE_URL" -c "NOTIFY property_search_refresh, 'mv_property_search';"
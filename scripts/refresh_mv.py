@@ -1,6 +1,11 @@
 import os, asyncio, asyncpg
+from pathlib import Path
 
 SQL = "REFRESH MATERIALIZED VIEW CONCURRENTLY mv_property_search;"
+# Tells running API workers to drop caches built from the view (app.db.refresh.REFRESH_CHANNEL).
+NOTIFY_SQL = "SELECT pg_notify('property_search_refresh', 'mv_property_search');"
+# Served data changed without an ingestion run; HTTP ETags (app.db.data_version) follow ingestion_watermarks.
+STAMP_SQL = (Path(__file__).resolve().parent.parent / "sql" / "refresh_views_watermark.sql").read_text()
 
 async def main():
     dsn = os.getenv("DATABASE_URL")
@@ -9,6 +14,8 @@ async def main():
     pool = await asyncpg.create_pool(dsn=dsn, min_size=1, max_size=2, command_timeout=600)
     async with pool.acquire() as conn:
         await conn.execute(SQL)
+        await conn.execute(STAMP_SQL)
+        await conn.execute(NOTIFY_SQL)
     await pool.close()
     print("MV refresh complete")
 
@@ -3,4 +3,10 @@ set -euo pipefail
 psql "$DATABASE_URL" -v ON_ERROR_STOP=1 <<'SQL'
 REFRESH MATERIALIZED VIEW CONCURRENTLY mv_permit_agg;
 REFRESH MATERIALIZED VIEW property_search;
+NOTIFY property_search_refresh, 'property_search';
 SQL
+# /property/{bbl} documents embed mv_permit_agg counts; rebuild them against the refreshed view.
+(cd "$(dirname "$0")/../backend" && python -m app.ingestion.orchestrator property_documents)
+# Served data changed without an ingestion run; record it so HTTP ETags (app.db.data_version) move on.
+psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f "$(dirname "$0")/../sql/refresh_views_watermark.sql"
+psql "$DATABASE_URL" -c "NOTIFY property_search_refresh, 'property_documents';"
@@ -98,3 +98,15 @@ CREATE OR REPLACE FUNCTION public.bbl_normalize(x bigint)
 RETURNS text LANGUAGE sql IMMUTABLE AS $$
   SELECT public.bbl_normalize(x::text);
 $$;
+
+-- Search key for addresses: unaccented, upper-cased, punctuation collapsed to single spaces.
+-- unaccent() itself is only STABLE; pinning the dictionary makes this safe to index.
+-- Mirrored in Python by app.utils.normalize.address_search_key.
+CREATE EXTENSION IF NOT EXISTS unaccent;
+CREATE OR REPLACE FUNCTION public.address_search_key(value text)
+RETURNS text LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+  SELECT NULLIF(
+    btrim(regexp_replace(upper(public.unaccent('public.unaccent'::regdictionary, COALESCE(value, ''))), '[^A-Z0-9]+', ' ', 'g')),
+    ''
+  )
+$$;
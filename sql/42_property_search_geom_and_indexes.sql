@@ -27,9 +27,8 @@ SELECT
   r.violations_count,
   r.violations_last_issued,
   -- Make sure address_key is normalized for trigram/unaccent searches
-  UPPER(unaccent(
-    regexp_replace(COALESCE(r.address, ''), '[^A-Za-z0-9 ]', ' ', 'g')
-  )) AS address_key
+  -- (public.address_search_key lives in sql/00_helpers.sql)
+  public.address_search_key(r.address) AS address_key
 FROM vw_property_rollup r;
 
 -- 2) Helpful indexes.
@@ -61,3 +60,7 @@ CREATE INDEX IF NOT EXISTS idx_mv_search_zipcode
 
 CREATE INDEX IF NOT EXISTS idx_mv_search_addresskey_trgm
   ON mv_property_search USING GIN (address_key gin_trgm_ops);
+
+-- GiST supports KNN ordering (address_key <-> 'QUERY') used by /api/search?mode=trigram.
+CREATE INDEX IF NOT EXISTS idx_mv_search_addresskey_gist
+  ON mv_property_search USING GIST (address_key gist_trgm_ops);
@@ -0,0 +1,16 @@
+-- Composite sort index backing keyset pagination in /api/search.
+-- Column order and NULLS placement mirror the curated ORDER BY in
+-- backend/app/routers/search.py (run_search) so `next_cursor` pages become
+-- index range scans instead of sort + discard.
+CREATE INDEX IF NOT EXISTS idx_ps_rich_curated_order
+  ON property_search_rich_mv (
+    permit_count_12m DESC NULLS LAST,
+    last_permit_date DESC NULLS LAST,
+    yearbuilt DESC NULLS LAST,
+    address ASC,
+    bbl ASC
+  );
+
+-- Explicit sorts lead with a single column; keep the same tiebreak tail.
+CREATE INDEX IF NOT EXISTS idx_ps_rich_last_permit_date_keyset
+  ON property_search_rich_mv (last_permit_date DESC NULLS LAST, bbl ASC);
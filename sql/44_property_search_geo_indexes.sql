@@ -0,0 +1,8 @@
+-- Spatial index backing bbox/radius filters in /api/search and /api/search/facets.
+-- Both filters start with `geom_4326 && ST_MakeEnvelope(...)`, which this GiST
+-- index answers; radius searches then recheck with ST_DWithin on geography and
+-- order nearest-first with `geom_4326 <-> point` (GiST KNN).
+-- Assumes the search relation carries geom_4326 like mv_property_search
+-- (sql/42_property_search_geom_and_indexes.sql); see SEARCH_GEOM_COLUMN.
+CREATE INDEX IF NOT EXISTS idx_ps_rich_geom_gist
+  ON property_search_rich_mv USING GIST (geom_4326);
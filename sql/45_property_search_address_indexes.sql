@@ -0,0 +1,10 @@
+-- Structured address fast path in /api/search (run_search): `houseno = $1` plus the
+-- street prefix range `street ~>=~ $2 AND street ~<~ $3`. text_pattern_ops makes
+-- those byte-order operators index ranges whatever the database collation.
+-- Lives on the relation run_search queries (TABLE_SEARCH, default
+-- property_search_rich_mv) like sql/43 and sql/44; the endpoint skips the
+-- structured lookup when that relation has no houseno/street columns.
+DROP INDEX IF EXISTS idx_mv_search_houseno_street;
+
+CREATE INDEX IF NOT EXISTS idx_ps_rich_houseno_street
+  ON property_search_rich_mv (houseno, street text_pattern_ops, borough);
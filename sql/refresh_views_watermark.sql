@@ -0,0 +1,6 @@
+-- Served data changed without an ingestion run (view refresh or rebuild); record it in
+-- ingestion_watermarks so HTTP ETags (backend/app/db/data_version.py) move on.
+-- Shared by scripts/refresh_mv.sh, scripts/refresh_mv.py and scripts/rebuild_views.sh.
+INSERT INTO ingestion_watermarks (source, last_run)
+VALUES ('refresh:views', now())
+ON CONFLICT (source) DO UPDATE SET last_run = EXCLUDED.last_run;